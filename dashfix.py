@@ -1,10 +1,17 @@
 # convert_hero_ids.py
 import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "scripts"))
+from hero_ids import HeroIdResolver, load_heroes
 
 def convert_hero_ids_format(input_filename="build_data_final.json", output_filename="build_data_final_v2.json"):
     """
-    Reads hero data and converts the 'heroId' field from snake_case
-    (e.g., 'death_prophet') to kebab-case (e.g., 'death-prophet').
+    Reads hero data and converts the 'heroId' field to the canonical hero id
+    from src/data/heroes.ts (e.g., 'death_prophet', 'Death Prophet' or a typo
+    like 'death_prohpet' all become 'death-prophet'). Ids that can't be
+    resolved fall back to a plain snake_case to kebab-case conversion.
 
     Args:
         input_filename (str): The name of the source JSON file.
@@ -16,16 +23,27 @@ def convert_hero_ids_format(input_filename="build_data_final.json", output_filen
             print(f"Reading hero data from '{input_filename}'...")
             hero_list = json.load(f)
 
+        resolver = HeroIdResolver(load_heroes())
         modified_ids_report = []
+        unresolved_report = []
 
         # Step 2: Iterate through each hero and modify the 'heroId'
         for hero in hero_list:
             # Use .get() to safely access the key in case it's missing
             original_id = hero.get("heroId")
+            if not original_id:
+                continue
 
-            # Proceed only if the ID exists and contains an underscore
-            if original_id and "_" in original_id:
+            resolution = resolver.resolve(original_id)
+            if resolution.resolved:
+                new_id = resolution.hero_id
+            else:
+                # Unknown or ambiguous: keep the old behaviour and report it
                 new_id = original_id.replace("_", "-")
+                detail = f" (could be {', '.join(resolution.candidates)})" if resolution.candidates else ""
+                unresolved_report.append(f"'{original_id}'{detail}")
+
+            if new_id != original_id:
                 hero["heroId"] = new_id
                 # Add a record of the change for our report
                 modified_ids_report.append(f"'{original_id}' -> '{new_id}'")
@@ -37,13 +55,18 @@ def convert_hero_ids_format(input_filename="build_data_final.json", output_filen
         print("-" * 30)
         print(f"Successfully processed {len(hero_list)} heroes.")
         if modified_ids_report:
-            print(f"Converted {len(modified_ids_report)} hero IDs to kebab-case.")
+            print(f"Converted {len(modified_ids_report)} hero IDs to canonical IDs.")
             # Optional: uncomment the following lines to see every single change
             # for change in modified_ids_report:
             #     print(f"  - {change}")
         else:
             print("No hero IDs required conversion.")
         
+        if unresolved_report:
+            print(f"\nWarning: {len(unresolved_report)} hero IDs did not match a known hero:")
+            for entry in unresolved_report:
+                print(f"- {entry}")
+        
         print(f"Final data written to '{output_filename}'.")
 
     except FileNotFoundError:
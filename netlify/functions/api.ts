@@ -113,22 +113,12 @@ class ApiService {
     };
   }
 
+  // Builds are read from the build_documents materialized view, which holds each
+  // build as a ready-made document; refreshBuildDocuments() runs after writes
   async getBuilds(): Promise<Build[]> {
-    const { data: builds, error } = await supabase
-      .from('builds')
-      .select(`
-        id,
-        hero_id,
-        mood,
-        score,
-        early_game,
-        mid_game,
-        late_game,
-        items:items(id, name, cost, phase, priority, description, order_index),
-        playstyle_dos:playstyle_dos(do_item, order_index),
-        playstyle_donts:playstyle_donts(dont_item, order_index),
-        playstyle_tips:playstyle_tips(tip, order_index)
-      `)
+    const { data: rows, error } = await supabase
+      .from('build_documents')
+      .select('document')
       .order('hero_id')
       .order('mood');
 
@@ -137,55 +127,13 @@ class ApiService {
       throw error;
     }
 
-    return builds.map(build => ({
-      heroId: build.hero_id,
-      mood: build.mood,
-      score: build.score,
-      items: build.items
-        ?.sort((a, b) => a.order_index - b.order_index)
-        .map(item => ({
-          id: item.id,
-          name: item.name,
-          cost: item.cost,
-          phase: item.phase as 'Early' | 'Mid' | 'Late',
-          priority: item.priority as 'Core' | 'Situational' | 'Luxury',
-          description: item.description || ''
-        })) || [],
-      playstyle: {
-        dos: build.playstyle_dos
-          ?.sort((a, b) => a.order_index - b.order_index)
-          .map(item => item.do_item) || [],
-        donts: build.playstyle_donts
-          ?.sort((a, b) => a.order_index - b.order_index)
-          .map(item => item.dont_item) || [],
-        tips: build.playstyle_tips
-          ?.sort((a, b) => a.order_index - b.order_index)
-          .map(item => item.tip) || []
-      },
-      gameplan: {
-        early: build.early_game || '',
-        mid: build.mid_game || '',
-        late: build.late_game || ''
-      }
-    }));
+    return rows.map(row => row.document as Build);
   }
 
   async getHeroBuilds(heroId: string): Promise<Build[]> {
-    const { data: builds, error } = await supabase
-      .from('builds')
-      .select(`
-        id,
-        hero_id,
-        mood,
-        score,
-        early_game,
-        mid_game,
-        late_game,
-        items:items(id, name, cost, phase, priority, description, order_index),
-        playstyle_dos:playstyle_dos(do_item, order_index),
-        playstyle_donts:playstyle_donts(dont_item, order_index),
-        playstyle_tips:playstyle_tips(tip, order_index)
-      `)
+    const { data: rows, error } = await supabase
+      .from('build_documents')
+      .select('document')
       .eq('hero_id', heroId)
       .order('mood');
 
@@ -194,55 +142,13 @@ class ApiService {
       throw error;
     }
 
-    return builds.map(build => ({
-      heroId: build.hero_id,
-      mood: build.mood,
-      score: build.score,
-      items: build.items
-        ?.sort((a, b) => a.order_index - b.order_index)
-        .map(item => ({
-          id: item.id,
-          name: item.name,
-          cost: item.cost,
-          phase: item.phase as 'Early' | 'Mid' | 'Late',
-          priority: item.priority as 'Core' | 'Situational' | 'Luxury',
-          description: item.description || ''
-        })) || [],
-      playstyle: {
-        dos: build.playstyle_dos
-          ?.sort((a, b) => a.order_index - b.order_index)
-          .map(item => item.do_item) || [],
-        donts: build.playstyle_donts
-          ?.sort((a, b) => a.order_index - b.order_index)
-          .map(item => item.dont_item) || [],
-        tips: build.playstyle_tips
-          ?.sort((a, b) => a.order_index - b.order_index)
-          .map(item => item.tip) || []
-      },
-      gameplan: {
-        early: build.early_game || '',
-        mid: build.mid_game || '',
-        late: build.late_game || ''
-      }
-    }));
+    return rows.map(row => row.document as Build);
   }
 
   async getBuild(heroId: string, mood: string): Promise<Build> {
-    const { data: build, error } = await supabase
-      .from('builds')
-      .select(`
-        id,
-        hero_id,
-        mood,
-        score,
-        early_game,
-        mid_game,
-        late_game,
-        items:items(id, name, cost, phase, priority, description, order_index),
-        playstyle_dos:playstyle_dos(do_item, order_index),
-        playstyle_donts:playstyle_donts(dont_item, order_index),
-        playstyle_tips:playstyle_tips(tip, order_index)
-      `)
+    const { data: row, error } = await supabase
+      .from('build_documents')
+      .select('document')
       .eq('hero_id', heroId)
       .eq('mood', mood)
       .single();
@@ -252,37 +158,48 @@ class ApiService {
       throw error;
     }
 
-    return {
-      heroId: build.hero_id,
-      mood: build.mood,
-      score: build.score,
-      items: build.items
-        ?.sort((a, b) => a.order_index - b.order_index)
-        .map(item => ({
-          id: item.id,
-          name: item.name,
-          cost: item.cost,
-          phase: item.phase as 'Early' | 'Mid' | 'Late',
-          priority: item.priority as 'Core' | 'Situational' | 'Luxury',
-          description: item.description || ''
-        })) || [],
-      playstyle: {
-        dos: build.playstyle_dos
-          ?.sort((a, b) => a.order_index - b.order_index)
-          .map(item => item.do_item) || [],
-        donts: build.playstyle_donts
-          ?.sort((a, b) => a.order_index - b.order_index)
-          .map(item => item.dont_item) || [],
-        tips: build.playstyle_tips
-          ?.sort((a, b) => a.order_index - b.order_index)
-          .map(item => item.tip) || []
-      },
-      gameplan: {
-        early: build.early_game || '',
-        mid: build.mid_game || '',
-        late: build.late_game || ''
+    return row.document as Build;
+  }
+
+  // Refreshes the whole view, so every single-row write pays for a pass over
+  // all builds. The write has already committed by the time this runs, so a
+  // failed refresh is logged rather than reported as a failed write; readers
+  // see the previous documents until the next refresh succeeds. Returns
+  // whether the view now reflects the write.
+  async refreshBuildDocuments(): Promise<boolean> {
+    try {
+      const { error } = await supabaseAdmin.rpc('refresh_build_documents');
+      if (error) {
+        console.error('Error refreshing build documents:', error);
+        return false;
       }
-    };
+      return true;
+    } catch (error) {
+      console.error('Error refreshing build documents:', error);
+      return false;
+    }
+  }
+
+  async getBuildsByItem(itemId: string): Promise<Array<{ heroId: string; mood: string; score: number; phase: string; priority: string }>> {
+    const { data: rows, error } = await supabase
+      .from('items')
+      .select('phase, priority, builds(hero_id, mood, score)')
+      .eq('item_id', itemId);
+
+    if (error) {
+      console.error('Error fetching builds by item:', error);
+      throw error;
+    }
+
+    return rows
+      .filter(row => row.builds)
+      .map(row => ({
+        heroId: row.builds.hero_id,
+        mood: row.builds.mood,
+        score: row.builds.score,
+        phase: row.phase,
+        priority: row.priority
+      }));
   }
 
   async checkHealth(): Promise<{ status: string; timestamp: string }> {
@@ -430,6 +347,8 @@ class ApiService {
   async deleteHero(id: string): Promise<void> {
     const { error } = await supabaseAdmin.from('heroes').delete().eq('id', id);
     if (error) throw error;
+    // The hero's builds were removed by cascade
+    await this.refreshBuildDocuments();
   }
 
   async createBuild(buildData: Build): Promise<Build> {
@@ -513,11 +432,13 @@ class ApiService {
       if (tipsError) throw tipsError;
     }
 
+    await this.refreshBuildDocuments();
+
     // Return the complete build
     return buildData;
   }
 
-  async updateBuild(id: number, buildData: Partial<Build>): Promise<Build> {
+  async updateBuild(id: number, buildData: Partial<Build>): Promise<Build & { warning?: string }> {
     // Calculate new score if we have all the required data
     let score: number | undefined;
     if (buildData.heroId && buildData.items && buildData.playstyle && buildData.gameplan) {
@@ -621,13 +542,24 @@ class ApiService {
       }
     }
 
-    // Return the complete updated build
-    return await this.getBuild(build.hero_id, build.mood);
+    const refreshed = await this.refreshBuildDocuments();
+
+    // Return the complete updated build; without a refresh the view still
+    // holds the previous document, so say so instead of passing it off as new
+    const updatedBuild = await this.getBuild(build.hero_id, build.mood);
+    if (!refreshed) {
+      return {
+        ...updatedBuild,
+        warning: 'Build saved, but build documents could not be refreshed; this document predates the update'
+      };
+    }
+    return updatedBuild;
   }
 
   async deleteBuild(id: number): Promise<void> {
     const { error } = await supabaseAdmin.from('builds').delete().eq('id', id);
     if (error) throw error;
+    await this.refreshBuildDocuments();
   }
 }
 
@@ -689,6 +621,17 @@ export const handler: Handler = async (event, context) => {
       };
     }
 
+    const itemBuildsMatch = path.match(/^\/items\/([^\/]+)\/builds$/);
+    if (itemBuildsMatch && method === 'GET') {
+      const itemId = itemBuildsMatch[1];
+      const builds = await apiService.getBuildsByItem(itemId);
+      return {
+        statusCode: 200,
+        headers: { ...corsHeaders, 'Content-Type': 'application/json' },
+        body: JSON.stringify(builds)
+      };
+    }
+
     if (path === '/builds' && method === 'POST') {
       const buildData = JSON.parse(event.body || '{}');
       const newBuild = await apiService.createBuild(buildData);
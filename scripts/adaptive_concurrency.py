@@ -0,0 +1,229 @@
+"""
+Adaptive Concurrency for Bulk Writes and Deletes
+
+Runs independent units of work (one hero, one build, one duplicate record)
+on a thread pool whose in-flight limit follows AIMD, the scheme TCP uses for
+its congestion window:
+
+    - every request that completes without a latency spike grows the window
+      by 1/window, so the window grows by about one per round of requests
+    - a 429, a 5xx, a timeout or a request slower than `latency_factor` times
+      the baseline latency halves the window (at most once per round, so one
+      burst of failures only cuts once)
+
+The baseline is a slowly rising minimum of observed request latency, kept per
+table and operation so a multi-row insert is not compared with a cheap
+select. Failures that do not signal overload (a 409, a bad request) neither
+move the baseline nor the window. Requests are observed through a client proxy, the same way RequestTracer observes
+them, so the controller sees individual Supabase calls rather than whole
+units of work. This keeps imports from starving the live site that shares
+the database while still using spare capacity.
+
+Concurrency is opt-in: the command-line default of DEFAULT_MAX_CONCURRENCY
+(1) processes one unit at a time, and a higher --max-concurrency enables the
+controller. Requests the retrying transport replays never reach the client
+proxy as failures, so the controller also registers as a retry listener on
+the transport and counts each retry as overload.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, TypeVar
+
+from request_tracing import WRITE_OPERATIONS
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+# Command-line default; 1 disables the controller
+DEFAULT_MAX_CONCURRENCY = 1
+DEFAULT_MAX_WINDOW = 8
+PROGRESS_INTERVAL = 10
+
+# APIError codes that mean the database is overloaded rather than the request is bad
+OVERLOAD_CODES = {'429', '500', '502', '503', '504', '57014'}
+
+def is_overload_error(error: Exception) -> bool:
+    """Whether an exception signals throttling or overload"""
+    code = str(getattr(error, 'code', '') or getattr(error, 'status_code', ''))
+    if code in OVERLOAD_CODES:
+        return True
+    name = type(error).__name__
+    return name.endswith('Timeout') or name in ('TimeoutException', 'ConnectError', 'RemoteProtocolError')
+
+class AdaptiveConcurrency:
+    """AIMD controller for the number of in-flight units of work"""
+
+    def __init__(self, max_window: int = DEFAULT_MAX_WINDOW, min_window: int = 1,
+                 initial_window: int = 2, decrease_factor: float = 0.5,
+                 latency_factor: float = 2.0):
+        self.max_window = max(1, max_window)
+        self.min_window = max(1, min(min_window, self.max_window))
+        self.window = float(max(self.min_window, min(initial_window, self.max_window)))
+        self.decrease_factor = decrease_factor
+        self.latency_factor = latency_factor
+        self.baselines: Dict[str, float] = {}
+        self.in_flight = 0
+        self.decreases = 0
+        self.last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self.window)
+
+    def wrap(self, client: Any) -> 'AdaptiveClient':
+        """Return a view of a Supabase client whose requests feed the controller"""
+        # Set by transport.configure_transport; retried 429s and 5xx responses
+        # are absorbed there and would otherwise look like slow successes
+        retry_transport = getattr(client, 'retry_transport', None)
+        if retry_transport is not None:
+            retry_transport.listeners.append(self.record_retry)
+        return AdaptiveClient(client, self)
+
+    def acquire(self):
+        with self._condition:
+            while self.in_flight >= self.limit:
+                self._condition.wait()
+            self.in_flight += 1
+
+    def release(self):
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def record(self, started_at: float, latency: float, overloaded: bool = False,
+               kind: str = 'request', failed: bool = False):
+        """Feed one request outcome into the controller
+
+        kind groups requests that share a baseline (table and operation);
+        failed marks an error that is not overload, which says nothing about
+        the load on the database and is ignored.
+        """
+        with self._condition:
+            if failed and not overloaded:
+                return
+            if not overloaded:
+                baseline = self.baselines.get(kind)
+                if baseline is None or latency < baseline:
+                    baseline = latency
+                else:
+                    # Let the baseline drift up slowly so a permanently slower
+                    # database doesn't look like a spike forever
+                    baseline += (latency - baseline) * 0.01
+                self.baselines[kind] = baseline
+                overloaded = latency > baseline * self.latency_factor
+
+            if overloaded:
+                # Requests started before the last cut belong to the round that
+                # was already penalized
+                if started_at >= self.last_decrease:
+                    self.window = max(float(self.min_window), self.window * self.decrease_factor)
+                    self.last_decrease = time.perf_counter()
+                    self.decreases += 1
+            else:
+                self.window = min(float(self.max_window), self.window + 1 / self.window)
+            self._condition.notify_all()
+
+    def record_retry(self, started_at: float):
+        """Count a request attempt the transport had to retry as overload"""
+        self.record(started_at, 0.0, overloaded=True)
+
+    def status(self) -> str:
+        with self._condition:
+            baselines = sorted(self.baselines.values())
+        if not baselines:
+            baseline = 'n/a'
+        elif len(baselines) == 1:
+            baseline = f"{baselines[0] * 1000:.0f}ms"
+        else:
+            baseline = f"{baselines[0] * 1000:.0f}-{baselines[-1] * 1000:.0f}ms"
+        return f"window {self.limit}/{self.max_window}, baseline {baseline}, {self.decreases} backoffs"
+
+    def run(self, units: Iterable[T], work: Callable[[T], R], label: str = 'units') -> List[R]:
+        """Run work(unit) for every unit under the window and return results in order"""
+        units = list(units)
+        results: List[Any] = [None] * len(units)
+        done = [0]
+        progress_lock = threading.Lock()
+
+        def run_unit(index: int):
+            try:
+                results[index] = work(units[index])
+            finally:
+                self.release()
+                with progress_lock:
+                    done[0] += 1
+                    if done[0] % PROGRESS_INTERVAL == 0 or done[0] == len(units):
+                        print(f"⚙️  {done[0]}/{len(units)} {label} done ({self.status()})")
+
+        with ThreadPoolExecutor(max_workers=self.max_window) as executor:
+            futures = []
+            for index in range(len(units)):
+                self.acquire()
+                futures.append(executor.submit(run_unit, index))
+            for future in futures:
+                future.result()
+        return results
+
+def run_units(controller: Optional[AdaptiveConcurrency], units: Iterable[T],
+              work: Callable[[T], R], label: str = 'units') -> List[R]:
+    """Run units under the controller, or one at a time without one"""
+    if controller is None:
+        return [work(unit) for unit in units]
+    return controller.run(units, work, label)
+
+class AdaptiveQuery:
+    """Proxy for a query builder that reports its execute() to the controller"""
+
+    def __init__(self, controller: AdaptiveConcurrency, table: str, builder: Any,
+                 operation: str = 'select'):
+        self._controller = controller
+        self._table = table
+        self._builder = builder
+        self._operation = operation
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._builder, name)
+        if not callable(attr):
+            return attr
+
+        def chained(*args, **kwargs):
+            operation = name if name in WRITE_OPERATIONS else self._operation
+            return AdaptiveQuery(self._controller, self._table, attr(*args, **kwargs), operation)
+
+        return chained
+
+    def execute(self) -> Any:
+        kind = f"{self._table}:{self._operation}"
+        started_at = time.perf_counter()
+        try:
+            response = self._builder.execute()
+        except Exception as e:
+            overloaded = is_overload_error(e)
+            self._controller.record(started_at, time.perf_counter() - started_at, overloaded,
+                                    kind, failed=not overloaded)
+            raise
+        self._controller.record(started_at, time.perf_counter() - started_at, kind=kind)
+        return response
+
+class AdaptiveClient:
+    """Proxy for a Supabase client whose table() and rpc() calls are observed"""
+
+    def __init__(self, client: Any, controller: AdaptiveConcurrency):
+        self._client = client
+        self._controller = controller
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+    def table(self, table_name: str) -> AdaptiveQuery:
+        return AdaptiveQuery(self._controller, table_name, self._client.table(table_name))
+
+    def from_(self, table_name: str) -> AdaptiveQuery:
+        return self.table(table_name)
+
+    def rpc(self, name: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> AdaptiveQuery:
+        return AdaptiveQuery(self._controller, f"rpc:{name}", self._client.rpc(name, params or {}, **kwargs),
+                             'rpc')
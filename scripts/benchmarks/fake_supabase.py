@@ -0,0 +1,237 @@
+"""
+In-memory stand-in for the Supabase client
+
+Implements the subset of the supabase-py query builder the scripts use:
+table().select/insert/upsert/update/delete, the eq/neq/in_/lt/lte/gt/gte
+filters, order/limit/range, rpc() and execute(). Rows live in plain lists
+per table and every execute() is counted and can be delayed by a fixed
+latency to simulate network round trips.
+
+Embedded selects ("builds(hero_id, mood)") are not resolved; only the base
+table's columns are returned.
+"""
+
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, List, Optional
+
+# Tables whose primary key is a SERIAL id assigned by the database
+SERIAL_TABLES = {
+    'builds', 'items', 'hero_strengths', 'hero_weaknesses',
+    'playstyle_dos', 'playstyle_donts', 'playstyle_tips'
+}
+
+class FakeResponse:
+    """Mirrors the data/count attributes of a postgrest APIResponse"""
+
+    def __init__(self, data: Any, count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+class FakeQuery:
+    """Chainable query against one in-memory table"""
+
+    def __init__(self, client: 'FakeSupabase', table_name: str):
+        self.client = client
+        self.table_name = table_name
+        self.operation = 'select'
+        self.columns = '*'
+        self.payload: Any = None
+        self.filters: List[Callable[[Dict[str, Any]], bool]] = []
+        self.on_conflict = 'id'
+        self.ignore_duplicates = False
+        self.count_mode: Optional[str] = None
+        self.order_by: List[tuple] = []
+        self.row_range: Optional[tuple] = None
+
+    def select(self, columns: str = '*', count: Optional[str] = None) -> 'FakeQuery':
+        if self.operation not in ('insert', 'upsert', 'update', 'delete'):
+            self.operation = 'select'
+        self.columns = columns
+        self.count_mode = count
+        return self
+
+    def insert(self, rows: Any, **kwargs) -> 'FakeQuery':
+        self.operation = 'insert'
+        self.payload = rows
+        return self
+
+    def upsert(self, rows: Any, on_conflict: str = '', ignore_duplicates: bool = False, **kwargs) -> 'FakeQuery':
+        self.operation = 'upsert'
+        self.payload = rows
+        self.on_conflict = on_conflict or 'id'
+        self.ignore_duplicates = ignore_duplicates
+        return self
+
+    def update(self, values: Dict[str, Any], **kwargs) -> 'FakeQuery':
+        self.operation = 'update'
+        self.payload = values
+        return self
+
+    def delete(self, **kwargs) -> 'FakeQuery':
+        self.operation = 'delete'
+        return self
+
+    def _filter(self, predicate: Callable[[Dict[str, Any]], bool]) -> 'FakeQuery':
+        self.filters.append(predicate)
+        return self
+
+    def eq(self, column: str, value: Any) -> 'FakeQuery':
+        return self._filter(lambda row: row.get(column) == value)
+
+    def neq(self, column: str, value: Any) -> 'FakeQuery':
+        return self._filter(lambda row: row.get(column) != value)
+
+    def in_(self, column: str, values: List[Any]) -> 'FakeQuery':
+        wanted = set(values)
+        return self._filter(lambda row: row.get(column) in wanted)
+
+    def lt(self, column: str, value: Any) -> 'FakeQuery':
+        return self._filter(lambda row: row.get(column) is not None and row.get(column) < value)
+
+    def lte(self, column: str, value: Any) -> 'FakeQuery':
+        return self._filter(lambda row: row.get(column) is not None and row.get(column) <= value)
+
+    def gt(self, column: str, value: Any) -> 'FakeQuery':
+        return self._filter(lambda row: row.get(column) is not None and row.get(column) > value)
+
+    def gte(self, column: str, value: Any) -> 'FakeQuery':
+        return self._filter(lambda row: row.get(column) is not None and row.get(column) >= value)
+
+    def order(self, column: str, desc: bool = False, **kwargs) -> 'FakeQuery':
+        self.order_by.append((column, desc))
+        return self
+
+    def limit(self, size: int, **kwargs) -> 'FakeQuery':
+        self.row_range = (0, size - 1)
+        return self
+
+    def range(self, start: int, end: int, **kwargs) -> 'FakeQuery':
+        self.row_range = (start, end)
+        return self
+
+    def single(self) -> 'FakeQuery':
+        return self
+
+    def execute(self) -> FakeResponse:
+        return self.client._execute(self)
+
+class FakeRpc:
+    """Pending RPC call"""
+
+    def __init__(self, client: 'FakeSupabase', name: str, params: Optional[Dict[str, Any]]):
+        self.client = client
+        self.name = name
+        self.params = params or {}
+
+    def execute(self) -> FakeResponse:
+        self.client._record('rpc', self.name)
+        handler = self.client.rpc_handlers.get(self.name)
+        return FakeResponse(handler(self.client, self.params) if handler else None)
+
+class FakeSupabase:
+    """In-memory Supabase client with request accounting"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.tables: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self.next_id: Dict[str, int] = defaultdict(int)
+        self.requests: Counter = Counter()
+        # Adaptive concurrency runs requests from a thread pool
+        self._lock = threading.RLock()
+        self.rpc_handlers: Dict[str, Callable[['FakeSupabase', Dict[str, Any]], Any]] = {
+            'update_build_scores': _update_build_scores,
+            'backfill_item_catalog_ids': lambda client, params: 0,
+        }
+
+    @property
+    def request_count(self) -> int:
+        return sum(self.requests.values())
+
+    def reset_stats(self):
+        self.requests.clear()
+
+    def table(self, table_name: str) -> FakeQuery:
+        return FakeQuery(self, table_name)
+
+    def from_(self, table_name: str) -> FakeQuery:
+        return self.table(table_name)
+
+    def rpc(self, name: str, params: Optional[Dict[str, Any]] = None) -> FakeRpc:
+        return FakeRpc(self, name, params)
+
+    def seed(self, table_name: str, rows: List[Dict[str, Any]]):
+        """Insert rows without counting a request"""
+        for row in rows:
+            self._insert_row(table_name, row)
+
+    def _record(self, operation: str, table_name: str):
+        with self._lock:
+            self.requests[(table_name, operation)] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _insert_row(self, table_name: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        stored = dict(row)
+        if table_name in SERIAL_TABLES and stored.get('id') is None:
+            self.next_id[table_name] += 1
+            stored['id'] = self.next_id[table_name]
+        self.tables[table_name].append(stored)
+        return dict(stored)
+
+    def _execute(self, query: FakeQuery) -> FakeResponse:
+        self._record(query.operation, query.table_name)
+        with self._lock:
+            return self._apply(query)
+
+    def _apply(self, query: FakeQuery) -> FakeResponse:
+        rows = self.tables[query.table_name]
+
+        if query.operation == 'insert':
+            payload = query.payload if isinstance(query.payload, list) else [query.payload]
+            return FakeResponse([self._insert_row(query.table_name, row) for row in payload])
+
+        if query.operation == 'upsert':
+            payload = query.payload if isinstance(query.payload, list) else [query.payload]
+            keys = [key.strip() for key in query.on_conflict.split(',')]
+            existing = {tuple(row.get(key) for key in keys): row for row in rows}
+            result = []
+            for row in payload:
+                current = existing.get(tuple(row.get(key) for key in keys))
+                if current is None:
+                    result.append(self._insert_row(query.table_name, row))
+                elif not query.ignore_duplicates:
+                    current.update(row)
+                    result.append(dict(current))
+            return FakeResponse(result)
+
+        matched = [row for row in rows if all(predicate(row) for predicate in query.filters)]
+
+        if query.operation == 'update':
+            for row in matched:
+                row.update(query.payload)
+            return FakeResponse([dict(row) for row in matched])
+
+        if query.operation == 'delete':
+            matched_ids = set(id(row) for row in matched)
+            self.tables[query.table_name] = [row for row in rows if id(row) not in matched_ids]
+            return FakeResponse([dict(row) for row in matched])
+
+        for column, desc in reversed(query.order_by):
+            matched.sort(key=lambda row: (row.get(column) is None, row.get(column)), reverse=desc)
+        total = len(matched)
+        if query.row_range is not None:
+            start, end = query.row_range
+            matched = matched[start:end + 1]
+        return FakeResponse([dict(row) for row in matched], total if query.count_mode else None)
+
+def _update_build_scores(client: FakeSupabase, params: Dict[str, Any]) -> int:
+    """In-memory version of the update_build_scores RPC"""
+    scores = {entry['id']: entry['score'] for entry in params.get('scores', [])}
+    updated = 0
+    for row in client.tables['builds']:
+        if row['id'] in scores and row.get('score') != scores[row['id']]:
+            row['score'] = scores[row['id']]
+            updated += 1
+    return updated
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite for the Dota 2 Data Tools
+
+Runs the data tooling against an in-memory Supabase stand-in and reports
+requests issued, wall time and peak memory per scenario, so performance
+regressions can be caught offline without touching a real database.
+
+Usage:
+    python scripts/benchmarks/run_benchmarks.py
+    python scripts/benchmarks/run_benchmarks.py --latency-ms 20 --scale 4
+    python scripts/benchmarks/run_benchmarks.py --only bulk-import --json results.json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Callable, Dict, List, Any
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+REPO_ROOT = SCRIPTS_DIR.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+sys.path.insert(0, str(REPO_ROOT))
+
+from fake_supabase import FakeSupabase
+from manage_dota_data import DatabaseManager, VALID_MOODS, VALID_ROLES, bulk_import, build_from_dict
+from cleanup_duplicates import DuplicateCleaner
+from item_catalog import ItemCatalog
+from adaptive_concurrency import AdaptiveConcurrency
+import dashfix
+import format_build
+import mood_mapper
+
+DEFAULT_DATASET = REPO_ROOT / 'build_data_final.json'
+
+@dataclass
+class BenchmarkResult:
+    """Measurements for one scenario"""
+    scenario: str
+    requests: int
+    wall_time_s: float
+    peak_memory_kb: float
+
+@dataclass
+class Scenario:
+    """A benchmark scenario with an unmeasured setup step"""
+    name: str
+    setup: Callable[['BenchmarkContext'], Any]
+    run: Callable[['BenchmarkContext', Any], None]
+
+class BenchmarkContext:
+    """Dataset and client settings shared by the scenarios"""
+
+    def __init__(self, dataset_path: Path, scale: int, latency: float, work_dir: Path):
+        self.latency = latency
+        self.work_dir = work_dir
+        self.heroes, self.builds = make_dataset(dataset_path, scale)
+        self.catalog = ItemCatalog.from_builds(self.builds)
+        self.client = FakeSupabase()
+
+    def new_client(self) -> FakeSupabase:
+        # Seeding is not measured, so latency is only switched on by measure()
+        self.client = FakeSupabase()
+        return self.client
+
+    def db_manager(self) -> DatabaseManager:
+        return DatabaseManager(self.client, self.catalog)
+
+def make_dataset(dataset_path: Path, scale: int):
+    """Build valid heroes and builds from a builds file, repeated `scale` times"""
+    with open(dataset_path, 'r', encoding='utf-8') as f:
+        source_builds = json.load(f)
+
+    heroes = []
+    builds = []
+    for copy in range(scale):
+        for index, source in enumerate(source_builds):
+            hero_id = source['heroId'].replace('_', '-')
+            if copy:
+                hero_id = f"{hero_id}-{copy}"
+            mood = mood_mapper.MOOD_MAP.get(source['mood'], source['mood'])
+            if mood not in VALID_MOODS:
+                mood = VALID_MOODS[index % len(VALID_MOODS)]
+
+            heroes.append({
+                'id': hero_id,
+                'name': hero_id.replace('-', ' ').title(),
+                'role': VALID_ROLES[index % len(VALID_ROLES)],
+                'difficulty': 'Medium',
+                'moods': [mood],
+                'description': f"Benchmark hero {hero_id}",
+                'strengths': ['Strength one', 'Strength two', 'Strength three'],
+                'weaknesses': ['Weakness one', 'Weakness two', 'Weakness three']
+            })
+            builds.append({**source, 'heroId': hero_id, 'mood': mood})
+    return heroes, builds
+
+def seed_database(ctx: BenchmarkContext, duplicate_every: int = 0):
+    """Import the dataset into a fresh client, optionally duplicating rows"""
+    client = ctx.new_client()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        bulk_import(ctx.db_manager(), ctx.heroes, ctx.builds)
+
+    if duplicate_every:
+        for table_name in ('heroes', 'builds', 'hero_moods', 'hero_strengths', 'hero_weaknesses'):
+            rows = client.tables[table_name]
+            duplicates = []
+            for row in rows[::duplicate_every]:
+                duplicate = dict(row)
+                if table_name not in ('heroes', 'hero_moods'):
+                    duplicate.pop('id')
+                duplicates.append(duplicate)
+            client.seed(table_name, duplicates)
+    return client
+
+def setup_empty(ctx: BenchmarkContext):
+    ctx.new_client()
+
+def setup_heroes(ctx: BenchmarkContext):
+    client = ctx.new_client()
+    client.seed('heroes', [
+        {key: hero[key] for key in ('id', 'name', 'role', 'difficulty', 'description')}
+        for hero in ctx.heroes
+    ])
+    client.seed('item_catalog', ctx.catalog.to_rows())
+
+def run_bulk_import(ctx: BenchmarkContext, state: Any):
+    db_manager = ctx.db_manager()
+    bulk_import(db_manager, ctx.heroes, ctx.builds)
+    db_manager.rescore_builds()
+
+def run_bulk_import_adaptive(ctx: BenchmarkContext, state: Any):
+    controller = AdaptiveConcurrency()
+    db_manager = DatabaseManager(controller.wrap(ctx.client), ctx.catalog)
+    bulk_import(db_manager, ctx.heroes, ctx.builds, controller)
+    db_manager.rescore_builds()
+
+def run_add_build(ctx: BenchmarkContext, state: Any):
+    db_manager = ctx.db_manager()
+    for build_data in ctx.builds:
+        db_manager.add_build(build_from_dict(build_data))
+
+def run_list_heroes(ctx: BenchmarkContext, state: Any):
+    ctx.db_manager().list_heroes()
+
+def setup_cleanup_scan(ctx: BenchmarkContext):
+    seed_database(ctx, duplicate_every=5)
+
+def run_cleanup_scan(ctx: BenchmarkContext, state: Any):
+    DuplicateCleaner(ctx.client).find_all_duplicates()
+
+def setup_cleanup_remove(ctx: BenchmarkContext):
+    seed_database(ctx, duplicate_every=5)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        return DuplicateCleaner(ctx.client).find_all_duplicates()
+
+def run_cleanup_remove(ctx: BenchmarkContext, duplicates: Dict[str, List[Dict[str, Any]]]):
+    DuplicateCleaner(ctx.client).remove_all_duplicates(duplicates)
+
+def setup_transform_input(ctx: BenchmarkContext, keyed: bool = False) -> Dict[str, str]:
+    ctx.new_client()
+    input_path = ctx.work_dir / ('keyed_builds.json' if keyed else 'builds.json')
+    data = {build['heroId']: build for build in ctx.builds} if keyed else ctx.builds
+    with open(input_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    return {'input': str(input_path), 'output': str(ctx.work_dir / 'output.json')}
+
+def run_format_build(ctx: BenchmarkContext, paths: Dict[str, str]):
+    format_build.reformat_build_data(paths['input'], paths['output'])
+
+def run_mood_mapper(ctx: BenchmarkContext, paths: Dict[str, str]):
+    mood_mapper.update_hero_moods(paths['input'], paths['output'])
+
+def run_dashfix(ctx: BenchmarkContext, paths: Dict[str, str]):
+    dashfix.convert_hero_ids_format(paths['input'], paths['output'])
+
+SCENARIOS = [
+    Scenario('bulk-import', setup_empty, run_bulk_import),
+    Scenario('bulk-import-adaptive', setup_empty, run_bulk_import_adaptive),
+    Scenario('add-build', setup_heroes, run_add_build),
+    Scenario('list-heroes', setup_heroes, run_list_heroes),
+    Scenario('cleanup-scan', setup_cleanup_scan, run_cleanup_scan),
+    Scenario('cleanup-remove', setup_cleanup_remove, run_cleanup_remove),
+    Scenario('format-build', lambda ctx: setup_transform_input(ctx, keyed=True), run_format_build),
+    Scenario('mood-mapper', setup_transform_input, run_mood_mapper),
+    Scenario('dashfix', setup_transform_input, run_dashfix),
+]
+
+def measure(ctx: BenchmarkContext, scenario: Scenario) -> BenchmarkResult:
+    """Run one scenario and collect its measurements"""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        state = scenario.setup(ctx)
+        ctx.client.latency = ctx.latency
+        ctx.client.reset_stats()
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        scenario.run(ctx, state)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return BenchmarkResult(
+        scenario=scenario.name,
+        requests=ctx.client.request_count,
+        wall_time_s=round(elapsed, 4),
+        peak_memory_kb=round(peak / 1024, 1)
+    )
+
+def print_results(results: List[BenchmarkResult]):
+    """Print results as a table"""
+    print(f"{'Scenario':<22} {'Requests':>10} {'Wall time (s)':>14} {'Peak mem (KB)':>14}")
+    print("-" * 63)
+    for result in results:
+        print(f"{result.scenario:<22} {result.requests:>10} {result.wall_time_s:>14.4f} {result.peak_memory_kb:>14.1f}")
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Benchmark the data tools against an in-memory Supabase')
+    parser.add_argument('--dataset', default=str(DEFAULT_DATASET), help='Builds file used to generate the dataset')
+    parser.add_argument('--scale', type=int, default=1, help='Number of copies of the dataset to use')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Latency injected into every request')
+    parser.add_argument('--only', action='append', choices=[s.name for s in SCENARIOS], help='Run only these scenarios')
+    parser.add_argument('--json', help='Write results to a JSON file')
+    args = parser.parse_args()
+
+    scenarios = [s for s in SCENARIOS if not args.only or s.name in args.only]
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        ctx = BenchmarkContext(Path(args.dataset), args.scale, args.latency_ms / 1000, Path(work_dir))
+        print(f"📊 {len(ctx.heroes)} heroes, {len(ctx.builds)} builds, {args.latency_ms}ms latency")
+        results = [measure(ctx, scenario) for scenario in scenarios]
+
+    print_results(results)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump([asdict(result) for result in results], f, indent=2)
+        print(f"✅ Results saved to {args.json}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Build Scoring Engine
+
+Python port of calculateBuildScore from netlify/functions/scoring.ts. Scores
+are computed for a whole dataset at once: every build is reduced to a row of
+feature columns in a single pass over its items and playstyle, and the
+scoring rules are then applied column-wise. Keep the constants and rules in
+sync with scoring.ts.
+
+Usage:
+    python build_scoring.py build_data_final.json --heroes heroes.json
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, List, Any, Optional
+
+# Scoring algorithm constants (mirrors netlify/functions/scoring.ts)
+BASE_SCORE = 3.0
+
+ROLE_MOOD_MODIFIERS = {
+    'Carry':     {'aggressive': 0.5, 'defensive': -0.2, 'experimental': 0.1, 'creative': 0.1, 'chaos': 0.2},
+    'Support':   {'aggressive': -0.2, 'defensive': 0.5, 'experimental': 0.2, 'creative': 0.3, 'chaos': 0.1},
+    'Mid':       {'aggressive': 0.4, 'defensive': 0.0, 'experimental': 0.3, 'creative': 0.3, 'chaos': 0.4},
+    'Initiator': {'aggressive': 0.5, 'defensive': 0.1, 'experimental': 0.1, 'creative': 0.2, 'chaos': 0.5},
+}
+
+CORE_ITEM_BONUS = 0.5
+SITUATIONAL_ITEM_BONUS = 0.2
+LUXURY_ITEM_BONUS = 0.3
+
+DESCRIPTION_LENGTH_BONUS = 0.1
+PLAYSTYLE_COMPLETENESS_BONUS = 0.3
+GAMEPLAN_COMPLETENESS_BONUS = 0.2
+
+MIN_SCORE = 0.0
+MAX_SCORE = 5.0
+
+def build_features(builds: List[Dict[str, Any]], hero_roles: Dict[str, str]) -> Dict[str, List[Any]]:
+    """Reduce builds to feature columns in a single pass"""
+    columns = {
+        'role_mood': [],
+        'is_carry': [],
+        'core_items': [],
+        'situational_items': [],
+        'luxury_items': [],
+        'detailed_items': [],
+        'full_playstyle': [],
+        'full_gameplan': [],
+    }
+
+    for build in builds:
+        role = hero_roles.get(build['heroId'])
+        columns['role_mood'].append(ROLE_MOOD_MODIFIERS.get(role, {}).get(build['mood'], 0.0))
+        columns['is_carry'].append(role == 'Carry')
+
+        core = situational = luxury = 0
+        detailed = True
+        for item in build['items']:
+            priority = item['priority']
+            if priority == 'Core':
+                core += 1
+            elif priority == 'Situational':
+                situational += 1
+            elif priority == 'Luxury':
+                luxury += 1
+            if len(item.get('description') or '') <= 10:
+                detailed = False
+        columns['core_items'].append(core)
+        columns['situational_items'].append(situational)
+        columns['luxury_items'].append(luxury)
+        columns['detailed_items'].append(detailed)
+
+        playstyle = build['playstyle']
+        columns['full_playstyle'].append(
+            len(playstyle['dos']) >= 3 and len(playstyle['donts']) >= 3 and len(playstyle['tips']) >= 3
+        )
+        gameplan = build['gameplan']
+        columns['full_gameplan'].append(
+            len(gameplan['early']) > 20 and len(gameplan['mid']) > 20 and len(gameplan['late']) > 20
+        )
+
+    return columns
+
+def score_builds(builds: List[Dict[str, Any]], hero_roles: Dict[str, str]) -> List[float]:
+    """Score every build, returning scores in input order"""
+    columns = build_features(builds, hero_roles)
+    scores = []
+    for role_mood, is_carry, core, situational, luxury, detailed, full_playstyle, full_gameplan in zip(
+        columns['role_mood'], columns['is_carry'], columns['core_items'],
+        columns['situational_items'], columns['luxury_items'], columns['detailed_items'],
+        columns['full_playstyle'], columns['full_gameplan']
+    ):
+        score = BASE_SCORE + role_mood
+        score += CORE_ITEM_BONUS if core >= 3 else 0.0
+        score += SITUATIONAL_ITEM_BONUS if situational > 0 else 0.0
+        score += LUXURY_ITEM_BONUS if luxury > 0 and is_carry else 0.0
+        score += DESCRIPTION_LENGTH_BONUS if detailed else 0.0
+        score += PLAYSTYLE_COMPLETENESS_BONUS if full_playstyle else 0.0
+        score += GAMEPLAN_COMPLETENESS_BONUS if full_gameplan else 0.0
+        scores.append(max(MIN_SCORE, min(MAX_SCORE, score)))
+    return scores
+
+def score_build(build: Dict[str, Any], hero_role: Optional[str]) -> float:
+    """Score a single build"""
+    return score_builds([build], {build['heroId']: hero_role})[0]
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Score builds from a builds file')
+    parser.add_argument('builds', help='JSON file containing builds array')
+    parser.add_argument('--heroes', help='JSON file containing heroes array (for hero roles)')
+    args = parser.parse_args()
+
+    try:
+        with open(args.builds, 'r', encoding='utf-8') as f:
+            builds = json.load(f)
+        heroes = []
+        if args.heroes:
+            with open(args.heroes, 'r', encoding='utf-8') as f:
+                heroes = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"❌ Could not read input: {str(e)}")
+        sys.exit(1)
+
+    hero_roles = {hero['id']: hero['role'] for hero in heroes}
+    for build, score in zip(builds, score_builds(builds, hero_roles)):
+        print(f"{score:.2f}  {build['heroId']} ({build['mood']})")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Precomputed Build Similarity Index
+
+Finds the builds most similar to every build, across heroes and moods, by
+the Jaccard similarity of their item sets. Each build becomes a bitset over
+the item catalog, packed into a NumPy uint8 array; intersections are ANDed
+bit rows and popcounts, computed a block of builds at a time against all
+others, so no pair of builds is compared in Python.
+
+Index layout (JSON):
+    builds      "heroId/mood" keys; neighbours refer to positions in this list
+    k           neighbours kept per build
+    scale       scores are Jaccard similarity x scale, rounded
+    neighbours  one list per build: [build, score, build, score, ...], best
+                first; builds sharing no items are left out
+
+Usage:
+    python build_similarity.py build_data_final.json                   # Write build_similarity.json
+    python build_similarity.py build_data_final.json --k 5 --cross-hero
+    python build_similarity.py --query axe/aggressive                  # Look up build_similarity.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from item_catalog import ItemCatalog, DEFAULT_CATALOG_PATH
+
+DEFAULT_SIMILARITY_PATH = Path(__file__).with_name('build_similarity.json')
+
+DEFAULT_K = 10
+SCORE_SCALE = 1000
+
+# Rows compared at once; a block holds BLOCK_SIZE x builds x bitset bytes
+BLOCK_SIZE = 256
+
+if NUMPY_AVAILABLE:
+    # NumPy < 2.0 has no bitwise_count; look set bits up per byte instead
+    POPCOUNT_TABLE = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint8)
+
+def build_key(build: Dict[str, Any]) -> str:
+    return f"{build['heroId']}/{build['mood']}"
+
+def item_positions(catalog: ItemCatalog, builds: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Assign a bit to every catalog item, then to items only the builds use"""
+    positions = {item_id: i for i, item_id in enumerate(sorted(catalog.items))}
+    for build in builds:
+        for item in build.get('items', []):
+            positions.setdefault(str(item['id']), len(positions))
+    return positions
+
+def encode_builds(builds: List[Dict[str, Any]], positions: Dict[str, int]) -> 'np.ndarray':
+    """Return one packed item bitset per build as a (builds, bytes) uint8 array"""
+    dense = np.zeros((len(builds), max(len(positions), 1)), dtype=bool)
+    for row, build in enumerate(builds):
+        columns = [positions[str(item['id'])] for item in build.get('items', [])]
+        dense[row, columns] = True
+    return np.packbits(dense, axis=1)
+
+def _popcount(bits: 'np.ndarray') -> 'np.ndarray':
+    """Set bits per row of the last axis"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(bits).sum(axis=-1, dtype=np.int32)
+    return POPCOUNT_TABLE[bits].sum(axis=-1, dtype=np.int32)
+
+def top_neighbours(bits: 'np.ndarray', k: int, groups: Optional['np.ndarray'] = None,
+                   block_size: int = BLOCK_SIZE) -> Tuple['np.ndarray', 'np.ndarray']:
+    """Return (indices, scores) of the k most similar rows for every row
+
+    Scores are Jaccard similarities; a row is never its own neighbour, nor a
+    neighbour of a row in the same group when groups are given. Slots beyond
+    the available candidates hold index -1 and score 0.
+    """
+    count = len(bits)
+    k = min(k, max(count - 1, 0))
+    indices = np.full((count, k), -1, dtype=np.int32)
+    scores = np.zeros((count, k), dtype=np.float32)
+    if k == 0:
+        return indices, scores
+
+    sizes = _popcount(bits)
+    for start in range(0, count, block_size):
+        stop = min(start + block_size, count)
+        block = bits[start:stop]
+        intersections = _popcount(block[:, None, :] & bits[None, :, :])
+        unions = sizes[start:stop, None] + sizes[None, :] - intersections
+        similarity = np.divide(intersections, unions, out=np.zeros(unions.shape, dtype=np.float32),
+                               where=unions > 0, dtype=np.float32)
+
+        rows = np.arange(stop - start)
+        similarity[rows, rows + start] = -1.0
+        if groups is not None:
+            similarity[groups[start:stop, None] == groups[None, :]] = -1.0
+
+        # argpartition finds the top k without sorting the whole row; only
+        # those k are then ordered by score, ties by position. Rows tied with
+        # the k-th score are ranked by position first, so which of them make
+        # the cut doesn't depend on the partition order
+        threshold = -np.partition(-similarity, k - 1, axis=1)[:, k - 1:k]
+        columns = np.arange(count, dtype=np.float64)
+        rank = np.where(similarity > threshold, -1.0, np.where(similarity == threshold, columns, np.inf))
+        candidates = np.argpartition(rank, k - 1, axis=1)[:, :k]
+        candidate_scores = np.take_along_axis(similarity, candidates, axis=1)
+        order = np.lexsort((candidates, -candidate_scores), axis=1)
+        candidates = np.take_along_axis(candidates, order, axis=1)
+        candidate_scores = np.take_along_axis(candidate_scores, order, axis=1)
+
+        excluded = candidate_scores <= 0
+        indices[start:stop] = np.where(excluded, -1, candidates)
+        scores[start:stop] = np.where(excluded, 0.0, candidate_scores)
+    return indices, scores
+
+def build_similarity_index(builds: List[Dict[str, Any]], catalog: ItemCatalog,
+                           k: int = DEFAULT_K, cross_hero: bool = False) -> Dict[str, Any]:
+    """Compute the top-k neighbours of every build"""
+    positions = item_positions(catalog, builds)
+    bits = encode_builds(builds, positions)
+    groups = None
+    if cross_hero:
+        hero_rows: Dict[str, int] = {}
+        groups = np.array([hero_rows.setdefault(build['heroId'], len(hero_rows)) for build in builds], dtype=np.int32)
+    indices, scores = top_neighbours(bits, k, groups)
+
+    neighbours = []
+    for row_indices, row_scores in zip(indices.tolist(), scores.tolist()):
+        encoded = []
+        for index, score in zip(row_indices, row_scores):
+            if index >= 0:
+                encoded.extend([index, round(score * SCORE_SCALE)])
+        neighbours.append(encoded)
+    index = {
+        'builds': [build_key(build) for build in builds],
+        'k': indices.shape[1],
+        'scale': SCORE_SCALE,
+        'neighbours': neighbours
+    }
+    index['rows'] = index_rows(index)
+    return index
+
+def index_rows(index: Dict[str, Any]) -> Dict[str, int]:
+    """Map each "heroId/mood" key to its row; kept in memory, not saved"""
+    return {key: row for row, key in enumerate(index['builds'])}
+
+def similar_builds(index: Dict[str, Any], key: str) -> List[Tuple[str, float]]:
+    """Look up the precomputed neighbours of a "heroId/mood" build"""
+    if 'rows' not in index:
+        index['rows'] = index_rows(index)
+    row = index['rows'].get(key)
+    if row is None:
+        return []
+    encoded = index['neighbours'][row]
+    return [(index['builds'][encoded[i]], encoded[i + 1] / index['scale']) for i in range(0, len(encoded), 2)]
+
+def load_similarity_index(file_path: Path = DEFAULT_SIMILARITY_PATH) -> Dict[str, Any]:
+    """Load a precomputed similarity index, ready for similar_builds lookups"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    index['rows'] = index_rows(index)
+    return index
+
+def save_similarity_index(index: Dict[str, Any], file_path: Path = DEFAULT_SIMILARITY_PATH):
+    """Save a similarity index with one build's neighbours per line"""
+    rows = ',\n    '.join(json.dumps(row, separators=(',', ':')) for row in index['neighbours'])
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write('{\n')
+        f.write(f'  "builds": {json.dumps(index["builds"], ensure_ascii=False)},\n')
+        f.write(f'  "k": {index["k"]},\n')
+        f.write(f'  "scale": {index["scale"]},\n')
+        f.write(f'  "neighbours": [\n    {rows}\n  ]\n')
+        f.write('}\n')
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Build or query the build similarity index')
+    parser.add_argument('builds', nargs='?', help='JSON file containing builds array')
+    parser.add_argument('--catalog', default=str(DEFAULT_CATALOG_PATH), help='Item catalog file')
+    parser.add_argument('--output', default=str(DEFAULT_SIMILARITY_PATH), help='Index file to write or query')
+    parser.add_argument('--k', type=int, default=DEFAULT_K, help='Neighbours to keep per build')
+    parser.add_argument('--cross-hero', action='store_true', help="Only recommend other heroes' builds")
+    parser.add_argument('--query', metavar='HERO/MOOD', help='Show the neighbours of a build from the saved index')
+    args = parser.parse_args()
+
+    if args.query:
+        try:
+            index = load_similarity_index(args.output)
+        except (FileNotFoundError, json.JSONDecodeError) as e:
+            print(f"❌ Could not read {args.output}: {str(e)}")
+            print("   Build it first: python build_similarity.py build_data_final.json")
+            sys.exit(1)
+        neighbours = similar_builds(index, args.query)
+        if not neighbours:
+            print(f"No similar builds for '{args.query}'")
+            return
+        print(f"📋 Builds most similar to {args.query}:")
+        for key, score in neighbours:
+            print(f"🔨 {key} - {score:.2f}")
+        return
+
+    if not args.builds:
+        parser.error('a builds file is required unless --query is given')
+    if not NUMPY_AVAILABLE:
+        print("❌ build_similarity.py needs numpy. Run: pip install numpy")
+        sys.exit(1)
+    if args.k < 1:
+        parser.error('--k must be at least 1')
+
+    try:
+        with open(args.builds, 'r', encoding='utf-8') as f:
+            builds = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"❌ Could not read {args.builds}: {str(e)}")
+        sys.exit(1)
+    builds = list(builds.values()) if isinstance(builds, dict) else builds
+
+    started = time.perf_counter()
+    index = build_similarity_index(builds, ItemCatalog.load(args.catalog), args.k, args.cross_hero)
+    elapsed = time.perf_counter() - started
+
+    save_similarity_index(index, args.output)
+    print(f"✅ Indexed {index['k']} neighbours for each of {len(builds)} builds in {elapsed:.2f}s into {args.output}")
+
+if __name__ == '__main__':
+    main()
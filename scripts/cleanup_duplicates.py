@@ -9,15 +9,22 @@ Usage:
     python cleanup_duplicates.py --dry-run  # Show duplicates without removing
     python cleanup_duplicates.py --remove   # Remove duplicates
     python cleanup_duplicates.py --check    # Just check for duplicates
+    python cleanup_duplicates.py --check --trace  # Also print a request summary
 """
 
 import argparse
+import contextlib
 import os
 import sys
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Optional, Tuple
 from collections import defaultdict
 import logging
 
+from request_tracing import RequestTracer
+from profiling import CommandProfiler, DEFAULT_PROFILE_DIR
+from transport import TransportConfig, add_transport_arguments, configure_transport
+from adaptive_concurrency import AdaptiveConcurrency, DEFAULT_MAX_CONCURRENCY, run_units
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -39,19 +46,22 @@ load_dotenv()
 SUPABASE_URL = os.getenv('VITE_SUPABASE_URL')
 SUPABASE_SERVICE_KEY = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
 
-if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
-    print("❌ Missing Supabase environment variables:")
-    print("   VITE_SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY required")
-    sys.exit(1)
-
-# Initialize Supabase client
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+def create_supabase_client(transport_config: Optional[TransportConfig] = None) -> Client:
+    """Create the Supabase client from environment variables"""
+    if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
+        print("❌ Missing Supabase environment variables:")
+        print("   VITE_SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY required")
+        sys.exit(1)
+    
+    client = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+    return configure_transport(client, transport_config or TransportConfig())
 
 class DuplicateCleaner:
     """Handles duplicate detection and removal"""
     
-    def __init__(self, supabase_client: Client):
+    def __init__(self, supabase_client: Client, controller: Optional[AdaptiveConcurrency] = None):
         self.supabase = supabase_client
+        self.controller = controller
         self.duplicates = {}
     
     def find_hero_duplicates(self) -> List[Dict[str, Any]]:
@@ -367,108 +377,95 @@ class DuplicateCleaner:
         print(f"\n📊 SUMMARY: Found {total_duplicates} duplicate groups")
         return total_duplicates
     
+    def _records_to_remove(self, duplicates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Keep the first record of each duplicate group and return the rest"""
+        return [record for dup in duplicates for record in dup['records'][1:]]
+    
     def remove_hero_duplicates(self, duplicates: List[Dict[str, Any]]) -> int:
         """Remove hero duplicates, keeping the first one"""
-        removed_count = 0
-        
-        for dup in duplicates:
-            # Keep the first record, remove the rest
-            records_to_remove = dup['records'][1:]  # Skip first record
-            
-            for record in records_to_remove:
-                try:
-                    # Remove related data first
-                    self.supabase.table('hero_weaknesses').delete().eq('hero_id', record['id']).execute()
-                    self.supabase.table('hero_strengths').delete().eq('hero_id', record['id']).execute()
-                    self.supabase.table('hero_moods').delete().eq('hero_id', record['id']).execute()
-                    
-                    # Remove the hero
-                    self.supabase.table('heroes').delete().eq('id', record['id']).execute()
-                    removed_count += 1
-                    print(f"🗑️  Removed duplicate hero: {record['id']}")
-                except Exception as e:
-                    print(f"❌ Error removing hero {record['id']}: {str(e)}")
+        def remove(record: Dict[str, Any]) -> bool:
+            try:
+                # Remove related data first
+                self.supabase.table('hero_weaknesses').delete().eq('hero_id', record['id']).execute()
+                self.supabase.table('hero_strengths').delete().eq('hero_id', record['id']).execute()
+                self.supabase.table('hero_moods').delete().eq('hero_id', record['id']).execute()
+                
+                # Remove the hero
+                self.supabase.table('heroes').delete().eq('id', record['id']).execute()
+                print(f"🗑️  Removed duplicate hero: {record['id']}")
+                return True
+            except Exception as e:
+                print(f"❌ Error removing hero {record['id']}: {str(e)}")
+                return False
         
-        return removed_count
+        return sum(run_units(self.controller, self._records_to_remove(duplicates), remove, 'heroes'))
     
     def remove_build_duplicates(self, duplicates: List[Dict[str, Any]]) -> int:
         """Remove build duplicates, keeping the first one"""
-        removed_count = 0
-        
-        for dup in duplicates:
-            # Keep the first record, remove the rest
-            records_to_remove = dup['records'][1:]  # Skip first record
-            
-            for record in records_to_remove:
-                try:
-                    # Remove related data first
-                    self.supabase.table('playstyle_tips').delete().eq('build_id', record['id']).execute()
-                    self.supabase.table('playstyle_donts').delete().eq('build_id', record['id']).execute()
-                    self.supabase.table('playstyle_dos').delete().eq('build_id', record['id']).execute()
-                    self.supabase.table('items').delete().eq('build_id', record['id']).execute()
-                    
-                    # Remove the build
-                    self.supabase.table('builds').delete().eq('id', record['id']).execute()
-                    removed_count += 1
-                    print(f"🗑️  Removed duplicate build: {record['hero_id']} ({record['mood']})")
-                except Exception as e:
-                    print(f"❌ Error removing build {record['id']}: {str(e)}")
+        def remove(record: Dict[str, Any]) -> bool:
+            try:
+                # Remove related data first
+                self.supabase.table('playstyle_tips').delete().eq('build_id', record['id']).execute()
+                self.supabase.table('playstyle_donts').delete().eq('build_id', record['id']).execute()
+                self.supabase.table('playstyle_dos').delete().eq('build_id', record['id']).execute()
+                self.supabase.table('items').delete().eq('build_id', record['id']).execute()
+                
+                # Remove the build
+                self.supabase.table('builds').delete().eq('id', record['id']).execute()
+                print(f"🗑️  Removed duplicate build: {record['hero_id']} ({record['mood']})")
+                return True
+            except Exception as e:
+                print(f"❌ Error removing build {record['id']}: {str(e)}")
+                return False
         
-        return removed_count
+        return sum(run_units(self.controller, self._records_to_remove(duplicates), remove, 'builds'))
     
     def remove_hero_mood_duplicates(self, duplicates: List[Dict[str, Any]]) -> int:
         """Remove hero mood duplicates"""
-        removed_count = 0
+        def remove(record: Dict[str, Any]) -> bool:
+            try:
+                self.supabase.table('hero_moods').delete().eq('hero_id', record['hero_id']).eq('mood', record['mood']).execute()
+                print(f"🗑️  Removed duplicate mood: {record['hero_id']} - {record['mood']}")
+                return True
+            except Exception as e:
+                print(f"❌ Error removing mood: {str(e)}")
+                return False
         
-        for dup in duplicates:
-            # Keep the first record, remove the rest
-            records_to_remove = dup['records'][1:]  # Skip first record
-            
-            for record in records_to_remove:
-                try:
-                    self.supabase.table('hero_moods').delete().eq('hero_id', record['hero_id']).eq('mood', record['mood']).execute()
-                    removed_count += 1
-                    print(f"🗑️  Removed duplicate mood: {record['hero_id']} - {record['mood']}")
-                except Exception as e:
-                    print(f"❌ Error removing mood: {str(e)}")
-        
-        return removed_count
+        return sum(run_units(self.controller, self._records_to_remove(duplicates), remove, 'moods'))
     
     def remove_hero_strength_duplicates(self, duplicates: List[Dict[str, Any]]) -> int:
         """Remove hero strength duplicates"""
-        removed_count = 0
-        
-        for dup in duplicates:
-            # Keep the first record, remove the rest
-            records_to_remove = dup['records'][1:]  # Skip first record
-            
-            for record in records_to_remove:
-                try:
-                    self.supabase.table('hero_strengths').delete().eq('id', record['id']).execute()
-                    removed_count += 1
-                    print(f"🗑️  Removed duplicate strength: {record['hero_id']} - {record['strength'][:30]}...")
-                except Exception as e:
-                    print(f"❌ Error removing strength: {str(e)}")
+        def remove(record: Dict[str, Any]) -> bool:
+            try:
+                self.supabase.table('hero_strengths').delete().eq('id', record['id']).execute()
+                print(f"🗑️  Removed duplicate strength: {record['hero_id']} - {record['strength'][:30]}...")
+                return True
+            except Exception as e:
+                print(f"❌ Error removing strength: {str(e)}")
+                return False
         
-        return removed_count
+        return sum(run_units(self.controller, self._records_to_remove(duplicates), remove, 'strengths'))
     
     def remove_hero_weakness_duplicates(self, duplicates: List[Dict[str, Any]]) -> int:
         """Remove hero weakness duplicates"""
-        removed_count = 0
+        def remove(record: Dict[str, Any]) -> bool:
+            try:
+                self.supabase.table('hero_weaknesses').delete().eq('id', record['id']).execute()
+                print(f"🗑️  Removed duplicate weakness: {record['hero_id']} - {record['weakness'][:30]}...")
+                return True
+            except Exception as e:
+                print(f"❌ Error removing weakness: {str(e)}")
+                return False
         
-        for dup in duplicates:
-            # Keep the first record, remove the rest
-            records_to_remove = dup['records'][1:]  # Skip first record
-            
-            for record in records_to_remove:
-                try:
-                    self.supabase.table('hero_weaknesses').delete().eq('id', record['id']).execute()
-                    removed_count += 1
-                    print(f"🗑️  Removed duplicate weakness: {record['hero_id']} - {record['weakness'][:30]}...")
-                except Exception as e:
-                    print(f"❌ Error removing weakness: {str(e)}")
-        
-        return removed_count
+        return sum(run_units(self.controller, self._records_to_remove(duplicates), remove, 'weaknesses'))
+    
+    def refresh_views(self):
+        """Rebuild the build_documents view so the API stops serving removed rows"""
+        try:
+            self.supabase.rpc('refresh_build_documents').execute()
+            print("🔄 Refreshed build documents")
+        except Exception as e:
+            print(f"⚠️  Could not refresh build documents: {str(e)}")
     
     def remove_all_duplicates(self, duplicates: Dict[str, List[Dict[str, Any]]]) -> int:
         """Remove all duplicates"""
@@ -495,12 +492,23 @@ Examples:
   %(prog)s --check        # Check for duplicates
   %(prog)s --dry-run      # Show what would be removed
   %(prog)s --remove       # Remove duplicates
+  %(prog)s --check --trace --trace-file trace.json
+  %(prog)s --check --profile
+  %(prog)s --remove --max-retries 6 --read-timeout 60
+  %(prog)s --remove --max-concurrency 4
         """
     )
     
     parser.add_argument('--check', action='store_true', help='Check for duplicates without removing')
     parser.add_argument('--dry-run', action='store_true', help='Show what would be removed')
     parser.add_argument('--remove', action='store_true', help='Remove duplicates')
+    parser.add_argument('--trace', action='store_true', help='Print a per-table request summary at the end')
+    parser.add_argument('--trace-file', help='Also write a Chrome trace-event JSON file (implies --trace)')
+    parser.add_argument('--profile', action='store_true', help='Profile CPU time and allocations of the command')
+    parser.add_argument('--profile-dir', default=DEFAULT_PROFILE_DIR, help='Directory for profile reports')
+    parser.add_argument('--max-concurrency', type=int, default=DEFAULT_MAX_CONCURRENCY,
+                        help='Enable adaptive concurrency up to this many deletes in flight (default 1: one at a time)')
+    add_transport_arguments(parser)
     
     args = parser.parse_args()
     
@@ -508,9 +516,35 @@ Examples:
         parser.print_help()
         return
     
+    if args.profile and args.max_concurrency > 1:
+        # cProfile only sees the main thread, not the pool workers doing the work
+        print("❌ --profile cannot be combined with --max-concurrency above 1")
+        return
+    
     # Initialize cleaner
-    cleaner = DuplicateCleaner(supabase)
+    supabase = create_supabase_client(TransportConfig.from_args(args))
+    tracing = args.trace or args.trace_file
+    # Profiling uses the tracer to separate network wait from local work
+    tracer = RequestTracer(measure_payloads=bool(tracing)) if tracing or args.profile else None
+    if tracer:
+        supabase = tracer.wrap(supabase)
+    controller = AdaptiveConcurrency(args.max_concurrency) if args.max_concurrency > 1 else None
+    if controller:
+        supabase = controller.wrap(supabase)
+    cleaner = DuplicateCleaner(supabase, controller)
     
+    profiler = CommandProfiler('cleanup', args.profile_dir, tracer) if args.profile else contextlib.nullcontext()
+    try:
+        with profiler:
+            run_cleanup(args, cleaner)
+    finally:
+        if tracing:
+            tracer.print_summary()
+            if args.trace_file:
+                tracer.write_chrome_trace(args.trace_file)
+
+def run_cleanup(args: argparse.Namespace, cleaner: DuplicateCleaner):
+    """Find duplicates and report or remove them"""
     # Find all duplicates
     duplicates = cleaner.find_all_duplicates()
     
@@ -541,6 +575,8 @@ Examples:
         # Remove duplicates
         removed_count = cleaner.remove_all_duplicates(duplicates)
         print(f"\n✅ Successfully removed {removed_count} duplicate records")
+        if removed_count:
+            cleaner.refresh_views()
 
 if __name__ == '__main__':
     main() 
\ No newline at end of file
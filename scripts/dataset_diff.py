@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Keyed Diff for Hero and Build Files
+
+Compares two versions of a dataset (e.g. build_data.json and
+build_data_final.json) record by record. Both files are indexed by record key
+- (heroId, mood) for builds, id for heroes - and only records whose content
+hash differs are compared field by field, so the diff is linear in the size of
+the files no matter how records are ordered.
+
+Files may hold an array of records or an object keyed by hero id, like
+build_data copy.json.
+
+Usage:
+    python dataset_diff.py build_data.json build_data_final.json              # Readable report
+    python dataset_diff.py build_data.json build_data_final.json --json-patch # RFC 6902 patch
+    python dataset_diff.py build_data.json build_data_final.json --by-hero    # Across a mood remap
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+# Longest value printed in the readable report
+MAX_VALUE_WIDTH = 70
+
+def iter_records(data: Any) -> Iterator[Dict[str, Any]]:
+    """Yield the records of an array or an object keyed by hero id"""
+    values = data.values() if isinstance(data, dict) else data
+    for record in values:
+        if isinstance(record, dict):
+            yield record
+
+def record_key(record: Dict[str, Any], by_hero: bool = False) -> str:
+    """Return 'heroId/mood' (or just heroId) for a build and the id for a hero"""
+    if 'heroId' in record:
+        return record['heroId'] if by_hero else f"{record['heroId']}/{record.get('mood')}"
+    return str(record.get('id'))
+
+def content_hash(record: Dict[str, Any]) -> str:
+    return hashlib.sha1(json.dumps(record, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+def _pointer(parts: Iterable[Any]) -> str:
+    """JSON Pointer (RFC 6901) for a path"""
+    return ''.join('/' + str(part).replace('~', '~0').replace('/', '~1') for part in parts)
+
+def diff_values(old: Any, new: Any, path: List[Any]) -> Iterator[Dict[str, Any]]:
+    """Yield JSON Patch operations that turn old into new
+
+    Replace operations also carry the 'old' value for the readable report.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old:
+            if key not in new:
+                yield {'op': 'remove', 'path': _pointer(path + [key])}
+        for key, value in new.items():
+            if key not in old:
+                yield {'op': 'add', 'path': _pointer(path + [key]), 'value': value}
+            else:
+                yield from diff_values(old[key], value, path + [key])
+    elif isinstance(old, list) and isinstance(new, list):
+        common = min(len(old), len(new))
+        for index in range(common):
+            yield from diff_values(old[index], new[index], path + [index])
+        for index in range(common, len(new)):
+            yield {'op': 'add', 'path': _pointer(path + [index]), 'value': new[index]}
+        # Remove from the end so earlier indexes stay valid while applying the patch
+        for index in range(len(old) - 1, common - 1, -1):
+            yield {'op': 'remove', 'path': _pointer(path + [index])}
+    elif old != new or type(old) is not type(new):
+        yield {'op': 'replace', 'path': _pointer(path), 'value': new, 'old': old}
+
+def _index(records: Iterable[Dict[str, Any]], label: str, by_hero: bool) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+    index = {}
+    for record in records:
+        key = record_key(record, by_hero)
+        if key in index:
+            print(f"⚠️  {label}: duplicate record {key}, keeping the first", file=sys.stderr)
+            continue
+        index[key] = (content_hash(record), record)
+    return index
+
+def diff_datasets(old_records: Iterable[Dict[str, Any]],
+                  new_records: Iterable[Dict[str, Any]],
+                  by_hero: bool = False) -> Iterator[Tuple[str, str, List[Dict[str, Any]]]]:
+    """Yield (status, key, operations) for every added, removed or changed record
+
+    The old file is indexed once; the new file is streamed against it.
+    Operations are relative to the record.
+    """
+    old_index = _index(old_records, 'old', by_hero)
+    seen = set()
+    for record in new_records:
+        key = record_key(record, by_hero)
+        if key in seen:
+            print(f"⚠️  new: duplicate record {key}, keeping the first", file=sys.stderr)
+            continue
+        seen.add(key)
+
+        if key not in old_index:
+            yield 'added', key, [{'op': 'add', 'path': '', 'value': record}]
+            continue
+        old_hash, old_record = old_index[key]
+        if old_hash == content_hash(record):
+            yield 'unchanged', key, []
+        else:
+            yield 'changed', key, list(diff_values(old_record, record, []))
+
+    for key, (_, old_record) in old_index.items():
+        if key not in seen:
+            yield 'removed', key, [{'op': 'remove', 'path': ''}]
+
+def _short(value: Any) -> str:
+    text = json.dumps(value, ensure_ascii=False)
+    return text if len(text) <= MAX_VALUE_WIDTH else text[:MAX_VALUE_WIDTH - 3] + '...'
+
+def _field(path: str) -> str:
+    """Turn '/items/3/cost' into 'items[3].cost'"""
+    field = ''
+    for part in path.split('/')[1:]:
+        part = part.replace('~1', '/').replace('~0', '~')
+        field += f"[{part}]" if part.isdigit() else f".{part}"
+    return field.lstrip('.')
+
+def print_report(changes: Iterable[Tuple[str, str, List[Dict[str, Any]]]]) -> Dict[str, int]:
+    """Print a readable report as the diff streams in and return per-status counts"""
+    counts = {'added': 0, 'removed': 0, 'changed': 0, 'unchanged': 0}
+    symbols = {'added': '+', 'removed': '-', 'changed': '~'}
+    for status, key, operations in changes:
+        counts[status] += 1
+        if status == 'unchanged':
+            continue
+        print(f"{symbols[status]} {key}")
+        if status != 'changed':
+            continue
+        for operation in operations:
+            field = _field(operation['path'])
+            if operation['op'] == 'replace':
+                print(f"    {field}: {_short(operation['old'])} → {_short(operation['value'])}")
+            elif operation['op'] == 'add':
+                print(f"    + {field}: {_short(operation['value'])}")
+            else:
+                print(f"    - {field}")
+
+    print(f"\n📊 {counts['added']} added, {counts['removed']} removed, "
+          f"{counts['changed']} changed, {counts['unchanged']} unchanged")
+    return counts
+
+def write_json_patch(changes: Iterable[Tuple[str, str, List[Dict[str, Any]]]], out: Any) -> Dict[str, int]:
+    """Stream one JSON Patch for the keyed form of the dataset
+
+    Paths address records by key, i.e. the patch applies to
+    {"abaddon/protective": {...}, ...} with '/' escaped as '~1'.
+    """
+    counts = {'added': 0, 'removed': 0, 'changed': 0, 'unchanged': 0}
+    out.write('[')
+    first = True
+    for status, key, operations in changes:
+        counts[status] += 1
+        for operation in operations:
+            operation = dict(operation, path=_pointer([key]) + operation['path'])
+            operation.pop('old', None)
+            out.write(('\n  ' if first else ',\n  ') + json.dumps(operation, ensure_ascii=False))
+            first = False
+    out.write('\n]\n' if not first else ']\n')
+    return counts
+
+def load_dataset(file_path: str) -> Any:
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"❌ Could not read {file_path}: {str(e)}", file=sys.stderr)
+        sys.exit(2)
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Show what changed between two hero or build files')
+    parser.add_argument('old', help='Original JSON file')
+    parser.add_argument('new', help='Changed JSON file')
+    parser.add_argument('--json-patch', action='store_true', help='Write an RFC 6902 JSON Patch instead of a report')
+    parser.add_argument('--output', help='Write the JSON Patch to this file instead of stdout')
+    parser.add_argument('--by-hero', action='store_true',
+                        help='Match builds by heroId alone, e.g. to compare files before and after a mood remap')
+    args = parser.parse_args()
+
+    changes = diff_datasets(iter_records(load_dataset(args.old)), iter_records(load_dataset(args.new)), args.by_hero)
+
+    if args.json_patch:
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                counts = write_json_patch(changes, f)
+            print(f"✅ Wrote patch for {counts['added'] + counts['removed'] + counts['changed']} records to {args.output}")
+        else:
+            counts = write_json_patch(changes, sys.stdout)
+    else:
+        counts = print_report(changes)
+
+    # Exit like diff(1): 0 when identical, 1 when the files differ
+    sys.exit(1 if counts['added'] or counts['removed'] or counts['changed'] else 0)
+
+if __name__ == '__main__':
+    main()
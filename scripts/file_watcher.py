@@ -0,0 +1,97 @@
+"""
+Directory Watcher for Build Files
+
+Yields batches of changed JSON files in a directory. On Linux with the
+optional `inotify_simple` package installed the kernel reports changes; other
+platforms fall back to polling file modification times. Either way changes are
+debounced: a batch is only released once the directory has been quiet for
+`debounce` seconds, so an editor saving a file several times in a row (or a
+script rewriting many files) results in one sync.
+"""
+
+import time
+from pathlib import Path
+from typing import Dict, Iterator, Set, Tuple
+
+try:
+    from inotify_simple import INotify, flags
+    INOTIFY_AVAILABLE = True
+except ImportError:
+    INOTIFY_AVAILABLE = False
+
+DEFAULT_DEBOUNCE = 1.0
+DEFAULT_POLL_INTERVAL = 1.0
+
+class DirectoryWatcher:
+    """Watches a directory for changed *.json files"""
+
+    def __init__(self, directory: str, pattern: str = '*.json',
+                 debounce: float = DEFAULT_DEBOUNCE, poll_interval: float = DEFAULT_POLL_INTERVAL,
+                 use_inotify: bool = True):
+        self.directory = Path(directory)
+        self.pattern = pattern
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify and INOTIFY_AVAILABLE
+
+    @property
+    def backend(self) -> str:
+        return 'inotify' if self.use_inotify else 'polling'
+
+    def files(self) -> Set[Path]:
+        return {path for path in self.directory.glob(self.pattern) if path.is_file()}
+
+    def changes(self) -> Iterator[Set[Path]]:
+        """Yield debounced sets of created or modified files, forever"""
+        if self.use_inotify:
+            return self._inotify_changes()
+        return self._polling_changes()
+
+    def _inotify_changes(self) -> Iterator[Set[Path]]:
+        inotify = INotify()
+        # CLOSE_WRITE and MOVED_TO fire once the file is complete, which covers
+        # both in-place saves and editors that write a temp file and rename it
+        inotify.add_watch(str(self.directory), flags.CLOSE_WRITE | flags.MOVED_TO)
+        pending: Set[Path] = set()
+        try:
+            while True:
+                # Block until something happens, then keep collecting until quiet
+                timeout = self.debounce * 1000 if pending else None
+                events = inotify.read(timeout=timeout)
+                if not events:
+                    if pending:
+                        yield pending
+                        pending = set()
+                    continue
+                for event in events:
+                    path = self.directory / event.name
+                    if path.match(self.pattern):
+                        pending.add(path)
+        finally:
+            inotify.close()
+
+    def _snapshot(self) -> Dict[Path, Tuple[float, int]]:
+        snapshot = {}
+        for path in self.files():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            snapshot[path] = (stat.st_mtime, stat.st_size)
+        return snapshot
+
+    def _polling_changes(self) -> Iterator[Set[Path]]:
+        previous = self._snapshot()
+        pending: Set[Path] = set()
+        last_change = 0.0
+        while True:
+            time.sleep(self.poll_interval)
+            current = self._snapshot()
+            changed = {path for path, signature in current.items() if previous.get(path) != signature}
+            previous = current
+            if changed:
+                pending |= changed
+                last_change = time.monotonic()
+            elif pending and time.monotonic() - last_change >= self.debounce:
+                yield {path for path in pending if path.exists()}
+                pending = set()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Code-Split Frontend Data Generator
+
+Emits the frontend's static hero and build data from the canonical JSON
+dataset instead of keeping hand-written TypeScript in sync:
+
+    src/data/generated/index.ts          hero summaries for lists and search,
+                                         plus loadHero(id)
+    src/data/generated/heroes/<id>.ts    one chunk per hero: full hero and
+                                         its builds, loaded with import()
+    src/data/generated/manifest.json     chunk files and content hashes
+
+Each chunk is a separate dynamic import, so the bundler splits it out and the
+initial bundle only carries the summaries. Output is deterministic; --check
+regenerates in memory and fails if the files on disk differ.
+
+Usage:
+    python generate_data_modules.py --heroes heroes.json --builds build_data_final.json
+    python generate_data_modules.py --mirror mirror.json        # From a pull mirror
+    python generate_data_modules.py --mirror mirror.json --check
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_OUTPUT_DIR = ROOT_DIR / 'src' / 'data' / 'generated'
+TYPES_DIR = ROOT_DIR / 'src' / 'types'
+
+HERO_FIELDS = ['id', 'name', 'role', 'difficulty', 'moods', 'description', 'strengths', 'weaknesses']
+SUMMARY_FIELDS = ['id', 'name', 'role', 'difficulty', 'moods']
+ITEM_FIELDS = ['id', 'name', 'cost', 'phase', 'priority', 'description']
+
+def _literal(value: Any, indent: int = 0) -> str:
+    """Format a JSON value as a TypeScript literal, indented like the hand-written modules"""
+    text = json.dumps(value, indent=2, ensure_ascii=False)
+    return text.replace('\n', '\n' + ' ' * indent)
+
+def _header(source: str) -> str:
+    return f"// Generated by scripts/generate_data_modules.py from {source}. Do not edit.\n"
+
+def _types_import(from_dir: Path, output_dir: Path) -> str:
+    # Resolve against the real output location so --check produces the same text
+    relative = os.path.relpath(TYPES_DIR, output_dir / from_dir).replace(os.sep, '/')
+    return relative if relative.startswith('.') else './' + relative
+
+def chunk_name(hero_id: str) -> str:
+    return re.sub(r'[^A-Za-z0-9_-]', '_', hero_id)
+
+def clean_hero(hero: Dict[str, Any]) -> Dict[str, Any]:
+    return {field: hero.get(field) if field != 'moods' else list(hero.get('moods') or []) for field in HERO_FIELDS}
+
+def clean_build(build: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep the fields of the Build type, in a stable order"""
+    playstyle = build.get('playstyle') or {}
+    gameplan = build.get('gameplan') or {}
+    cleaned = {'heroId': build['heroId'], 'mood': build['mood']}
+    if build.get('score') is not None:
+        cleaned['score'] = build['score']
+    cleaned['items'] = [{field: item.get(field) for field in ITEM_FIELDS} for item in build.get('items') or []]
+    cleaned['playstyle'] = {key: list(playstyle.get(key) or []) for key in ('dos', 'donts', 'tips')}
+    cleaned['gameplan'] = {key: gameplan.get(key) or '' for key in ('early', 'mid', 'late')}
+    return cleaned
+
+def render_modules(heroes: List[Dict[str, Any]], builds: List[Dict[str, Any]],
+                   source: str, output_dir: Path) -> Dict[str, str]:
+    """Return {relative path: file content} for every generated file"""
+    heroes = sorted((clean_hero(hero) for hero in heroes), key=lambda hero: hero['id'])
+    builds_by_hero: Dict[str, List[Dict[str, Any]]] = {}
+    for build in builds:
+        builds_by_hero.setdefault(build['heroId'], []).append(clean_build(build))
+    known = {hero['id'] for hero in heroes}
+    for hero_id in sorted(set(builds_by_hero) - known):
+        print(f"⚠️  Skipping {len(builds_by_hero[hero_id])} builds for unknown hero '{hero_id}'")
+
+    files: Dict[str, str] = {}
+    manifest: Dict[str, Any] = {'source': source, 'heroes': {}}
+    chunk_types = _types_import(Path('heroes'), output_dir)
+    for hero in heroes:
+        hero_builds = sorted(builds_by_hero.get(hero['id'], []), key=lambda build: build['mood'])
+        path = f"heroes/{chunk_name(hero['id'])}.ts"
+        files[path] = (
+            _header(source)
+            + f"import type {{ Build, Hero }} from '{chunk_types}';\n\n"
+            + f"export const hero: Hero = {_literal(hero)};\n\n"
+            + f"export const builds: Build[] = {_literal(hero_builds)};\n"
+        )
+        manifest['heroes'][hero['id']] = {
+            'file': path,
+            'moods': [build['mood'] for build in hero_builds],
+            'sha1': hashlib.sha1(files[path].encode('utf-8')).hexdigest()
+        }
+
+    summaries = ',\n'.join(
+        '  ' + json.dumps({field: hero[field] for field in SUMMARY_FIELDS}, ensure_ascii=False)
+        for hero in heroes
+    )
+    loaders = ',\n'.join(
+        f"  {json.dumps(hero['id'])}: () => import('./heroes/{chunk_name(hero['id'])}')" for hero in heroes
+    )
+    files['index.ts'] = (
+        _header(source)
+        + f"import type {{ Build, Hero }} from '{_types_import(Path('.'), output_dir)}';\n\n"
+        + "export type HeroSummary = Pick<Hero, 'id' | 'name' | 'role' | 'difficulty' | 'moods'>;\n\n"
+        + "export interface HeroChunk {\n  hero: Hero;\n  builds: Build[];\n}\n\n"
+        + f"export const heroIndex: HeroSummary[] = [\n{summaries}\n];\n\n"
+        + "// One dynamic import per hero, so each becomes its own lazily loaded chunk\n"
+        + f"const chunks: Record<string, () => Promise<HeroChunk>> = {{\n{loaders}\n}};\n\n"
+        + "export function loadHero(id: string): Promise<HeroChunk> | undefined {\n"
+        + "  return chunks[id]?.();\n"
+        + "}\n"
+    )
+    files['manifest.json'] = json.dumps(manifest, indent=2, ensure_ascii=False) + '\n'
+    return files
+
+def write_modules(files: Dict[str, str], output_dir: Path) -> Tuple[int, int]:
+    """Write changed files and delete chunks of heroes no longer in the dataset"""
+    written = 0
+    for path, content in files.items():
+        target = output_dir / path
+        if target.exists() and target.read_text(encoding='utf-8') == content:
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(content, encoding='utf-8')
+        written += 1
+
+    removed = 0
+    for stale in (output_dir / 'heroes').glob('*.ts'):
+        if f"heroes/{stale.name}" not in files:
+            stale.unlink()
+            removed += 1
+    return written, removed
+
+def check_modules(files: Dict[str, str], output_dir: Path) -> List[str]:
+    """Return the generated files that are missing, stale or no longer produced"""
+    drift = [path for path, content in files.items()
+             if not (output_dir / path).exists() or (output_dir / path).read_text(encoding='utf-8') != content]
+    drift.extend(f"heroes/{stale.name}" for stale in (output_dir / 'heroes').glob('*.ts')
+                 if f"heroes/{stale.name}" not in files)
+    return sorted(drift)
+
+def load_json(file_path: str) -> Any:
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"❌ Could not read {file_path}: {str(e)}")
+        sys.exit(1)
+
+def _records(data: Any) -> List[Dict[str, Any]]:
+    return list(data.values()) if isinstance(data, dict) else list(data)
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Generate code-split frontend hero and build modules')
+    parser.add_argument('--heroes', help='JSON file containing heroes array')
+    parser.add_argument('--builds', help='JSON file containing builds array')
+    parser.add_argument('--mirror', help='JSON mirror written by manage_dota_data.py pull')
+    parser.add_argument('--output-dir', default=str(DEFAULT_OUTPUT_DIR), help='Directory for the generated modules')
+    parser.add_argument('--check', action='store_true', help='Fail if the generated files are out of date')
+    args = parser.parse_args()
+
+    if args.mirror:
+        mirror = load_json(args.mirror)
+        heroes, builds = mirror.get('heroes') or [], mirror.get('builds') or []
+        source = Path(args.mirror).name
+    elif args.heroes:
+        heroes = _records(load_json(args.heroes))
+        builds = _records(load_json(args.builds)) if args.builds else []
+        source = ' + '.join(Path(path).name for path in (args.heroes, args.builds) if path)
+    else:
+        parser.error('give --mirror, or --heroes with optional --builds')
+
+    output_dir = Path(args.output_dir).resolve()
+    files = render_modules(heroes, builds, source, output_dir)
+
+    if args.check:
+        drift = check_modules(files, output_dir)
+        if drift:
+            print(f"❌ {len(drift)} generated files are out of date:")
+            for path in drift:
+                print(f"  - {path}")
+            print("Run generate_data_modules.py without --check to update them")
+            sys.exit(1)
+        print(f"✅ Generated data in {output_dir} is up to date")
+        return
+
+    written, removed = write_modules(files, output_dir)
+    index_size = len(files['index.ts'].encode('utf-8'))
+    print(f"✅ {len(files) - 2} hero chunks in {output_dir}: {written} files written, {removed} removed")
+    print(f"📦 index.ts is {index_size / 1024:.1f} KiB; hero chunks load on demand")
+
+if __name__ == '__main__':
+    main()
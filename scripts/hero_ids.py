@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Hero Id Canonicalization
+
+Resolves the hero ids found in build files ("death_prophet", "Death Prophet",
+"antimage", "npc_dota_hero_zuus", "juggernuat") to the canonical database id
+("death-prophet", "anti-mage", "zeus", "juggernaut"). Known ids and names are
+normalized into an alias map for exact lookups; anything else goes through a
+BK-tree over the normalized keys, which finds ids within a small edit distance
+without comparing against every hero. Inputs that match several heroes equally
+well are reported as ambiguous instead of being guessed.
+
+Canonical heroes come from the database, a heroes JSON file or the frontend's
+src/data/heroes.ts.
+
+Usage:
+    python hero_ids.py build_data_final.json                        # Report what would change
+    python hero_ids.py build_data_final.json --output fixed.json    # Write the resolved file
+    python hero_ids.py build_data_final.json --heroes heroes.json   # Use another hero list
+"""
+
+import argparse
+import json
+import re
+import sys
+import unicodedata
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_HEROES_TS = Path(__file__).resolve().parent.parent / 'src' / 'data' / 'heroes.ts'
+
+# Internal names from the game files that share nothing with the display name
+INTERNAL_NAMES = {
+    'abyssal_underlord': 'underlord',
+    'centaur': 'centaur_warrunner',
+    'doom_bringer': 'doom',
+    'furion': 'natures_prophet',
+    'life_stealer': 'lifestealer',
+    'magnataur': 'magnus',
+    'necrolyte': 'necrophos',
+    'nevermore': 'shadow_fiend',
+    'obsidian_destroyer': 'outworld_destroyer',
+    'queenofpain': 'queen_of_pain',
+    'rattletrap': 'clockwerk',
+    'shredder': 'timbersaw',
+    'skeleton_king': 'wraith_king',
+    'treant': 'treant_protector',
+    'windrunner': 'windranger',
+    'wisp': 'io',
+    'zuus': 'zeus'
+}
+
+GAME_PREFIX = 'npc_dota_hero_'
+
+def normalize_key(text: str) -> str:
+    """Reduce an id or name to lowercase letters and digits"""
+    text = unicodedata.normalize('NFKD', str(text))
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    if text.startswith(GAME_PREFIX):
+        text = text[len(GAME_PREFIX):]
+    return re.sub(r'[^a-z0-9]', '', text)
+
+def edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+class BKTree:
+    """Metric tree over strings for edit-distance range queries"""
+
+    def __init__(self, words: Iterable[str] = ()):
+        self.root: Optional[Tuple[str, Dict[int, Any]]] = None
+        for word in words:
+            self.add(word)
+
+    def add(self, word: str):
+        if self.root is None:
+            self.root = (word, {})
+            return
+        node = self.root
+        while True:
+            distance = edit_distance(word, node[0])
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = (word, {})
+                return
+            node = child
+
+    def search(self, word: str, max_distance: int) -> List[Tuple[int, str]]:
+        """Return (distance, word) for every word within max_distance, closest first"""
+        matches = []
+        stack = [self.root] if self.root else []
+        while stack:
+            node_word, children = stack.pop()
+            distance = edit_distance(word, node_word)
+            if distance <= max_distance:
+                matches.append((distance, node_word))
+            # Triangle inequality: only children in this band can be close enough
+            for child_distance, child in children.items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    stack.append(child)
+        return sorted(matches)
+
+@dataclass
+class Resolution:
+    """Outcome of resolving one hero id"""
+    value: str
+    hero_id: Optional[str] = None
+    method: str = 'unknown'
+    candidates: List[str] = field(default_factory=list)
+
+    @property
+    def resolved(self) -> bool:
+        return self.hero_id is not None
+
+class HeroIdResolver:
+    """Maps loosely written hero ids to canonical ones"""
+
+    def __init__(self, heroes: Iterable[Dict[str, Any]]):
+        self.hero_ids: List[str] = []
+        self.aliases: Dict[str, List[str]] = {}
+        for hero in heroes:
+            hero_id = str(hero['id'])
+            self.hero_ids.append(hero_id)
+            for alias in (hero_id, hero.get('name')):
+                if alias:
+                    self._add_alias(normalize_key(alias), hero_id)
+        # Game-file names only apply when the hero they point to is known
+        for internal, display in INTERNAL_NAMES.items():
+            targets = self.aliases.get(normalize_key(display))
+            if targets and normalize_key(internal) not in self.aliases:
+                self.aliases[normalize_key(internal)] = list(targets)
+        self.known_ids = set(self.hero_ids)
+        self.tree = BKTree(self.aliases)
+        self._cache: Dict[str, Resolution] = {}
+
+    def _add_alias(self, key: str, hero_id: str):
+        targets = self.aliases.setdefault(key, [])
+        if hero_id not in targets:
+            targets.append(hero_id)
+
+    @classmethod
+    def from_database(cls, supabase_client: Any,
+                      extra_heroes: Iterable[Dict[str, Any]] = ()) -> 'HeroIdResolver':
+        """Build a resolver from one fetch of every hero id and name"""
+        result = supabase_client.table('heroes').select('id, name').execute()
+        return cls(list(result.data or []) + list(extra_heroes))
+
+    @staticmethod
+    def _max_distance(key: str) -> int:
+        # Short ids are too close to each other for a second edit to be safe
+        return 1 if len(key) <= 5 else 2
+
+    def resolve(self, value: str) -> Resolution:
+        """Resolve an id or name, memoizing the answer"""
+        if value in self._cache:
+            return self._cache[value]
+
+        if value in self.known_ids:
+            resolution = Resolution(value, value, 'exact')
+        else:
+            key = normalize_key(value)
+            targets = self.aliases.get(key, [])
+            if len(targets) == 1:
+                resolution = Resolution(value, targets[0], 'alias')
+            elif targets:
+                resolution = Resolution(value, None, 'ambiguous', sorted(targets))
+            else:
+                resolution = self._fuzzy(value, key)
+        self._cache[value] = resolution
+        return resolution
+
+    def _fuzzy(self, value: str, key: str) -> Resolution:
+        matches = self.tree.search(key, self._max_distance(key)) if key else []
+        if not matches:
+            return Resolution(value)
+        best_distance = matches[0][0]
+        candidates = sorted({
+            hero_id for distance, alias in matches if distance == best_distance
+            for hero_id in self.aliases[alias]
+        })
+        if len(candidates) == 1:
+            return Resolution(value, candidates[0], 'fuzzy')
+        return Resolution(value, None, 'ambiguous', candidates)
+
+def canonicalize_records(records: Iterable[Dict[str, Any]], resolver: HeroIdResolver,
+                         key: str = 'heroId') -> List[Resolution]:
+    """Rewrite record[key] to the canonical id where it resolves; return the non-exact resolutions"""
+    changes = {}
+    for record in records:
+        value = record.get(key)
+        if value is None:
+            continue
+        resolution = resolver.resolve(str(value))
+        if resolution.resolved:
+            record[key] = resolution.hero_id
+        if resolution.method != 'exact':
+            changes[resolution.value] = resolution
+    return list(changes.values())
+
+def print_resolutions(resolutions: List[Resolution]):
+    """Print how non-canonical hero ids were resolved"""
+    for resolution in resolutions:
+        if resolution.method == 'ambiguous':
+            print(f"⚠️  Ambiguous hero '{resolution.value}': could be {', '.join(resolution.candidates)}")
+        elif resolution.method == 'unknown':
+            print(f"❌ Unknown hero '{resolution.value}'")
+        else:
+            print(f"🔗 {resolution.value} → {resolution.hero_id} ({resolution.method})")
+
+def load_heroes_ts(file_path: Path = DEFAULT_HEROES_TS) -> List[Dict[str, Any]]:
+    """Read hero ids and names from the frontend's static hero module"""
+    text = file_path.read_text(encoding='utf-8')
+    pattern = re.compile(r"id:\s*'([^']+)',\s*name:\s*(['\"])(.+?)\2")
+    return [{'id': match.group(1), 'name': match.group(3)} for match in pattern.finditer(text)]
+
+def load_heroes(file_path: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Load canonical heroes from a JSON array or a heroes.ts module"""
+    path = Path(file_path) if file_path else DEFAULT_HEROES_TS
+    if path.suffix == '.ts':
+        return load_heroes_ts(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return list(data.values()) if isinstance(data, dict) else data
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Resolve hero ids in a builds file to canonical ids')
+    parser.add_argument('builds', help='JSON file containing builds array')
+    parser.add_argument('--heroes', help=f'Canonical heroes (JSON array or .ts module, default {DEFAULT_HEROES_TS.name})')
+    parser.add_argument('--output', help='Write the resolved builds to this file')
+    args = parser.parse_args()
+
+    try:
+        resolver = HeroIdResolver(load_heroes(args.heroes))
+        with open(args.builds, 'r', encoding='utf-8') as f:
+            builds = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"❌ Could not read input: {str(e)}")
+        sys.exit(1)
+
+    records = list(builds.values()) if isinstance(builds, dict) else builds
+    resolutions = canonicalize_records(records, resolver)
+    print_resolutions(resolutions)
+    unresolved = [resolution for resolution in resolutions if not resolution.resolved]
+    print(f"📊 {len(records)} builds, {len(resolutions) - len(unresolved)} ids resolved, {len(unresolved)} unresolved")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(builds, f, indent=2)
+        print(f"✅ Wrote {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Item Catalog for Dota 2 Builds
+
+Normalizes the items that every build carries inline (id, name, cost and
+description) into a single catalog keyed by item id. Each item id maps to
+exactly one shared CatalogItem record, so the same Blink Dagger is stored
+once no matter how many builds use it. Builds reference catalog entries and
+only keep a description when it differs from the catalog one.
+
+Usage:
+    python item_catalog.py build_data_final.json            # Print catalog summary
+    python item_catalog.py build_data_final.json --write    # Write item_catalog.json
+"""
+
+import argparse
+import json
+import sys
+from collections import Counter, defaultdict
+from dataclasses import dataclass, asdict, replace
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+
+DEFAULT_CATALOG_PATH = Path(__file__).with_name('item_catalog.json')
+
+@dataclass(frozen=True)
+class CatalogItem:
+    """Catalog item data structure"""
+    id: str
+    name: str
+    cost: int
+    description: str
+
+class ItemCatalog:
+    """Interned item records keyed by item id"""
+
+    def __init__(self, items: Optional[Dict[str, CatalogItem]] = None):
+        self.items: Dict[str, CatalogItem] = dict(items or {})
+        self.conflicts: List[Dict[str, Any]] = []
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __contains__(self, item_id: str) -> bool:
+        return str(item_id) in self.items
+
+    def get(self, item_id: str) -> Optional[CatalogItem]:
+        """Return the catalog record for an item id"""
+        return self.items.get(str(item_id))
+
+    def intern(self, item_data: Dict[str, Any]) -> CatalogItem:
+        """Return the shared record for an inline item, adding it if unknown"""
+        item_id = str(item_data['id'])
+        existing = self.items.get(item_id)
+        if existing is None:
+            existing = CatalogItem(
+                id=item_id,
+                name=item_data['name'],
+                cost=item_data['cost'],
+                description=item_data.get('description', '')
+            )
+            self.items[item_id] = existing
+        elif existing.name != item_data['name'] or existing.cost != item_data['cost']:
+            # Catalog values win; remember the disagreement so callers can report it
+            self.conflicts.append({
+                'id': item_id,
+                'catalog': {'name': existing.name, 'cost': existing.cost},
+                'build': {'name': item_data['name'], 'cost': item_data['cost']}
+            })
+        return existing
+
+    def description_override(self, item_data: Dict[str, Any]) -> Optional[str]:
+        """Return the per-build description, or None when it matches the catalog"""
+        catalog_item = self.get(item_data['id'])
+        description = item_data.get('description')
+        if catalog_item is not None and description == catalog_item.description:
+            return None
+        return description
+
+    def resolve(self, item_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Expand a catalog reference back into an inline item"""
+        catalog_item = self.items[str(item_data['id'])]
+        description = item_data.get('description')
+        return {
+            'id': catalog_item.id,
+            'name': catalog_item.name,
+            'cost': catalog_item.cost,
+            'phase': item_data['phase'],
+            'priority': item_data['priority'],
+            'description': description if description is not None else catalog_item.description
+        }
+
+    def reprice(self, prices: Dict[str, int]) -> List[Dict[str, Any]]:
+        """Set new costs for known items, returning each {id, name, from, to} change"""
+        changes = []
+        for item_id in sorted(prices):
+            existing = self.items[str(item_id)]
+            if existing.cost != prices[item_id]:
+                self.items[existing.id] = replace(existing, cost=prices[item_id])
+                changes.append({'id': existing.id, 'name': existing.name, 'from': existing.cost, 'to': prices[item_id]})
+        return changes
+
+    def reprice_builds(self, builds: Iterable[Dict[str, Any]],
+                       changes: List[Dict[str, Any]]) -> Tuple[int, List[Dict[str, Any]]]:
+        """Move inline costs to the catalog price in one pass over the builds
+
+        Items still carrying the old price of a changed item are updated in
+        place. Any other inline cost that differs from the catalog is left
+        alone and returned as a mismatch.
+        """
+        old_costs = {change['id']: change['from'] for change in changes}
+        repriced = 0
+        mismatches = []
+        for build in builds:
+            for item in build.get('items', []):
+                catalog_item = self.get(item['id'])
+                if catalog_item is None or item.get('cost') == catalog_item.cost:
+                    continue
+                if catalog_item.id in old_costs and item.get('cost') == old_costs[catalog_item.id]:
+                    item['cost'] = catalog_item.cost
+                    repriced += 1
+                else:
+                    mismatches.append({
+                        'heroId': build.get('heroId'),
+                        'mood': build.get('mood'),
+                        'item': catalog_item.id,
+                        'cost': item.get('cost'),
+                        'catalog': catalog_item.cost
+                    })
+        return repriced, mismatches
+
+    def update_from_builds(self, builds: Iterable[Dict[str, Any]]):
+        """Intern every item used by the given builds"""
+        for build in builds:
+            for item in build.get('items', []):
+                self.intern(item)
+
+    @classmethod
+    def from_builds(cls, builds: List[Dict[str, Any]]) -> 'ItemCatalog':
+        """Build a catalog from inline build items"""
+        # The catalog description is the one most builds use for the item,
+        # so the fewest builds need an override
+        descriptions = defaultdict(Counter)
+        for build in builds:
+            for item in build.get('items', []):
+                descriptions[str(item['id'])][item.get('description', '')] += 1
+
+        catalog = cls()
+        for build in builds:
+            for item in build.get('items', []):
+                item_id = str(item['id'])
+                if item_id not in catalog.items:
+                    common_description = descriptions[item_id].most_common(1)[0][0]
+                    catalog.intern({**item, 'description': common_description})
+                else:
+                    catalog.intern(item)
+        return catalog
+
+    @classmethod
+    def load(cls, file_path: Path = DEFAULT_CATALOG_PATH) -> 'ItemCatalog':
+        """Load a catalog file, returning an empty catalog if it doesn't exist"""
+        path = Path(file_path)
+        if not path.exists():
+            return cls()
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls({
+            item_id: CatalogItem(id=item_id, **fields)
+            for item_id, fields in data.items()
+        })
+
+    def save(self, file_path: Path = DEFAULT_CATALOG_PATH):
+        """Save the catalog keyed by item id"""
+        data = {}
+        for item_id in sorted(self.items):
+            fields = asdict(self.items[item_id])
+            del fields['id']
+            data[item_id] = fields
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+
+    def to_rows(self) -> List[Dict[str, Any]]:
+        """Return catalog rows for the item_catalog table"""
+        return [asdict(self.items[item_id]) for item_id in sorted(self.items)]
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Build the item catalog from a builds file')
+    parser.add_argument('builds', help='JSON file containing builds array')
+    parser.add_argument('--output', default=str(DEFAULT_CATALOG_PATH), help='Catalog file to write')
+    parser.add_argument('--write', action='store_true', help='Write the catalog file')
+    args = parser.parse_args()
+
+    try:
+        with open(args.builds, 'r', encoding='utf-8') as f:
+            builds = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"❌ Could not read {args.builds}: {str(e)}")
+        sys.exit(1)
+
+    catalog = ItemCatalog.from_builds(builds)
+    item_rows = sum(len(build.get('items', [])) for build in builds)
+    overrides = sum(
+        1 for build in builds for item in build.get('items', [])
+        if catalog.description_override(item) is not None
+    )
+
+    print(f"📦 {item_rows} build items reference {len(catalog)} catalog items")
+    print(f"📝 {overrides} items keep a per-build description override")
+    for conflict in catalog.conflicts:
+        print(f"⚠️  Item {conflict['id']}: catalog {conflict['catalog']} vs build {conflict['build']}")
+
+    if args.write:
+        catalog.save(args.output)
+        print(f"✅ Catalog saved to {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Inverted Item Index for Dota 2 Builds
+
+Precomputes an item -> builds index from a builds file so "which builds use
+Black King Bar" can be answered offline without scanning every build.
+
+Usage:
+    python item_index.py build_data_final.json                       # Write item_index.json
+    python item_index.py build_data_final.json --item black_king_bar # Query the index
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Any, Iterable
+
+DEFAULT_INDEX_PATH = Path(__file__).with_name('item_index.json')
+
+def build_item_index(builds: Iterable[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Map each item id to the builds that use it"""
+    index: Dict[str, List[Dict[str, Any]]] = {}
+    for build in builds:
+        for order_index, item in enumerate(build.get('items', [])):
+            index.setdefault(str(item['id']), []).append({
+                'heroId': build['heroId'],
+                'mood': build['mood'],
+                'phase': item.get('phase'),
+                'priority': item.get('priority'),
+                'order_index': order_index
+            })
+    return {item_id: index[item_id] for item_id in sorted(index)}
+
+def load_item_index(file_path: Path = DEFAULT_INDEX_PATH) -> Dict[str, List[Dict[str, Any]]]:
+    """Load a precomputed item index"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_item_index(index: Dict[str, List[Dict[str, Any]]], file_path: Path = DEFAULT_INDEX_PATH):
+    """Save an item index"""
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+
+def print_item_builds(item_id: str, entries: List[Dict[str, Any]]):
+    """Print the builds that use an item"""
+    if not entries:
+        print(f"No builds use item '{item_id}'")
+        return
+
+    print(f"📋 {len(entries)} builds use '{item_id}':")
+    for entry in entries:
+        print(f"🔨 {entry['heroId']} ({entry['mood']}) - {entry['phase']} / {entry['priority']}")
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Build or query the inverted item index')
+    parser.add_argument('builds', help='JSON file containing builds array')
+    parser.add_argument('--output', default=str(DEFAULT_INDEX_PATH), help='Index file to write')
+    parser.add_argument('--item', help='Item id to look up instead of writing the index')
+    args = parser.parse_args()
+
+    try:
+        with open(args.builds, 'r', encoding='utf-8') as f:
+            builds = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"❌ Could not read {args.builds}: {str(e)}")
+        sys.exit(1)
+
+    index = build_item_index(builds)
+
+    if args.item:
+        print_item_builds(args.item, index.get(args.item, []))
+        return
+
+    save_item_index(index, args.output)
+    print(f"✅ Indexed {len(index)} items across {len(builds)} builds into {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -9,17 +9,36 @@ Usage:
     python manage_dota_data.py add-hero --json hero_data.json
     python manage_dota_data.py add-build --json build_data.json
     python manage_dota_data.py bulk-import --heroes heroes.json --builds builds.json
+    python manage_dota_data.py update-build --json build_data.json
     python manage_dota_data.py add-hero --interactive
     python manage_dota_data.py list-heroes
     python manage_dota_data.py validate --json data.json
+    python manage_dota_data.py sync-catalog --builds build_data.json
+    python manage_dota_data.py builds-by-item black_king_bar
+    python manage_dota_data.py rescore
+    python manage_dota_data.py refresh-views
+    python manage_dota_data.py db-doctor --migration
+    python manage_dota_data.py remap-moods --dry-run
+    python manage_dota_data.py reprice --set blink=2250 --builds build_data.json
+    python manage_dota_data.py watch heroes/
+    python manage_dota_data.py pull --output mirror.json
+    python manage_dota_data.py prune builds --moods chaos --dry-run
 """
 
 import argparse
+import asyncio
+import contextlib
+import hashlib
 import json
 import os
 import sys
-from typing import Dict, List, Optional, Any, Union
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Any, Set, Tuple, Union
 from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 import logging
 
@@ -31,12 +50,24 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 try:
-    from supabase import create_client, Client
+    from supabase import create_client, Client, acreate_client, AsyncClient
     from dotenv import load_dotenv
 except ImportError:
     print("❌ Required packages not installed. Run: pip install supabase python-dotenv")
     sys.exit(1)
 
+from item_catalog import ItemCatalog, DEFAULT_CATALOG_PATH
+from item_index import load_item_index, print_item_builds
+from build_scoring import score_build, score_builds
+from request_tracing import RequestTracer
+from profiling import CommandProfiler, DEFAULT_PROFILE_DIR
+from transport import TransportConfig, add_transport_arguments, configure_transport, configure_async_transport
+from adaptive_concurrency import AdaptiveConcurrency, DEFAULT_MAX_CONCURRENCY, run_units
+from db_doctor import DEFAULT_MIGRATIONS_DIR, run_doctor
+from file_watcher import DirectoryWatcher, DEFAULT_DEBOUNCE, DEFAULT_POLL_INTERVAL
+from hero_ids import HeroIdResolver, canonicalize_records, print_resolutions
+from pull_sync import DEFAULT_OVERLAP_SECONDS, PAGE_SIZE, open_mirror, pull_changes, parse_timestamp
+
 # Load environment variables
 load_dotenv()
 
@@ -44,13 +75,25 @@ load_dotenv()
 SUPABASE_URL = os.getenv('VITE_SUPABASE_URL')
 SUPABASE_SERVICE_KEY = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
 
-if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
-    print("❌ Missing Supabase environment variables:")
-    print("   VITE_SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY required")
-    sys.exit(1)
+def create_supabase_client(transport_config: Optional[TransportConfig] = None) -> Client:
+    """Create the Supabase client from environment variables"""
+    if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
+        print("❌ Missing Supabase environment variables:")
+        print("   VITE_SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY required")
+        sys.exit(1)
+    
+    client = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+    return configure_transport(client, transport_config or TransportConfig())
 
-# Initialize Supabase client
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+async def create_async_supabase_client(transport_config: Optional[TransportConfig] = None) -> AsyncClient:
+    """Create the async Supabase client from environment variables"""
+    if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
+        print("❌ Missing Supabase environment variables:")
+        print("   VITE_SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY required")
+        sys.exit(1)
+    
+    client = await acreate_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+    return await configure_async_transport(client, transport_config or TransportConfig())
 
 # Data validation constants
 VALID_ROLES = ['Carry', 'Support', 'Mid', 'Initiator']
@@ -59,6 +102,12 @@ VALID_MOODS = ['aggressive', 'defensive', 'experimental', 'creative', 'chaos']
 VALID_PHASES = ['Early', 'Mid', 'Late']
 VALID_PRIORITIES = ['Core', 'Situational', 'Luxury']
 
+# Parent ids per delete request; keeps the in.(...) filter well under URL limits
+PRUNE_BATCH_SIZE = 200
+
+# Raw records per staging insert; a build document is a few KB
+STAGING_CHUNK_SIZE = 500
+
 @dataclass
 class Hero:
     """Hero data structure"""
@@ -221,11 +270,92 @@ class DataValidator:
         
         return errors
 
+def item_row(catalog: Optional[ItemCatalog], build_id: int, item: Item, order_index: int) -> Dict[str, Any]:
+    """Return the items row for a build item"""
+    if catalog is not None and item.id in catalog:
+        # Name and cost come from the catalog; only a differing description is kept
+        return {
+            'build_id': build_id,
+            'item_id': str(item.id),
+            'phase': item.phase,
+            'priority': item.priority,
+            'description': catalog.description_override(asdict(item)),
+            'order_index': order_index
+        }
+    return {
+        'build_id': build_id,
+        'name': item.name,
+        'cost': item.cost,
+        'phase': item.phase,
+        'priority': item.priority,
+        'description': item.description,
+        'order_index': order_index
+    }
+
+ITEM_COLUMNS = ['build_id', 'item_id', 'name', 'cost', 'phase', 'priority', 'description', 'order_index']
+
+def diff_ordered_rows(existing: List[Dict[str, Any]], desired: List[Dict[str, Any]],
+                      columns: List[str]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Any]]:
+    """Match child rows by order_index and return (inserts, updates, deleted ids)"""
+    current_by_index = {}
+    deletes = []
+    for row in sorted(existing, key=lambda row: (row['order_index'], row['id'])):
+        # Without a unique (build_id, order_index) a position can be taken twice
+        if row['order_index'] in current_by_index:
+            deletes.append(row['id'])
+        else:
+            current_by_index[row['order_index']] = row
+    
+    inserts, updates = [], []
+    for row in desired:
+        row = {column: row.get(column) for column in columns}
+        current = current_by_index.pop(row['order_index'], None)
+        if current is None:
+            inserts.append(row)
+        elif any(current.get(column) != row[column] for column in columns):
+            updates.append({'id': current['id'], **row})
+    deletes.extend(row['id'] for row in current_by_index.values())
+    return inserts, updates, deletes
+
 class DatabaseManager:
     """Manages database operations"""
     
-    def __init__(self, supabase_client: Client):
+    def __init__(self, supabase_client: Client, catalog: Optional[ItemCatalog] = None):
         self.supabase = supabase_client
+        self.catalog = catalog
+    
+    def sync_catalog(self, catalog: ItemCatalog, item_ids: Optional[List[str]] = None) -> bool:
+        """Upsert catalog items into the item_catalog table in one request"""
+        try:
+            rows = catalog.to_rows()
+            if item_ids is not None:
+                wanted = set(str(item_id) for item_id in item_ids)
+                rows = [row for row in rows if row['id'] in wanted]
+            if not rows:
+                return True
+            
+            print(f"📦 Syncing {len(rows)} catalog items...")
+            result = self.supabase.table('item_catalog').upsert(rows, on_conflict='id').execute()
+            if result.data is None:
+                print("❌ Failed to sync item catalog")
+                return False
+            return True
+        except Exception as e:
+            print(f"❌ Error syncing item catalog: {str(e)}")
+            return False
+    
+    def backfill_item_ids(self) -> int:
+        """Link item rows written before the catalog existed"""
+        try:
+            result = self.supabase.rpc('backfill_item_catalog_ids').execute()
+            return result.data or 0
+        except Exception as e:
+            print(f"❌ Error linking items to catalog: {str(e)}")
+            return 0
+    
+    def _item_row(self, build_id: int, item: Item, order_index: int) -> Dict[str, Any]:
+        """Return the items row for a build item"""
+        return item_row(self.catalog, build_id, item, order_index)
     
     def add_hero(self, hero: Hero) -> bool:
         """Add a hero to the database"""
@@ -306,15 +436,9 @@ class DatabaseManager:
             
             # Insert items
             for i, item in enumerate(build.items):
-                item_result = self.supabase.table('items').insert({
-                    'build_id': build_id,
-                    'name': item.name,
-                    'cost': item.cost,
-                    'phase': item.phase,
-                    'priority': item.priority,
-                    'description': item.description,
-                    'order_index': i
-                }).execute()
+                item_result = self.supabase.table('items').insert(
+                    self._item_row(build_id, item, i)
+                ).execute()
                 
                 if item_result.data is None:
                     print(f"⚠️  Warning: Failed to add item {item.name}")
@@ -377,6 +501,151 @@ class DatabaseManager:
             print(f"❌ Error checking hero existence: {str(e)}")
             return False
     
+    def builds_by_item(self, item_id: str) -> List[Dict[str, Any]]:
+        """List the builds that use an item through the items(item_id) index"""
+        try:
+            result = self.supabase.table('items').select(
+                'phase, priority, order_index, builds(id, hero_id, mood, score)'
+            ).eq('item_id', item_id).execute()
+            return [
+                {
+                    'buildId': row['builds']['id'],
+                    'heroId': row['builds']['hero_id'],
+                    'mood': row['builds']['mood'],
+                    'score': row['builds']['score'],
+                    'phase': row['phase'],
+                    'priority': row['priority'],
+                    'order_index': row['order_index']
+                }
+                for row in result.data or [] if row.get('builds')
+            ]
+        except Exception as e:
+            print(f"❌ Error listing builds for item {item_id}: {str(e)}")
+            return []
+    
+    def rescore_builds(self, hero_ids: Optional[List[str]] = None, build_ids: Optional[List[int]] = None,
+                       moods: Optional[List[str]] = None) -> Optional[int]:
+        """Recompute build scores, all of them or only those matching the filters, in one bulk update"""
+        payload = self.compute_build_scores(hero_ids, build_ids, moods)
+        if payload is None:
+            return None
+        if not payload:
+            return 0
+        print(f"🧮 Scored {len(payload)} builds, writing back...")
+        return self.write_build_scores(payload)
+    
+    def compute_build_scores(self, hero_ids: Optional[List[str]] = None, build_ids: Optional[List[int]] = None,
+                             moods: Optional[List[str]] = None,
+                             role_overrides: Optional[Dict[str, str]] = None) -> Optional[List[Dict[str, Any]]]:
+        """Score stored builds without writing them; role_overrides replaces the stored role of some heroes"""
+        try:
+            # One embedded select returns each build with everything scoring needs
+            query = self.supabase.table('builds').select(
+                'id, hero_id, mood, score, early_game, mid_game, late_game, '
+                'heroes(role), '
+                'items(priority, description, item_catalog(description)), '
+                'playstyle_dos(id), playstyle_donts(id), playstyle_tips(id)'
+            )
+            if hero_ids is not None:
+                query = query.in_('hero_id', hero_ids)
+            if build_ids is not None:
+                query = query.in_('id', build_ids)
+            if moods is not None:
+                query = query.in_('mood', moods)
+            rows = query.execute().data or []
+            
+            builds = []
+            hero_roles = {}
+            for row in rows:
+                hero_roles[row['hero_id']] = (row.get('heroes') or {}).get('role')
+                builds.append({
+                    'heroId': row['hero_id'],
+                    'mood': row['mood'],
+                    'items': [
+                        {
+                            'priority': item['priority'],
+                            'description': item['description'] if item['description'] is not None
+                            else (item.get('item_catalog') or {}).get('description')
+                        }
+                        for item in row.get('items') or []
+                    ],
+                    'playstyle': {
+                        'dos': row.get('playstyle_dos') or [],
+                        'donts': row.get('playstyle_donts') or [],
+                        'tips': row.get('playstyle_tips') or []
+                    },
+                    'gameplan': {
+                        'early': row['early_game'] or '',
+                        'mid': row['mid_game'] or '',
+                        'late': row['late_game'] or ''
+                    }
+                })
+            
+            hero_roles.update(role_overrides or {})
+            scores = score_builds(builds, hero_roles)
+            return [{'id': row['id'], 'score': score} for row, score in zip(rows, scores)]
+        except Exception as e:
+            print(f"❌ Error rescoring builds: {str(e)}")
+            return None
+    
+    def write_build_scores(self, payload: List[Dict[str, Any]]) -> Optional[int]:
+        """Write {id, score} pairs in one bulk update"""
+        if not payload:
+            return 0
+        try:
+            result = self.supabase.rpc('update_build_scores', {'scores': payload}).execute()
+            return result.data or 0
+        except Exception as e:
+            print(f"❌ Error writing build scores: {str(e)}")
+            return None
+    
+    def refresh_views(self) -> bool:
+        """Rebuild the build_documents view the API reads builds from"""
+        try:
+            self.supabase.rpc('refresh_build_documents').execute()
+            print("🔄 Refreshed build documents")
+            return True
+        except Exception as e:
+            print(f"⚠️  Could not refresh build documents: {str(e)}")
+            return False
+    
+    def stage_records(self, table: str, batch_id: str, records: List[Dict[str, Any]],
+                      chunk_size: int = STAGING_CHUNK_SIZE) -> bool:
+        """Insert raw records into a staging table as JSONB rows"""
+        try:
+            for start in range(0, len(records), chunk_size):
+                chunk = records[start:start + chunk_size]
+                self.supabase.table(table).insert([{'batch_id': batch_id, 'data': record} for record in chunk]).execute()
+            print(f"📥 Staged {len(records)} rows in {table}")
+            return True
+        except Exception as e:
+            print(f"❌ Error staging {table}: {str(e)}")
+            return False
+    
+    def merge_staging(self, batch_id: str, replace_all: bool = False,
+                      scores: Optional[List[Dict[str, Any]]] = None) -> Optional[Dict[str, int]]:
+        """Validate and merge a staged batch in one transaction; returns written rows per table
+
+        scores are {id, score} pairs for stored builds outside the batch,
+        written in the same transaction.
+        """
+        try:
+            result = self.supabase.rpc('merge_staging', {
+                'batch': batch_id, 'replace_all': replace_all, 'scores': scores or []
+            }).execute()
+            return result.data or {}
+        except Exception as e:
+            print(f"❌ Error merging staged batch: {str(e)}")
+            return None
+    
+    def clear_staging(self, batch_id: str):
+        """Remove a batch that was not merged"""
+        try:
+            for table in ('staging_heroes', 'staging_builds'):
+                self.supabase.table(table).delete().eq('batch_id', batch_id).execute()
+        except Exception as e:
+            print(f"⚠️  Could not clear staged batch {batch_id}: {str(e)}")
+    
     def build_exists(self, hero_id: str, mood: str) -> bool:
         """Check if a build exists in the database"""
         try:
@@ -385,6 +654,489 @@ class DatabaseManager:
         except Exception as e:
             print(f"❌ Error checking build existence: {str(e)}")
             return False
+    
+    def hero_roles(self, hero_ids: List[str]) -> Dict[str, str]:
+        """Return the role of each of the given heroes that exists, in one request"""
+        if not hero_ids:
+            return {}
+        try:
+            result = self.supabase.table('heroes').select('id, role').in_('id', list(hero_ids)).execute()
+            return {row['id']: row['role'] for row in result.data or []}
+        except Exception as e:
+            print(f"❌ Error loading hero roles: {str(e)}")
+            return {}
+    
+    def existing_hero_ids(self, hero_ids: List[str]) -> Set[str]:
+        """Return which of the given hero ids exist, in one request"""
+        if not hero_ids:
+            return set()
+        try:
+            result = self.supabase.table('heroes').select('id').in_('id', list(hero_ids)).execute()
+            return {row['id'] for row in result.data or []}
+        except Exception as e:
+            print(f"❌ Error checking hero existence: {str(e)}")
+            return set()
+    
+    def _sync_children(self, parent_column: str, parent_ids: List[Any],
+                       tables: Dict[str, Tuple[List[str], List[Dict[str, Any]]]]) -> Dict[str, int]:
+        """Diff the ordered child rows of the given parents and write only the differences"""
+        diffs = {}
+        for table, (columns, rows) in tables.items():
+            existing = []
+            start = 0
+            while True:
+                page = self.supabase.table(table).select(', '.join(['id'] + columns)).in_(
+                    parent_column, parent_ids
+                ).order('id').range(start, start + PAGE_SIZE - 1).execute().data or []
+                existing.extend(page)
+                if len(page) < PAGE_SIZE:
+                    break
+                start += PAGE_SIZE
+            
+            current_by_parent: Dict[Any, List[Dict[str, Any]]] = {}
+            desired_by_parent: Dict[Any, List[Dict[str, Any]]] = {}
+            for row in existing:
+                current_by_parent.setdefault(row[parent_column], []).append(row)
+            for row in rows:
+                desired_by_parent.setdefault(row[parent_column], []).append(row)
+            
+            inserts, updates, deletes = [], [], []
+            for parent_id in parent_ids:
+                parent_inserts, parent_updates, parent_deletes = diff_ordered_rows(
+                    current_by_parent.get(parent_id, []), desired_by_parent.get(parent_id, []), columns
+                )
+                inserts.extend(parent_inserts)
+                updates.extend(parent_updates)
+                deletes.extend(parent_deletes)
+            diffs[table] = (inserts, updates, deletes)
+        return self._apply_child_diffs(diffs)
+    
+    def replace_heroes(self, heroes: List[Hero]) -> bool:
+        """Upsert heroes and rewrite only the child rows that differ, in batched requests"""
+        if not heroes:
+            return True
+        try:
+            print(f"🦸 Syncing {len(heroes)} heroes...")
+            self.supabase.table('heroes').upsert([
+                {
+                    'id': hero.id,
+                    'name': hero.name,
+                    'role': hero.role,
+                    'difficulty': hero.difficulty,
+                    'description': hero.description
+                }
+                for hero in heroes
+            ], on_conflict='id').execute()
+    
+            hero_ids = [hero.id for hero in heroes]
+            
+            # Moods are a set keyed by (hero_id, mood); new ones go in before
+            # old ones are removed, so a failed request never leaves a hero without moods
+            existing = self.supabase.table('hero_moods').select('hero_id, mood').in_('hero_id', hero_ids).execute()
+            current_moods = {(row['hero_id'], row['mood']) for row in existing.data or []}
+            desired_moods = {(hero.id, mood) for hero in heroes for mood in hero.moods}
+            added_moods = sorted(desired_moods - current_moods)
+            removed_by_mood: Dict[str, List[str]] = {}
+            for hero_id, mood in sorted(current_moods - desired_moods):
+                removed_by_mood.setdefault(mood, []).append(hero_id)
+            if added_moods or removed_by_mood:
+                print(f"   hero_moods: +{len(added_moods)} -{len(current_moods - desired_moods)}")
+            if added_moods:
+                self.supabase.table('hero_moods').insert(
+                    [{'hero_id': hero_id, 'mood': mood} for hero_id, mood in added_moods]
+                ).execute()
+            for mood, mood_hero_ids in removed_by_mood.items():
+                self.supabase.table('hero_moods').delete().eq('mood', mood).in_('hero_id', mood_hero_ids).execute()
+            
+            self._sync_children('hero_id', hero_ids, {
+                'hero_strengths': (['hero_id', 'strength', 'order_index'], [
+                    {'hero_id': hero.id, 'strength': strength, 'order_index': i}
+                    for hero in heroes for i, strength in enumerate(hero.strengths)
+                ]),
+                'hero_weaknesses': (['hero_id', 'weakness', 'order_index'], [
+                    {'hero_id': hero.id, 'weakness': weakness, 'order_index': i}
+                    for hero in heroes for i, weakness in enumerate(hero.weaknesses)
+                ])
+            })
+            return True
+        except Exception as e:
+            print(f"❌ Error syncing heroes: {str(e)}")
+            return False
+    
+    def replace_builds(self, builds: List[Build]) -> Optional[Dict[Tuple[str, str], int]]:
+        """Upsert builds (by hero and mood) and rewrite only the child rows that differ, in batched requests
+
+        Returns the build id of every (heroId, mood), or None on failure.
+        """
+        if not builds:
+            return {}
+        try:
+            print(f"🔨 Syncing {len(builds)} builds...")
+            result = self.supabase.table('builds').upsert([
+                {
+                    'hero_id': build.heroId,
+                    'mood': build.mood,
+                    'early_game': build.gameplan.early,
+                    'mid_game': build.gameplan.mid,
+                    'late_game': build.gameplan.late
+                }
+                for build in builds
+            ], on_conflict='hero_id,mood').execute()
+            build_ids = {(row['hero_id'], row['mood']): row['id'] for row in result.data or []}
+            if len(build_ids) != len(builds):
+                print("❌ Failed to sync builds: not every build was written")
+                return None
+    
+            items, dos, donts, tips = [], [], [], []
+            for build in builds:
+                build_id = build_ids[(build.heroId, build.mood)]
+                items.extend(self._item_row(build_id, item, i) for i, item in enumerate(build.items))
+                dos.extend({'build_id': build_id, 'do_item': text, 'order_index': i}
+                           for i, text in enumerate(build.playstyle.dos))
+                donts.extend({'build_id': build_id, 'dont_item': text, 'order_index': i}
+                             for i, text in enumerate(build.playstyle.donts))
+                tips.extend({'build_id': build_id, 'tip': text, 'order_index': i}
+                            for i, text in enumerate(build.playstyle.tips))
+    
+            self._sync_children('build_id', list(build_ids.values()), {
+                'items': (ITEM_COLUMNS, items),
+                'playstyle_dos': (['build_id', 'do_item', 'order_index'], dos),
+                'playstyle_donts': (['build_id', 'dont_item', 'order_index'], donts),
+                'playstyle_tips': (['build_id', 'tip', 'order_index'], tips)
+            })
+            return build_ids
+        except Exception as e:
+            print(f"❌ Error syncing builds: {str(e)}")
+            return None
+    
+    def _apply_child_diffs(self, diffs: Dict[str, Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Any]]],
+                           dry_run: bool = False) -> Dict[str, int]:
+        """Write child table diffs with at most one delete, upsert and insert per table"""
+        counts = {'inserted': 0, 'updated': 0, 'deleted': 0}
+        for table, (inserts, updates, deletes) in diffs.items():
+            if inserts or updates or deletes:
+                print(f"   {table}: +{len(inserts)} ~{len(updates)} -{len(deletes)}")
+            counts['inserted'] += len(inserts)
+            counts['updated'] += len(updates)
+            counts['deleted'] += len(deletes)
+            if dry_run:
+                continue
+            # Deletes go first so a later unique (build_id, order_index) is never violated
+            if deletes:
+                self.supabase.table(table).delete().in_('id', deletes).execute()
+            if updates:
+                self.supabase.table(table).upsert(updates, on_conflict='id').execute()
+            if inserts:
+                self.supabase.table(table).insert(inserts).execute()
+        return counts
+    
+    def update_hero(self, hero: Hero, dry_run: bool = False) -> Optional[Dict[str, int]]:
+        """Rewrite only the hero columns and child rows that differ from the database"""
+        try:
+            result = self.supabase.table('heroes').select(
+                'id, name, role, difficulty, description, '
+                'hero_moods(mood), '
+                'hero_strengths(id, strength, order_index), '
+                'hero_weaknesses(id, weakness, order_index)'
+            ).eq('id', hero.id).execute()
+            if not result.data:
+                print(f"❌ Hero '{hero.id}' does not exist in database")
+                return None
+            current = result.data[0]
+            
+            print(f"🦸 Updating hero: {hero.name}...")
+            columns = {'name': hero.name, 'role': hero.role, 'difficulty': hero.difficulty, 'description': hero.description}
+            changed = {column: value for column, value in columns.items() if current.get(column) != value}
+            if changed:
+                print(f"   heroes: {', '.join(changed)}")
+                if not dry_run:
+                    self.supabase.table('heroes').update(changed).eq('id', hero.id).execute()
+            
+            # Moods are a set keyed by (hero_id, mood), not an ordered list
+            current_moods = {row['mood'] for row in current.get('hero_moods') or []}
+            added_moods = [mood for mood in hero.moods if mood not in current_moods]
+            removed_moods = sorted(current_moods - set(hero.moods))
+            if added_moods or removed_moods:
+                print(f"   hero_moods: +{len(added_moods)} -{len(removed_moods)}")
+                if not dry_run:
+                    if removed_moods:
+                        self.supabase.table('hero_moods').delete().eq('hero_id', hero.id).in_('mood', removed_moods).execute()
+                    if added_moods:
+                        self.supabase.table('hero_moods').insert(
+                            [{'hero_id': hero.id, 'mood': mood} for mood in added_moods]
+                        ).execute()
+            
+            counts = self._apply_child_diffs({
+                'hero_strengths': diff_ordered_rows(
+                    current.get('hero_strengths') or [],
+                    [{'hero_id': hero.id, 'strength': text, 'order_index': i} for i, text in enumerate(hero.strengths)],
+                    ['hero_id', 'strength', 'order_index']
+                ),
+                'hero_weaknesses': diff_ordered_rows(
+                    current.get('hero_weaknesses') or [],
+                    [{'hero_id': hero.id, 'weakness': text, 'order_index': i} for i, text in enumerate(hero.weaknesses)],
+                    ['hero_id', 'weakness', 'order_index']
+                )
+            }, dry_run)
+            counts['inserted'] += len(added_moods)
+            counts['deleted'] += len(removed_moods)
+            counts['columns'] = len(changed)
+            return counts
+        except Exception as e:
+            print(f"❌ Error updating hero {hero.name}: {str(e)}")
+            return None
+    
+    def update_build(self, build: Build, dry_run: bool = False) -> Optional[Dict[str, int]]:
+        """Rewrite only the gameplan columns and child rows that differ from the database"""
+        try:
+            result = self.supabase.table('builds').select(
+                'id, early_game, mid_game, late_game, '
+                f'items({", ".join(["id"] + ITEM_COLUMNS)}), '
+                'playstyle_dos(id, build_id, do_item, order_index), '
+                'playstyle_donts(id, build_id, dont_item, order_index), '
+                'playstyle_tips(id, build_id, tip, order_index)'
+            ).eq('hero_id', build.heroId).eq('mood', build.mood).execute()
+            if not result.data:
+                print(f"❌ Build {build.heroId} ({build.mood}) does not exist in database")
+                return None
+            current = result.data[0]
+            build_id = current['id']
+            
+            print(f"🔨 Updating build: {build.heroId} ({build.mood})...")
+            columns = {'early_game': build.gameplan.early, 'mid_game': build.gameplan.mid, 'late_game': build.gameplan.late}
+            changed = {column: value for column, value in columns.items() if current.get(column) != value}
+            if changed:
+                print(f"   builds: {', '.join(changed)}")
+                if not dry_run:
+                    self.supabase.table('builds').update(changed).eq('id', build_id).execute()
+            
+            counts = self._apply_child_diffs({
+                'items': diff_ordered_rows(
+                    current.get('items') or [],
+                    [self._item_row(build_id, item, i) for i, item in enumerate(build.items)],
+                    ITEM_COLUMNS
+                ),
+                'playstyle_dos': diff_ordered_rows(
+                    current.get('playstyle_dos') or [],
+                    [{'build_id': build_id, 'do_item': text, 'order_index': i}
+                     for i, text in enumerate(build.playstyle.dos)],
+                    ['build_id', 'do_item', 'order_index']
+                ),
+                'playstyle_donts': diff_ordered_rows(
+                    current.get('playstyle_donts') or [],
+                    [{'build_id': build_id, 'dont_item': text, 'order_index': i}
+                     for i, text in enumerate(build.playstyle.donts)],
+                    ['build_id', 'dont_item', 'order_index']
+                ),
+                'playstyle_tips': diff_ordered_rows(
+                    current.get('playstyle_tips') or [],
+                    [{'build_id': build_id, 'tip': text, 'order_index': i}
+                     for i, text in enumerate(build.playstyle.tips)],
+                    ['build_id', 'tip', 'order_index']
+                )
+            }, dry_run)
+            counts['columns'] = len(changed)
+            return counts
+        except Exception as e:
+            print(f"❌ Error updating build {build.heroId} ({build.mood}): {str(e)}")
+            return None
+    
+    def prune_candidates(self, target: str, hero_ids: Optional[List[str]] = None,
+                         moods: Optional[List[str]] = None, older_than: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return the heroes or builds matching every given filter"""
+        is_heroes = target == 'heroes'
+        rows = []
+        start = 0
+        while True:
+            query = self.supabase.table(target).select('id' if is_heroes else 'id, hero_id, mood')
+            if hero_ids:
+                query = query.in_('id' if is_heroes else 'hero_id', hero_ids)
+            if moods:
+                query = query.in_('mood', moods)
+            if older_than:
+                query = query.lt('updated_at', older_than)
+            page = query.order('id').range(start, start + PAGE_SIZE - 1).execute().data or []
+            rows.extend(page)
+            if len(page) < PAGE_SIZE:
+                return rows
+            start += PAGE_SIZE
+    
+    def prune_row_counts(self, hero_ids: List[str], build_ids: List[int],
+                         include_hero_moods: bool = False) -> Optional[Dict[str, int]]:
+        """Count the rows a prune would remove from each table in one aggregate query"""
+        try:
+            result = self.supabase.rpc('prune_row_counts', {
+                'hero_ids': hero_ids,
+                'build_ids': build_ids,
+                'include_hero_moods': include_hero_moods
+            }).execute()
+            return result.data or {}
+        except Exception as e:
+            print(f"❌ Error counting rows to prune: {str(e)}")
+            return None
+    
+    def remap_moods(self, mapping: Dict[str, str], dry_run: bool = False) -> Optional[Dict[str, Any]]:
+        """Check and apply a mood mapping to builds and hero_moods in one set-based call"""
+        try:
+            result = self.supabase.rpc('remap_moods', {
+                'mapping': mapping,
+                'valid_moods': VALID_MOODS,
+                'dry_run': dry_run
+            }).execute()
+            return result.data or {}
+        except Exception as e:
+            print(f"❌ Error remapping moods: {str(e)}")
+            return None
+    
+    def reprice_items(self, prices: Dict[str, int], dry_run: bool = False) -> Optional[Dict[str, Any]]:
+        """Apply new item costs with one set-based update per table and report disagreeing builds"""
+        try:
+            result = self.supabase.rpc('reprice_items', {'prices': prices, 'dry_run': dry_run}).execute()
+            return result.data or {}
+        except Exception as e:
+            print(f"❌ Error repricing items: {str(e)}")
+            return None
+    
+    def delete_in_batches(self, table: str, column: str, values: List[Any],
+                          controller: Optional[AdaptiveConcurrency] = None,
+                          batch_size: int = PRUNE_BATCH_SIZE, **filters: Any) -> int:
+        """Delete rows whose column is in values, one request per batch"""
+        batches = [values[i:i + batch_size] for i in range(0, len(values), batch_size)]
+        
+        def delete(batch: List[Any]) -> int:
+            try:
+                query = self.supabase.table(table).delete().in_(column, batch)
+                for filter_column, value in filters.items():
+                    query = query.eq(filter_column, value)
+                return len(query.execute().data or [])
+            except Exception as e:
+                print(f"❌ Error deleting from {table}: {str(e)}")
+                return 0
+        
+        return sum(run_units(controller, batches, delete, f'{table} batches'))
+
+class AsyncDatabaseManager:
+    """Manages database operations with the async Supabase client"""
+    
+    def __init__(self, supabase_client: AsyncClient, catalog: Optional[ItemCatalog] = None):
+        self.supabase = supabase_client
+        self.catalog = catalog
+    
+    async def _insert_children(self, writes: Dict[str, List[Dict[str, Any]]], owner: str):
+        """Insert child rows for several tables concurrently, one request per table"""
+        tables = [table for table, rows in writes.items() if rows]
+        results = await asyncio.gather(
+            *(self.supabase.table(table).insert(writes[table]).execute() for table in tables),
+            return_exceptions=True
+        )
+        for table, result in zip(tables, results):
+            if isinstance(result, Exception) or result.data is None:
+                print(f"⚠️  Warning: Failed to add {table} for {owner}")
+    
+    async def add_hero(self, hero: Hero) -> bool:
+        """Add a hero to the database"""
+        try:
+            print(f"🦸 Adding hero: {hero.name}...")
+            
+            hero_result = await self.supabase.table('heroes').insert({
+                'id': hero.id,
+                'name': hero.name,
+                'role': hero.role,
+                'difficulty': hero.difficulty,
+                'description': hero.description
+            }).execute()
+            
+            if hero_result.data is None:
+                print(f"❌ Failed to add hero: {hero.name}")
+                return False
+            
+            await self._insert_children({
+                'hero_moods': [{'hero_id': hero.id, 'mood': mood} for mood in hero.moods],
+                'hero_strengths': [
+                    {'hero_id': hero.id, 'strength': strength, 'order_index': i}
+                    for i, strength in enumerate(hero.strengths)
+                ],
+                'hero_weaknesses': [
+                    {'hero_id': hero.id, 'weakness': weakness, 'order_index': i}
+                    for i, weakness in enumerate(hero.weaknesses)
+                ]
+            }, f"hero {hero.name}")
+            
+            print(f"✅ Successfully added hero: {hero.name}")
+            return True
+            
+        except Exception as e:
+            print(f"❌ Error adding hero {hero.name}: {str(e)}")
+            return False
+    
+    async def add_build(self, build: Build) -> bool:
+        """Add a build to the database"""
+        try:
+            print(f"🔨 Adding build: {build.heroId} ({build.mood})...")
+            
+            build_result = await self.supabase.table('builds').insert({
+                'hero_id': build.heroId,
+                'mood': build.mood,
+                'early_game': build.gameplan.early,
+                'mid_game': build.gameplan.mid,
+                'late_game': build.gameplan.late
+            }).execute()
+            
+            if not build_result.data:
+                print(f"❌ Failed to add build: {build.heroId} ({build.mood})")
+                return False
+            
+            build_id = build_result.data[0]['id']
+            
+            await self._insert_children({
+                'items': [item_row(self.catalog, build_id, item, i) for i, item in enumerate(build.items)],
+                'playstyle_dos': [
+                    {'build_id': build_id, 'do_item': do_item, 'order_index': i}
+                    for i, do_item in enumerate(build.playstyle.dos)
+                ],
+                'playstyle_donts': [
+                    {'build_id': build_id, 'dont_item': dont_item, 'order_index': i}
+                    for i, dont_item in enumerate(build.playstyle.donts)
+                ],
+                'playstyle_tips': [
+                    {'build_id': build_id, 'tip': tip, 'order_index': i}
+                    for i, tip in enumerate(build.playstyle.tips)
+                ]
+            }, f"build {build.heroId} ({build.mood})")
+            
+            print(f"✅ Successfully added build: {build.heroId} ({build.mood})")
+            return True
+            
+        except Exception as e:
+            print(f"❌ Error adding build {build.heroId} ({build.mood}): {str(e)}")
+            return False
+    
+    async def list_heroes(self) -> List[Dict[str, Any]]:
+        """List all heroes in the database"""
+        try:
+            result = await self.supabase.table('heroes').select('*').execute()
+            return result.data or []
+        except Exception as e:
+            print(f"❌ Error listing heroes: {str(e)}")
+            return []
+    
+    async def hero_exists(self, hero_id: str) -> bool:
+        """Check if a hero exists in the database"""
+        try:
+            result = await self.supabase.table('heroes').select('id').eq('id', hero_id).execute()
+            return len(result.data) > 0
+        except Exception as e:
+            print(f"❌ Error checking hero existence: {str(e)}")
+            return False
+    
+    async def build_exists(self, hero_id: str, mood: str) -> bool:
+        """Check if a build exists in the database"""
+        try:
+            result = await self.supabase.table('builds').select('id').eq('hero_id', hero_id).eq('mood', mood).execute()
+            return len(result.data) > 0
+        except Exception as e:
+            print(f"❌ Error checking build existence: {str(e)}")
+            return False
 
 class InteractiveInput:
     """Handles interactive user input"""
@@ -540,6 +1292,702 @@ def load_json_file(file_path: str) -> Dict[str, Any]:
         print(f"❌ Invalid JSON in file {file_path}: {str(e)}")
         sys.exit(1)
 
+def build_from_dict(build_data: Dict[str, Any]) -> Build:
+    """Convert nested build dictionaries to dataclasses"""
+    return Build(
+        heroId=build_data['heroId'],
+        mood=build_data['mood'],
+        items=[Item(**item) for item in build_data['items']],
+        playstyle=Playstyle(**build_data['playstyle']),
+        gameplan=Gameplan(**build_data['gameplan'])
+    )
+
+def valid_records(records: List[Dict[str, Any]], validate: Callable[[Dict[str, Any]], List[str]],
+                  kind: str, name_key: str) -> List[Dict[str, Any]]:
+    """Return the records that pass validation, printing the errors of the rest"""
+    valid = []
+    for record in records:
+        errors = validate(record)
+        if errors:
+            print(f"❌ Validation errors for {kind} {record.get(name_key, 'unknown')}:")
+            for error in errors:
+                print(f"  - {error}")
+            continue
+        valid.append(record)
+    return valid
+
+JOURNAL_STATUSES = {True: 'imported', None: 'skipped', False: 'failed'}
+
+def journal_entries(kind: str, key: Callable[[Dict[str, Any]], str], records: List[Dict[str, Any]],
+                    valid: List[Dict[str, Any]], imported: List[Dict[str, Any]],
+                    results: List[Optional[bool]]) -> List[Dict[str, Any]]:
+    """Return one journal entry per input record with the outcome of its import"""
+    statuses = {id(record): JOURNAL_STATUSES[result] for record, result in zip(imported, results)}
+    valid_ids = {id(record) for record in valid}
+    entries = []
+    for record in records:
+        if id(record) in statuses:
+            status = statuses[id(record)]
+        else:
+            status = 'duplicate' if id(record) in valid_ids else 'invalid'
+        entries.append({'type': kind, 'key': key(record), 'status': status})
+    return entries
+
+def bulk_import(db_manager: DatabaseManager,
+                heroes_data: Optional[List[Dict[str, Any]]],
+                builds_data: Optional[List[Dict[str, Any]]],
+                controller: Optional[AdaptiveConcurrency] = None,
+                journal: Optional[List[Dict[str, Any]]] = None,
+                known_hero_ids: Optional[Set[str]] = None,
+                catalog_prepared: bool = False) -> Tuple[int, int]:
+    """Import heroes and builds, returning (success_count, fail_count)
+
+    known_hero_ids, the heroes a pre-flight found in the database, replaces
+    the per-record existence checks. catalog_prepared skips adding and
+    syncing the builds' items when the caller already did.
+    """
+    validator = DataValidator()
+    success_count = 0
+    fail_count = 0
+    
+    if heroes_data:
+        print(f"📝 Processing {len(heroes_data)} heroes...")
+        valid_heroes = valid_records(heroes_data, validator.validate_hero, 'hero', 'name')
+        fail_count += len(heroes_data) - len(valid_heroes)
+        
+        def import_hero(hero_data: Dict[str, Any]) -> Optional[bool]:
+            # Check if hero already exists
+            if known_hero_ids is not None:
+                exists = hero_data['id'] in known_hero_ids
+            else:
+                exists = db_manager.hero_exists(hero_data['id'])
+            if exists:
+                print(f"⏭️  Hero {hero_data.get('name', 'unknown')} already exists, skipping...")
+                return None
+            added = db_manager.add_hero(Hero(**hero_data))
+            if added and known_hero_ids is not None:
+                known_hero_ids.add(hero_data['id'])
+            return added
+        
+        unique_heroes = unique_by(valid_heroes, lambda hero: hero['id'])
+        results = run_units(controller, unique_heroes, import_hero, 'heroes')
+        success_count += results.count(True)
+        fail_count += results.count(False)
+        if journal is not None:
+            journal.extend(journal_entries('hero', lambda hero: str(hero.get('id')), heroes_data,
+                                           valid_heroes, unique_heroes, results))
+    
+    if builds_data:
+        print(f"📝 Processing {len(builds_data)} builds...")
+        valid_builds = valid_records(builds_data, validator.validate_build, 'build', 'heroId')
+        fail_count += len(builds_data) - len(valid_builds)
+        if not catalog_prepared:
+            prepare_catalog(db_manager, valid_builds)
+        
+        def import_build(build_data: Dict[str, Any]) -> Optional[bool]:
+            # Check if hero exists
+            if known_hero_ids is not None:
+                exists = build_data['heroId'] in known_hero_ids
+            else:
+                exists = db_manager.hero_exists(build_data['heroId'])
+            if not exists:
+                print(f"❌ Hero '{build_data['heroId']}' does not exist in database")
+                return False
+            
+            # Check if build already exists for this hero and mood
+            if db_manager.build_exists(build_data['heroId'], build_data['mood']):
+                print(f"⏭️  Build for hero '{build_data['heroId']}' with mood '{build_data['mood']}' already exists, skipping...")
+                return None
+            
+            return db_manager.add_build(build_from_dict(build_data))
+        
+        unique_builds = unique_by(valid_builds, lambda build: (build['heroId'], build['mood']))
+        results = run_units(controller, unique_builds, import_build, 'builds')
+        success_count += results.count(True)
+        fail_count += results.count(False)
+        if journal is not None:
+            journal.extend(journal_entries('build', lambda build: f"{build.get('heroId')}:{build.get('mood')}",
+                                           builds_data, valid_builds, unique_builds, results))
+    
+    return success_count, fail_count
+
+def staged_bulk_import(db_manager: DatabaseManager,
+                       heroes_data: Optional[List[Dict[str, Any]]],
+                       builds_data: Optional[List[Dict[str, Any]]],
+                       replace_all: bool = False) -> Tuple[int, int]:
+    """Stage raw records and merge them server-side in one transaction
+
+    Either every valid record is merged or nothing is; returns
+    (success_count, fail_count).
+    """
+    validator = DataValidator()
+    heroes = unique_by(valid_records(heroes_data or [], validator.validate_hero, 'hero', 'name'),
+                       lambda hero: hero['id'])
+    builds = unique_by(valid_records(builds_data or [], validator.validate_build, 'build', 'heroId'),
+                       lambda build: (build['heroId'], build['mood']))
+    invalid_count = len(heroes_data or []) + len(builds_data or []) - len(heroes) - len(builds)
+    if replace_all and invalid_count:
+        # Replacing with a partial dataset would delete the records that failed validation
+        print(f"❌ {invalid_count} records failed validation; --replace-all needs a clean dataset")
+        return 0, invalid_count
+    
+    # Catalog rows must exist before the merge references them
+    prepare_catalog(db_manager, builds)
+    
+    # Scores are staged with the builds so the merge commits them together
+    stored_roles = db_manager.hero_roles(sorted({hero['id'] for hero in heroes} |
+                                                {build['heroId'] for build in builds}))
+    roles = {**stored_roles, **{hero['id']: hero['role'] for hero in heroes}}
+    builds = [dict(build, score=score) for build, score in zip(builds, score_builds(builds, roles))]
+    # Stored builds of heroes whose role changes are rescored in the same transaction
+    changed_roles = {hero['id']: hero['role'] for hero in heroes
+                     if hero['id'] in stored_roles and stored_roles[hero['id']] != hero['role']}
+    scores = db_manager.compute_build_scores(hero_ids=list(changed_roles),
+                                             role_overrides=changed_roles) if changed_roles else []
+    if scores is None:
+        print("❌ Nothing was merged; the database is unchanged")
+        return 0, invalid_count + len(heroes) + len(builds)
+    
+    batch_id = str(uuid.uuid4())
+    print(f"📦 Staging {len(heroes)} heroes and {len(builds)} builds as batch {batch_id}...")
+    staged = (db_manager.stage_records('staging_heroes', batch_id, heroes) and
+              db_manager.stage_records('staging_builds', batch_id, builds))
+    counts = db_manager.merge_staging(batch_id, replace_all, scores) if staged else None
+    if counts is None:
+        db_manager.clear_staging(batch_id)
+        print("❌ Nothing was merged; the database is unchanged")
+        return 0, invalid_count + len(heroes) + len(builds)
+    
+    written = {table: count for table, count in counts.items() if count}
+    if written:
+        print("🔀 Merged: " + ', '.join(f"{table} {count}" for table, count in sorted(written.items())))
+    else:
+        print("🔀 Merged: database already matched the files")
+    return len(heroes) + len(builds), invalid_count
+
+def shard_of(hero_id: str, shards: int) -> int:
+    """Stable shard number for a hero id (Python's hash() differs per process)"""
+    return int(hashlib.md5(str(hero_id).encode('utf-8')).hexdigest()[:8], 16) % shards
+
+def partition_records(records: Optional[List[Dict[str, Any]]], key: str, shards: int) -> List[List[Dict[str, Any]]]:
+    """Split records into shards by hero id, so a hero and its builds share a shard"""
+    partitions: List[List[Dict[str, Any]]] = [[] for _ in range(shards)]
+    for record in records or []:
+        partitions[shard_of(record.get(key, ''), shards)].append(record)
+    return partitions
+
+class ShardOutput:
+    """stdout wrapper that prefixes each line with the shard number"""
+    
+    def __init__(self, stream: Any, prefix: str):
+        self.stream = stream
+        self.prefix = prefix
+        self.at_line_start = True
+    
+    def write(self, text: str) -> int:
+        for line in text.splitlines(keepends=True):
+            if self.at_line_start:
+                self.stream.write(self.prefix)
+            self.stream.write(line)
+            self.at_line_start = line.endswith('\n')
+        return len(text)
+    
+    def flush(self):
+        self.stream.flush()
+
+def import_shard(shard_index: int, heroes_data: List[Dict[str, Any]], builds_data: List[Dict[str, Any]],
+                 transport_config: TransportConfig, max_concurrency: int, use_catalog: bool,
+                 known_hero_ids: Optional[Set[str]] = None) -> Dict[str, Any]:
+    """Worker process entry point: import one shard with its own client and connection pool"""
+    sys.stdout = ShardOutput(sys.stdout, f"[shard {shard_index}] ")
+    catalog = ItemCatalog.load(DEFAULT_CATALOG_PATH) if use_catalog else None
+    db_manager = DatabaseManager(create_supabase_client(transport_config), catalog)
+    controller = AdaptiveConcurrency(max_concurrency) if max_concurrency > 1 else None
+    if controller:
+        db_manager.supabase = controller.wrap(db_manager.supabase)
+    
+    journal: List[Dict[str, Any]] = []
+    # The parent process already added and synced the catalog items
+    success_count, fail_count = bulk_import(db_manager, heroes_data, builds_data, controller, journal, known_hero_ids,
+                                            catalog_prepared=True)
+    for entry in journal:
+        entry['shard'] = shard_index
+    sys.stdout.flush()
+    return {'shard': shard_index, 'success': success_count, 'failed': fail_count, 'journal': journal}
+
+def sharded_bulk_import(db_manager: DatabaseManager,
+                        heroes_data: Optional[List[Dict[str, Any]]],
+                        builds_data: Optional[List[Dict[str, Any]]],
+                        shards: int, shard_indexes: List[int],
+                        transport_config: TransportConfig,
+                        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                        known_hero_ids: Optional[Set[str]] = None) -> Tuple[int, int, List[Dict[str, Any]]]:
+    """Import the given shards in parallel worker processes and merge their results"""
+    if builds_data:
+        # Workers share the catalog file, so new items are added and synced once up front
+        validator = DataValidator()
+        prepare_catalog(db_manager, [
+            build_data for build_data in builds_data
+            if not validator.validate_build(build_data)
+        ])
+    
+    hero_shards = partition_records(heroes_data, 'id', shards)
+    build_shards = partition_records(builds_data, 'heroId', shards)
+    print(f"🧩 Importing {len(shard_indexes)} of {shards} shards in {len(shard_indexes)} processes...")
+    
+    results = []
+    with ProcessPoolExecutor(max_workers=len(shard_indexes)) as executor:
+        futures = [
+            executor.submit(import_shard, index, hero_shards[index], build_shards[index],
+                            transport_config, max_concurrency, db_manager.catalog is not None, known_hero_ids)
+            for index in shard_indexes
+        ]
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                print(f"❌ Shard worker failed: {str(e)}")
+    
+    print("\n🧩 Shard results:")
+    for result in sorted(results, key=lambda result: result['shard']):
+        print(f"  Shard {result['shard']}: ✅ {result['success']}  ❌ {result['failed']}")
+    
+    journal = [entry for result in results for entry in result['journal']]
+    return sum(result['success'] for result in results), sum(result['failed'] for result in results), journal
+
+def save_journal(journal: List[Dict[str, Any]], file_path: str):
+    """Write import journal entries as JSON lines"""
+    try:
+        with open(file_path, 'w', encoding='utf-8') as f:
+            for entry in sorted(journal, key=lambda entry: (entry['type'] != 'hero', entry['key'])):
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        print(f"📒 Journal written to {file_path}")
+    except Exception as e:
+        print(f"❌ Error saving journal {file_path}: {str(e)}")
+
+async def async_bulk_import(db_manager: AsyncDatabaseManager,
+                            heroes_data: Optional[List[Dict[str, Any]]],
+                            builds_data: Optional[List[Dict[str, Any]]],
+                            max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> Tuple[int, int]:
+    """Import heroes and builds concurrently, returning (success_count, fail_count)"""
+    # The catalog is not synced here; run prepare_catalog with a sync manager first
+    validator = DataValidator()
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    success_count = 0
+    fail_count = 0
+    
+    async def import_hero(hero_data: Dict[str, Any]) -> Optional[bool]:
+        async with semaphore:
+            if await db_manager.hero_exists(hero_data['id']):
+                print(f"⏭️  Hero {hero_data.get('name', 'unknown')} already exists, skipping...")
+                return None
+            return await db_manager.add_hero(Hero(**hero_data))
+    
+    async def import_build(build_data: Dict[str, Any]) -> Optional[bool]:
+        async with semaphore:
+            hero_exists, build_exists = await asyncio.gather(
+                db_manager.hero_exists(build_data['heroId']),
+                db_manager.build_exists(build_data['heroId'], build_data['mood'])
+            )
+            if not hero_exists:
+                print(f"❌ Hero '{build_data['heroId']}' does not exist in database")
+                return False
+            if build_exists:
+                print(f"⏭️  Build for hero '{build_data['heroId']}' with mood '{build_data['mood']}' already exists, skipping...")
+                return None
+            return await db_manager.add_build(build_from_dict(build_data))
+    
+    if heroes_data:
+        print(f"📝 Processing {len(heroes_data)} heroes...")
+        valid_heroes = valid_records(heroes_data, validator.validate_hero, 'hero', 'name')
+        fail_count += len(heroes_data) - len(valid_heroes)
+        results = await asyncio.gather(*(
+            import_hero(hero_data) for hero_data in unique_by(valid_heroes, lambda hero: hero['id'])
+        ))
+        success_count += results.count(True)
+        fail_count += results.count(False)
+    
+    if builds_data:
+        print(f"📝 Processing {len(builds_data)} builds...")
+        valid_builds = valid_records(builds_data, validator.validate_build, 'build', 'heroId')
+        fail_count += len(builds_data) - len(valid_builds)
+        results = await asyncio.gather(*(
+            import_build(build_data)
+            for build_data in unique_by(valid_builds, lambda build: (build['heroId'], build['mood']))
+        ))
+        success_count += results.count(True)
+        fail_count += results.count(False)
+    
+    return success_count, fail_count
+
+def unique_by(records: List[Dict[str, Any]], key: Callable[[Dict[str, Any]], Any]) -> List[Dict[str, Any]]:
+    """Drop repeated records so concurrent imports can't insert the same row twice"""
+    seen = set()
+    unique = []
+    for record in records:
+        if key(record) in seen:
+            print(f"⏭️  Duplicate entry {key(record)} in input, skipping...")
+            continue
+        seen.add(key(record))
+        unique.append(record)
+    return unique
+
+def resolve_build_hero_ids(db_manager: DatabaseManager, heroes_data: Optional[List[Dict[str, Any]]],
+                           builds_data: List[Dict[str, Any]]):
+    """Rewrite build heroIds to canonical ids using one fetch of the known heroes"""
+    try:
+        # Heroes imported in the same run count as known
+        new_heroes = [hero for hero in heroes_data or [] if isinstance(hero, dict) and 'id' in hero]
+        resolver = HeroIdResolver.from_database(db_manager.supabase, new_heroes)
+    except Exception as e:
+        print(f"⚠️  Could not load hero ids, using heroId as written: {str(e)}")
+        return
+    
+    resolutions = canonicalize_records([build for build in builds_data if isinstance(build, dict)], resolver)
+    print_resolutions(resolutions)
+
+@dataclass
+class ImportPreflight:
+    """Referential problems of an import, found before anything is written"""
+    known_hero_ids: Set[str]
+    missing_heroes: Dict[str, int]
+    duplicate_heroes: Dict[str, int]
+    duplicate_builds: Dict[Tuple[str, str], int]
+    
+    @property
+    def ok(self) -> bool:
+        return not (self.missing_heroes or self.duplicate_heroes or self.duplicate_builds)
+
+def preflight_import(db_manager: DatabaseManager, heroes_data: Optional[List[Dict[str, Any]]],
+                     builds_data: Optional[List[Dict[str, Any]]]) -> Optional[ImportPreflight]:
+    """Check every hero reference and in-file collision with one hero lookup
+
+    Returns None if the database could not be queried.
+    """
+    validator = DataValidator()
+    heroes = [hero for hero in heroes_data or [] if isinstance(hero, dict) and 'id' in hero]
+    builds = [build for build in builds_data or [] if isinstance(build, dict) and 'heroId' in build]
+    
+    hero_counts = Counter(hero['id'] for hero in heroes)
+    build_counts = Counter((build['heroId'], build.get('mood')) for build in builds)
+    referenced = sorted(set(hero_counts) | {build['heroId'] for build in builds})
+    try:
+        result = db_manager.supabase.table('heroes').select('id').in_('id', referenced).execute() if referenced else None
+        known_hero_ids = {row['id'] for row in (result.data or [])} if result else set()
+    except Exception as e:
+        print(f"⚠️  Pre-flight hero lookup failed, checking records one at a time: {str(e)}")
+        return None
+    
+    # Heroes from the file only count if they will pass validation
+    importable = {hero['id'] for hero in heroes if not validator.validate_hero(hero)}
+    missing = Counter(build['heroId'] for build in builds
+                      if build['heroId'] not in known_hero_ids and build['heroId'] not in importable)
+    return ImportPreflight(
+        known_hero_ids=known_hero_ids,
+        missing_heroes=dict(sorted(missing.items())),
+        duplicate_heroes={hero_id: count for hero_id, count in sorted(hero_counts.items()) if count > 1},
+        duplicate_builds={key: count for key, count in sorted(build_counts.items(), key=str) if count > 1}
+    )
+
+def print_preflight(preflight: ImportPreflight, heroes_count: int, builds_count: int):
+    """Print every problem the pre-flight found at once"""
+    print(f"🔎 Pre-flight: {heroes_count} heroes and {builds_count} builds, "
+          f"{len(preflight.known_hero_ids)} referenced heroes already in database")
+    if preflight.missing_heroes:
+        print(f"❌ {len(preflight.missing_heroes)} heroes are neither in the database nor in the heroes file "
+              f"({sum(preflight.missing_heroes.values())} builds):")
+        for hero_id, count in preflight.missing_heroes.items():
+            print(f"  - {hero_id} ({count} builds)")
+    if preflight.duplicate_heroes:
+        print(f"❌ {len(preflight.duplicate_heroes)} heroes appear more than once in the heroes file:")
+        for hero_id, count in preflight.duplicate_heroes.items():
+            print(f"  - {hero_id} ({count} times)")
+    if preflight.duplicate_builds:
+        print(f"❌ {len(preflight.duplicate_builds)} (heroId, mood) pairs appear more than once in the builds file:")
+        for (hero_id, mood), count in preflight.duplicate_builds.items():
+            print(f"  - {hero_id}/{mood} ({count} times)")
+
+def filter_preflight(preflight: ImportPreflight, heroes_data: Optional[List[Dict[str, Any]]],
+                     builds_data: Optional[List[Dict[str, Any]]]) -> Tuple[Optional[List[Dict[str, Any]]],
+                                                                            Optional[List[Dict[str, Any]]]]:
+    """Drop builds of missing heroes and every repeat after the first occurrence"""
+    def first_only(records, key, skip=lambda record: False):
+        seen, kept = set(), []
+        for record in records:
+            if isinstance(record, dict) and (skip(record) or key(record) in seen):
+                continue
+            if isinstance(record, dict):
+                seen.add(key(record))
+            kept.append(record)
+        return kept
+    
+    if heroes_data and preflight.duplicate_heroes:
+        kept = first_only(heroes_data, lambda hero: hero.get('id'))
+        print(f"🧹 Dropped {len(heroes_data) - len(kept)} repeated heroes")
+        heroes_data = kept
+    if builds_data and (preflight.missing_heroes or preflight.duplicate_builds):
+        kept = first_only(builds_data, lambda build: (build.get('heroId'), build.get('mood')),
+                          lambda build: build.get('heroId') in preflight.missing_heroes)
+        print(f"🧹 Dropped {len(builds_data) - len(kept)} builds of missing heroes or repeated (heroId, mood) pairs")
+        builds_data = kept
+    return heroes_data, builds_data
+
+def prepare_catalog(db_manager: DatabaseManager, builds_data: List[Dict[str, Any]], dry_run: bool = False):
+    """Add the items used by the given builds to the catalog and sync them
+
+    With dry_run the items are only added in memory, so rows are diffed the
+    way a real run would write them, but nothing is saved or synced.
+    """
+    catalog = db_manager.catalog
+    if catalog is None or not builds_data:
+        return
+    
+    known_count = len(catalog)
+    catalog.update_from_builds(builds_data)
+    for conflict in catalog.conflicts:
+        print(f"⚠️  Item {conflict['id']} differs from catalog: {conflict['build']} vs {conflict['catalog']}")
+    catalog.conflicts.clear()
+    if dry_run:
+        return
+    
+    if len(catalog) > known_count:
+        print(f"📦 Added {len(catalog) - known_count} new items to the catalog")
+        catalog.save(DEFAULT_CATALOG_PATH)
+    
+    item_ids = {str(item['id']) for build_data in builds_data for item in build_data['items']}
+    if not db_manager.sync_catalog(catalog, sorted(item_ids)):
+        print("⚠️  Writing items inline without catalog references")
+        db_manager.catalog = None
+
+def load_watch_file(path: Path) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Return the (heroes, builds) in a watched file"""
+    # A file holds one hero or build, an array of them, or an object with
+    # "heroes" and/or "builds" arrays; builds are recognised by their heroId
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    
+    if isinstance(data, dict) and ('heroes' in data or 'builds' in data):
+        return list(data.get('heroes') or []), list(data.get('builds') or [])
+    
+    records = data if isinstance(data, list) else [data]
+    heroes = [record for record in records if isinstance(record, dict) and 'heroId' not in record]
+    builds = [record for record in records if isinstance(record, dict) and 'heroId' in record]
+    return heroes, builds
+
+class WatchSync:
+    """Pushes heroes and builds from changed files in a watched directory"""
+    
+    def __init__(self, db_manager: DatabaseManager, watcher: DirectoryWatcher):
+        self.db_manager = db_manager
+        self.watcher = watcher
+        self.validator = DataValidator()
+        # Content hash of every record as last pushed (or found at startup)
+        self.hashes: Dict[str, str] = {}
+    
+    @staticmethod
+    def _hash(record: Dict[str, Any]) -> str:
+        return hashlib.sha1(json.dumps(record, sort_keys=True).encode('utf-8')).hexdigest()
+    
+    def _changed_records(self, paths: List[Path]) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """Load the files and return valid heroes and builds whose content changed, keyed by record"""
+        heroes = {}
+        builds = {}
+        for path in sorted(paths):
+            if not path.exists():
+                print(f"⏭️  {path.name} was removed, nothing is deleted from the database")
+                continue
+            try:
+                file_heroes, file_builds = load_watch_file(path)
+            except (OSError, json.JSONDecodeError) as e:
+                # Usually a file caught mid-save; the next write triggers another sync
+                print(f"⚠️  Skipping {path.name}: {str(e)}")
+                continue
+            
+            for hero_data in valid_records(file_heroes, self.validator.validate_hero, 'hero', 'name'):
+                key = f"hero:{hero_data['id']}"
+                if self.hashes.get(key) != self._hash(hero_data):
+                    heroes[key] = hero_data
+            for build_data in valid_records(file_builds, self.validator.validate_build, 'build', 'heroId'):
+                key = f"build:{build_data['heroId']}:{build_data['mood']}"
+                if self.hashes.get(key) != self._hash(build_data):
+                    builds[key] = build_data
+        return heroes, builds
+    
+    def scan(self, push: bool = False):
+        """Record the current content of every file, pushing it if requested"""
+        paths = sorted(self.watcher.files())
+        if push:
+            self.sync(paths)
+            return
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            heroes, builds = self._changed_records(paths)
+        for key, record in {**heroes, **builds}.items():
+            self.hashes[key] = self._hash(record)
+        print(f"👀 Tracking {len(heroes)} heroes and {len(builds)} builds in {len(paths)} files")
+    
+    def sync(self, paths: List[Path]):
+        """Validate the changed files and push only the records that changed"""
+        heroes, builds = self._changed_records(paths)
+        if not heroes and not builds:
+            print(f"✅ {len(paths)} changed files, no hero or build changes")
+            return
+        
+        print(f"📝 {len(paths)} changed files: {len(heroes)} heroes and {len(builds)} builds to sync")
+        synced_hero_ids = []
+        if heroes and self.db_manager.replace_heroes([Hero(**hero_data) for hero_data in heroes.values()]):
+            for key, hero_data in heroes.items():
+                self.hashes[key] = self._hash(hero_data)
+            synced_hero_ids = sorted(hero_data['id'] for hero_data in heroes.values())
+        
+        build_ids = None
+        if builds:
+            hero_roles = self.db_manager.hero_roles(sorted({b['heroId'] for b in builds.values()}))
+            for key, build_data in list(builds.items()):
+                if build_data['heroId'] not in hero_roles:
+                    print(f"❌ Hero '{build_data['heroId']}' does not exist in database")
+                    del builds[key]
+            
+            prepare_catalog(self.db_manager, list(builds.values()))
+            build_ids = self.db_manager.replace_builds([build_from_dict(build_data) for build_data in builds.values()])
+            if build_ids is not None:
+                for key, build_data in builds.items():
+                    self.hashes[key] = self._hash(build_data)
+                # The pushed builds are scored from the files; builds of a synced
+                # hero are rescored below, since its role may have changed
+                self.db_manager.write_build_scores([
+                    {
+                        'id': build_ids[(build_data['heroId'], build_data['mood'])],
+                        'score': score_build(build_data, hero_roles[build_data['heroId']])
+                    }
+                    for build_data in builds.values() if build_data['heroId'] not in synced_hero_ids
+                ])
+        
+        if synced_hero_ids:
+            self.db_manager.rescore_builds(hero_ids=synced_hero_ids)
+        if synced_hero_ids or build_ids:
+            self.db_manager.refresh_views()
+        
+        print(f"✅ Synced at {time.strftime('%H:%M:%S')}")
+    
+    def run(self):
+        """Sync changes until interrupted"""
+        print(f"👀 Watching {self.watcher.directory} ({self.watcher.backend}, {self.watcher.debounce}s debounce). Press Ctrl+C to stop.")
+        try:
+            for paths in self.watcher.changes():
+                self.sync(sorted(paths))
+        except KeyboardInterrupt:
+            print("\n👋 Stopped watching")
+
+def parse_older_than(value: str) -> str:
+    """Turn '90d' or an ISO date into a timestamp to compare with updated_at"""
+    if value.endswith('d') and value[:-1].isdigit():
+        # updated_at is a TIMESTAMP written with CURRENT_TIMESTAMP in UTC
+        cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=int(value[:-1]))
+        return cutoff.isoformat()
+    try:
+        return parse_timestamp(value).isoformat()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected an ISO date or a number of days like 90d, got '{value}'")
+
+def prune_records(db_manager: DatabaseManager, target: str, hero_ids: Optional[List[str]] = None,
+                  moods: Optional[List[str]] = None, older_than: Optional[str] = None,
+                  keep: Optional[List[Dict[str, Any]]] = None, dry_run: bool = False,
+                  controller: Optional[AdaptiveConcurrency] = None) -> Optional[int]:
+    """Delete the matching heroes or builds and let ON DELETE CASCADE remove their children"""
+    candidates = db_manager.prune_candidates(target, hero_ids, moods, older_than)
+    if keep is not None:
+        if target == 'heroes':
+            kept = {record.get('id', record.get('heroId')) for record in keep}
+            candidates = [row for row in candidates if row['id'] not in kept]
+        else:
+            kept = {(record.get('heroId'), record.get('mood')) for record in keep}
+            candidates = [row for row in candidates if (row['hero_id'], row['mood']) not in kept]
+    
+    if not candidates:
+        print(f"✅ No {target} match the filters")
+        return 0
+    
+    ids = [row['id'] for row in candidates]
+    # A retired mood should disappear from the hero's mood list along with its build
+    prune_hero_moods = target == 'builds' and bool(moods)
+    counts = db_manager.prune_row_counts(
+        ids if target == 'heroes' else [], ids if target == 'builds' else [], prune_hero_moods
+    )
+    if counts is None:
+        return None
+    
+    print(f"🗑️  {len(ids)} {target} match the filters. Rows {'that would be' if dry_run else 'to be'} removed:")
+    for table, count in counts.items():
+        if count:
+            print(f"   {table}: {count}")
+    if dry_run:
+        return 0
+    
+    removed = db_manager.delete_in_batches(target, 'id', ids, controller)
+    if prune_hero_moods:
+        heroes_by_mood = {}
+        for row in candidates:
+            heroes_by_mood.setdefault(row['mood'], []).append(row['hero_id'])
+        for mood, mood_hero_ids in heroes_by_mood.items():
+            db_manager.delete_in_batches('hero_moods', 'hero_id', mood_hero_ids, controller, mood=mood)
+    return removed
+
+def load_mood_mapping(file_path: Optional[str] = None) -> Optional[Dict[str, str]]:
+    """Read an {old: new} mood mapping from a JSON file, or MOOD_MAP from mood_mapper.py"""
+    if file_path:
+        mapping = load_json_file(file_path)
+    else:
+        sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+        from mood_mapper import MOOD_MAP
+        mapping = MOOD_MAP
+    if not isinstance(mapping, dict) or not all(isinstance(mood, str) for pair in mapping.items() for mood in pair):
+        print("❌ Mood mapping must be a JSON object of old mood → new mood")
+        return None
+    return mapping
+
+def print_mood_remap(result: Dict[str, Any]):
+    """Print what a remap moves and everything that blocks it"""
+    for move in result.get('moves', []):
+        print(f"🔀 {move['from']} → {move['to']}: {move['builds']} builds, {move['hero_moods']} hero moods")
+    if result.get('invalid'):
+        print(f"❌ {len(result['invalid'])} mappings target a mood check_valid_mood rejects:")
+        for move in result['invalid']:
+            print(f"  - {move['from']} → {move['to']} ({move['builds']} builds, {move['hero_moods']} hero moods)")
+    if result.get('conflicts'):
+        print(f"❌ {len(result['conflicts'])} builds would share a hero and mood:")
+        for conflict in result['conflicts']:
+            print(f"  - {conflict['heroId']}/{conflict['mood']} from {', '.join(conflict['from'])}")
+
+def load_prices(file_path: Optional[str], assignments: List[str]) -> Optional[Dict[str, int]]:
+    """Read {item id: cost} from a JSON file and ITEM=COST arguments, which win"""
+    prices = load_json_file(file_path) if file_path else {}
+    if not isinstance(prices, dict):
+        print("❌ Price file must be a JSON object of item id → cost")
+        return None
+    prices = dict(prices)
+    for assignment in assignments:
+        item_id, _, cost = assignment.partition('=')
+        try:
+            prices[item_id.strip()] = int(cost)
+        except ValueError:
+            print(f"❌ Expected ITEM=COST, got '{assignment}'")
+            return None
+    invalid = sorted(item_id for item_id, cost in prices.items()
+                     if isinstance(cost, bool) or not isinstance(cost, int) or cost < 0)
+    if invalid:
+        print(f"❌ Costs must be non-negative integers: {', '.join(invalid)}")
+        return None
+    return prices
+
+def print_cost_mismatches(mismatches: List[Dict[str, Any]], source: str):
+    """List builds whose inline item cost disagrees with the catalog"""
+    if not mismatches:
+        return
+    print(f"⚠️  {len(mismatches)} build items in {source} disagree with the catalog price:")
+    for mismatch in mismatches:
+        print(f"  - {mismatch['heroId']}/{mismatch['mood']} {mismatch['item']}: "
+              f"{mismatch['cost']} vs catalog {mismatch['catalog']}")
+
 def save_json_file(data: Dict[str, Any], file_path: str):
     """Save data to JSON file"""
     try:
@@ -558,14 +2006,46 @@ def main():
 Examples:
   %(prog)s add-hero --json hero.json
   %(prog)s add-build --json build.json
+  %(prog)s update-hero --json hero.json
+  %(prog)s update-build --json build.json --dry-run
   %(prog)s bulk-import --heroes heroes.json --builds builds.json
+  %(prog)s bulk-import --builds builds.json --filter
+  %(prog)s bulk-import --staging --replace-all --heroes heroes.json --builds builds.json
   %(prog)s add-hero --interactive
   %(prog)s list-heroes
   %(prog)s validate --json data.json
   %(prog)s create-templates
+  %(prog)s sync-catalog --builds build_data.json
+  %(prog)s builds-by-item black_king_bar
+  %(prog)s rescore
+  %(prog)s refresh-views
+  %(prog)s db-doctor --migration
+  %(prog)s remap-moods --mapping moods.json --dry-run
+  %(prog)s reprice --set blink=2250 --builds build_data.json --dry-run
+  %(prog)s reprice --prices patch_prices.json --builds build_data.json
+  %(prog)s watch heroes/ --debounce 2
+  %(prog)s pull --output mirror.db
+  %(prog)s prune builds --moods chaos --dry-run
+  %(prog)s prune heroes --keep heroes.json
+  %(prog)s prune builds --older-than 180d
+  %(prog)s --trace --trace-file trace.json bulk-import --builds builds.json
+  %(prog)s --profile bulk-import --builds builds.json
+  %(prog)s --max-retries 6 --pool-size 40 bulk-import --builds builds.json
+  %(prog)s --max-concurrency 4 bulk-import --heroes heroes.json --builds builds.json
+  %(prog)s bulk-import --async --heroes heroes.json --builds builds.json
+  %(prog)s bulk-import --shards 4 --journal import.jsonl --heroes heroes.json --builds builds.json
+  %(prog)s bulk-import --shards 4 --shard-index 0 --heroes heroes.json --builds builds.json
         """
     )
     
+    parser.add_argument('--trace', action='store_true', help='Print a per-table request summary at the end')
+    parser.add_argument('--trace-file', help='Also write a Chrome trace-event JSON file (implies --trace)')
+    parser.add_argument('--profile', action='store_true', help='Profile CPU time and allocations of the command')
+    parser.add_argument('--profile-dir', default=DEFAULT_PROFILE_DIR, help='Directory for profile reports')
+    parser.add_argument('--max-concurrency', type=int, default=DEFAULT_MAX_CONCURRENCY,
+                        help='Enable adaptive concurrency up to this many records in flight (default 1: one at a time)')
+    add_transport_arguments(parser)
+    
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
     
     # Add hero command
@@ -580,10 +2060,35 @@ Examples:
     add_build_group.add_argument('--json', help='JSON file containing build data')
     add_build_group.add_argument('--interactive', action='store_true', help='Interactive input mode')
     
+    # Update hero command
+    update_hero_parser = subparsers.add_parser('update-hero', help='Update an existing hero, rewriting only changed rows')
+    update_hero_parser.add_argument('--json', required=True, help='JSON file containing hero data')
+    update_hero_parser.add_argument('--dry-run', action='store_true', help='Show the changes without writing them')
+    
+    # Update build command
+    update_build_parser = subparsers.add_parser('update-build', help='Update an existing build, rewriting only changed rows')
+    update_build_parser.add_argument('--json', required=True, help='JSON file containing build data')
+    update_build_parser.add_argument('--dry-run', action='store_true', help='Show the changes without writing them')
+    
     # Bulk import command
     bulk_parser = subparsers.add_parser('bulk-import', help='Bulk import heroes and builds')
     bulk_parser.add_argument('--heroes', help='JSON file containing heroes array')
     bulk_parser.add_argument('--builds', help='JSON file containing builds array')
+    bulk_parser.add_argument('--async', dest='use_async', action='store_true',
+                             help='Import with the async client, writing child tables concurrently')
+    bulk_parser.add_argument('--shards', type=int, default=1,
+                             help='Partition records by hero id across this many worker processes')
+    bulk_parser.add_argument('--shard-index', type=int,
+                             help='Only import this shard (0-based), e.g. one shard per machine')
+    bulk_parser.add_argument('--journal', help='Write the outcome of every record to a JSON lines file')
+    bulk_parser.add_argument('--exact-hero-ids', action='store_true',
+                             help='Do not resolve heroId aliases and typos to canonical hero ids')
+    bulk_parser.add_argument('--filter', action='store_true',
+                             help='Drop builds of missing heroes and repeated entries instead of aborting the import')
+    bulk_parser.add_argument('--staging', action='store_true',
+                             help='Load raw records into staging tables and merge them in one server-side transaction')
+    bulk_parser.add_argument('--replace-all', action='store_true',
+                             help='With --staging, delete heroes and builds that are not in the files')
     
     # List heroes command
     subparsers.add_parser('list-heroes', help='List all heroes in database')
@@ -596,14 +2101,108 @@ Examples:
     # Create templates command
     subparsers.add_parser('create-templates', help='Create JSON template files')
     
+    # Sync item catalog command
+    catalog_parser = subparsers.add_parser('sync-catalog', help='Upload the item catalog to the database')
+    catalog_parser.add_argument('--builds', help='JSON file containing builds array to add to the catalog')
+    
+    # Builds by item command
+    by_item_parser = subparsers.add_parser('builds-by-item', help='List builds that use an item')
+    by_item_parser.add_argument('item_id', help='Catalog item id')
+    by_item_parser.add_argument('--index', help='Answer from a precomputed item index file instead of the database')
+    
+    # Rescore command
+    subparsers.add_parser('rescore', help='Recompute all build scores in one bulk update')
+    
+    # Refresh views command
+    subparsers.add_parser('refresh-views', help='Refresh the pre-aggregated build documents the API reads')
+    
+    # Remap moods command
+    remap_parser = subparsers.add_parser('remap-moods', help='Rename moods in the database in one set-based update')
+    remap_parser.add_argument('--mapping', help='JSON object of old mood → new mood (default: MOOD_MAP in mood_mapper.py)')
+    remap_parser.add_argument('--dry-run', action='store_true', help='Show the affected rows and conflicts without writing')
+    
+    # Reprice command
+    reprice_parser = subparsers.add_parser('reprice', help='Change item costs in the catalog, a builds file and the database in one pass')
+    reprice_parser.add_argument('--prices', help='JSON object of item id → new cost')
+    reprice_parser.add_argument('--set', dest='assignments', action='append', default=[], metavar='ITEM=COST',
+                                help='New cost for one item (repeatable)')
+    reprice_parser.add_argument('--builds', help='JSON builds file whose inline costs follow the new prices')
+    reprice_parser.add_argument('--dry-run', action='store_true', help='Show the changes and mismatches without writing')
+    
+    # Database doctor command
+    doctor_parser = subparsers.add_parser('db-doctor', help='Check Postgres for unindexed foreign keys and duplicate indexes')
+    doctor_parser.add_argument('--dsn', help='Postgres connection string (default: SUPABASE_DB_URL or the local instance)')
+    doctor_parser.add_argument('--migration', action='store_true', help='Write the corrective migration')
+    
+    # Watch command
+    watch_parser = subparsers.add_parser('watch', help='Sync changed hero and build files as they are edited')
+    watch_parser.add_argument('directory', help='Directory of hero/build JSON files')
+    watch_parser.add_argument('--debounce', type=float, default=DEFAULT_DEBOUNCE,
+                              help='Seconds without changes before a batch is synced')
+    watch_parser.add_argument('--poll-interval', type=float, default=DEFAULT_POLL_INTERVAL,
+                              help='Seconds between scans when polling')
+    watch_parser.add_argument('--polling', action='store_true', help='Poll even if inotify is available')
+    watch_parser.add_argument('--initial-sync', action='store_true',
+                              help='Push every file once at startup instead of only later changes')
+    
+    # Pull command
+    pull_parser = subparsers.add_parser('pull', help='Copy heroes and builds changed since the last pull to a local mirror')
+    pull_parser.add_argument('--output', required=True, help='Mirror file (.json, or .db/.sqlite for SQLite)')
+    pull_parser.add_argument('--full', action='store_true', help='Rebuild the mirror from scratch')
+    pull_parser.add_argument('--overlap', type=int, default=DEFAULT_OVERLAP_SECONDS,
+                             help='Seconds re-read before each watermark to catch late commits')
+    
+    # Prune command
+    prune_parser = subparsers.add_parser('prune', help='Delete heroes or builds matching filters, with their child rows')
+    prune_parser.add_argument('target', choices=['heroes', 'builds'], help='Records to delete')
+    prune_parser.add_argument('--hero-ids', nargs='+', help='Only these heroes (or builds of these heroes)')
+    prune_parser.add_argument('--moods', nargs='+', choices=VALID_MOODS, help='Only builds with these moods')
+    prune_parser.add_argument('--older-than', type=parse_older_than,
+                              help='Only records last updated before this ISO date or number of days (e.g. 90d)')
+    prune_parser.add_argument('--keep', help='JSON file of heroes or builds to keep; everything else matching is deleted')
+    prune_parser.add_argument('--dry-run', action='store_true', help='Show row counts without deleting')
+    
     args = parser.parse_args()
     
     if not args.command:
         parser.print_help()
         return
     
+    if args.profile and args.max_concurrency > 1:
+        # cProfile only sees the main thread, not the pool workers doing the work
+        print("❌ --profile cannot be combined with --max-concurrency above 1")
+        return
+    
+    # Reads the Postgres catalog directly; PostgREST does not expose it
+    if args.command == 'db-doctor':
+        findings = run_doctor(args.dsn, args.migration, DEFAULT_MIGRATIONS_DIR)
+        sys.exit(1 if findings else 0)
+    
     # Initialize database manager
-    db_manager = DatabaseManager(supabase)
+    supabase = create_supabase_client(TransportConfig.from_args(args))
+    tracing = args.trace or args.trace_file
+    # Profiling uses the tracer to separate network wait from local work
+    tracer = RequestTracer(measure_payloads=bool(tracing)) if tracing or args.profile else None
+    if tracer:
+        supabase = tracer.wrap(supabase)
+    controller = AdaptiveConcurrency(args.max_concurrency) if args.max_concurrency > 1 else None
+    if controller:
+        supabase = controller.wrap(supabase)
+    db_manager = DatabaseManager(supabase, ItemCatalog.load(DEFAULT_CATALOG_PATH))
+    
+    profiler = CommandProfiler(args.command, args.profile_dir, tracer) if args.profile else contextlib.nullcontext()
+    try:
+        with profiler:
+            run_command(args, db_manager, controller)
+    finally:
+        if tracing:
+            tracer.print_summary()
+            if args.trace_file:
+                tracer.write_chrome_trace(args.trace_file)
+
+def run_command(args: argparse.Namespace, db_manager: DatabaseManager,
+                controller: Optional[AdaptiveConcurrency] = None):
+    """Run the selected subcommand"""
     validator = DataValidator()
     
     # Handle commands
@@ -647,19 +2246,11 @@ Examples:
                 print(f"❌ Hero '{build_data['heroId']}' does not exist in database")
                 return
             
-            # Convert nested dictionaries to dataclasses
-            items = [Item(**item) for item in build_data['items']]
-            playstyle = Playstyle(**build_data['playstyle'])
-            gameplan = Gameplan(**build_data['gameplan'])
-            
-            build = Build(
-                heroId=build_data['heroId'],
-                mood=build_data['mood'],
-                items=items,
-                playstyle=playstyle,
-                gameplan=gameplan
-            )
-            db_manager.add_build(build)
+            prepare_catalog(db_manager, [build_data])
+            
+            build = build_from_dict(build_data)
+            if db_manager.add_build(build):
+                db_manager.refresh_views()
         
         elif args.interactive:
             build_data = InteractiveInput.get_build_input()
@@ -675,99 +2266,131 @@ Examples:
                 print(f"❌ Hero '{build_data['heroId']}' does not exist in database")
                 return
             
-            # Convert nested dictionaries to dataclasses
-            items = [Item(**item) for item in build_data['items']]
-            playstyle = Playstyle(**build_data['playstyle'])
-            gameplan = Gameplan(**build_data['gameplan'])
-            
-            build = Build(
-                heroId=build_data['heroId'],
-                mood=build_data['mood'],
-                items=items,
-                playstyle=playstyle,
-                gameplan=gameplan
-            )
-            db_manager.add_build(build)
+            prepare_catalog(db_manager, [build_data])
+            
+            build = build_from_dict(build_data)
+            if db_manager.add_build(build):
+                db_manager.refresh_views()
+    
+    elif args.command in ('update-hero', 'update-build'):
+        data = load_json_file(args.json)
+        is_hero = args.command == 'update-hero'
+        errors = validator.validate_hero(data) if is_hero else validator.validate_build(data)
+        if errors:
+            print("❌ Validation errors:")
+            for error in errors:
+                print(f"  - {error}")
+            return
+        
+        if is_hero:
+            counts = db_manager.update_hero(Hero(**data), args.dry_run)
+        else:
+            prepare_catalog(db_manager, [data], args.dry_run)
+            counts = db_manager.update_build(build_from_dict(data), args.dry_run)
+        if counts is None:
+            return
+        
+        changes = sum(counts.values())
+        if changes == 0:
+            print("✅ Already up to date")
+        elif args.dry_run:
+            print(f"🔍 Dry run: {counts['columns']} columns, {counts['inserted']} inserts, "
+                  f"{counts['updated']} updates, {counts['deleted']} deletes would be written")
+        else:
+            print(f"✅ Updated {counts['columns']} columns, inserted {counts['inserted']}, "
+                  f"updated {counts['updated']}, deleted {counts['deleted']} rows")
+            # Scores depend on build content and the hero role, so a hero
+            # update rescores that hero's builds and a build update only itself
+            if is_hero:
+                updated = db_manager.rescore_builds(hero_ids=[data['id']])
+            else:
+                updated = db_manager.rescore_builds(hero_ids=[data['heroId']], moods=[data['mood']])
+            if updated is not None:
+                print(f"🧮 Updated {updated} build scores")
+            db_manager.refresh_views()
     
     elif args.command == 'bulk-import':
-        success_count = 0
-        fail_count = 0
+        heroes_data = None
+        builds_data = None
         
         if args.heroes:
             heroes_data = load_json_file(args.heroes)
             if not isinstance(heroes_data, list):
                 print("❌ Heroes file must contain an array of hero objects")
                 return
-            
-            print(f"📝 Processing {len(heroes_data)} heroes...")
-            for hero_data in heroes_data:
-                errors = validator.validate_hero(hero_data)
-                if errors:
-                    print(f"❌ Validation errors for hero {hero_data.get('name', 'unknown')}:")
-                    for error in errors:
-                        print(f"  - {error}")
-                    fail_count += 1
-                    continue
-                
-                # Check if hero already exists
-                if db_manager.hero_exists(hero_data['id']):
-                    print(f"⏭️  Hero {hero_data.get('name', 'unknown')} already exists, skipping...")
-                    continue
-                
-                hero = Hero(**hero_data)
-                if db_manager.add_hero(hero):
-                    success_count += 1
-                else:
-                    fail_count += 1
         
         if args.builds:
             builds_data = load_json_file(args.builds)
             if not isinstance(builds_data, list):
                 print("❌ Builds file must contain an array of build objects")
                 return
-            
-            print(f"📝 Processing {len(builds_data)} builds...")
-            for build_data in builds_data:
-                errors = validator.validate_build(build_data)
-                if errors:
-                    print(f"❌ Validation errors for build {build_data.get('heroId', 'unknown')}:")
-                    for error in errors:
-                        print(f"  - {error}")
-                    fail_count += 1
-                    continue
-                
-                # Check if hero exists
-                if not db_manager.hero_exists(build_data['heroId']):
-                    print(f"❌ Hero '{build_data['heroId']}' does not exist in database")
-                    fail_count += 1
-                    continue
-                
-                # Check if build already exists for this hero and mood
-                if db_manager.build_exists(build_data['heroId'], build_data['mood']):
-                    print(f"⏭️  Build for hero '{build_data['heroId']}' with mood '{build_data['mood']}' already exists, skipping...")
-                    continue
-                
-                # Convert nested dictionaries to dataclasses
-                items = [Item(**item) for item in build_data['items']]
-                playstyle = Playstyle(**build_data['playstyle'])
-                gameplan = Gameplan(**build_data['gameplan'])
-                
-                build = Build(
-                    heroId=build_data['heroId'],
-                    mood=build_data['mood'],
-                    items=items,
-                    playstyle=playstyle,
-                    gameplan=gameplan
-                )
-                
-                if db_manager.add_build(build):
-                    success_count += 1
-                else:
-                    fail_count += 1
+        
+        if args.shard_index is not None and not 0 <= args.shard_index < args.shards:
+            print(f"❌ --shard-index must be between 0 and {args.shards - 1}")
+            return
+        
+        if args.replace_all and not args.staging:
+            print("❌ --replace-all requires --staging")
+            return
+        if args.replace_all and args.filter:
+            # Filtered-out records would be missing from the batch, so the merge would delete them
+            print("❌ --replace-all cannot be combined with --filter; fix the files instead")
+            return
+        if args.staging and (args.use_async or args.shards > 1 or args.journal):
+            print("❌ --staging cannot be combined with --async, --shards or --journal")
+            return
+        if args.use_async and (args.shards > 1 or args.journal or args.trace or args.trace_file or args.profile):
+            # The tracer and journal hook into the sync client and bulk_import only
+            print("❌ --async cannot be combined with --shards, --journal, --trace or --profile")
+            return
+        
+        if builds_data and not args.exact_hero_ids:
+            resolve_build_hero_ids(db_manager, heroes_data, builds_data)
+        
+        # Report every missing hero and collision before the first write
+        preflight = preflight_import(db_manager, heroes_data, builds_data)
+        known_hero_ids = None
+        if preflight:
+            print_preflight(preflight, len(heroes_data or []), len(builds_data or []))
+            if not preflight.ok:
+                if not args.filter:
+                    print("❌ Pre-flight failed, nothing was written. Fix the files or rerun with --filter")
+                    return
+                heroes_data, builds_data = filter_preflight(preflight, heroes_data, builds_data)
+            known_hero_ids = preflight.known_hero_ids
+        
+        journal: List[Dict[str, Any]] = []
+        if args.staging:
+            success_count, fail_count = staged_bulk_import(db_manager, heroes_data, builds_data, args.replace_all)
+        elif args.shards > 1:
+            shard_indexes = [args.shard_index] if args.shard_index is not None else list(range(args.shards))
+            success_count, fail_count, journal = sharded_bulk_import(
+                db_manager, heroes_data, builds_data, args.shards, shard_indexes,
+                TransportConfig.from_args(args), args.max_concurrency, known_hero_ids
+            )
+        elif args.use_async:
+            success_count, fail_count = asyncio.run(run_async_bulk_import(args, db_manager, heroes_data, builds_data))
+        else:
+            success_count, fail_count = bulk_import(db_manager, heroes_data, builds_data, controller, journal,
+                                                    known_hero_ids)
+        
+        if args.journal:
+            save_journal(journal, args.journal)
         
         print(f"\n📊 Summary:")
         print(f"✅ Successfully processed: {success_count} items")
         print(f"❌ Failed: {fail_count} items")
+        
+        # Imported builds get the column default until they are scored; a
+        # staged merge writes the scores in its own transaction
+        if builds_data and success_count > 0:
+            if not args.staging:
+                # Only the heroes of the imported builds can have new builds
+                imported_hero_ids = sorted({build.get('heroId') for build in builds_data} - {None})
+                updated = db_manager.rescore_builds(hero_ids=imported_hero_ids)
+                if updated is not None:
+                    print(f"🧮 Updated {updated} build scores")
+            db_manager.refresh_views()
     
     elif args.command == 'list-heroes':
         heroes = db_manager.list_heroes()
@@ -811,6 +2434,200 @@ Examples:
     
     elif args.command == 'create-templates':
         create_template_files()
+    
+    elif args.command == 'sync-catalog':
+        catalog = db_manager.catalog
+        if args.builds:
+            builds_data = load_json_file(args.builds)
+            if not isinstance(builds_data, list):
+                print("❌ Builds file must contain an array of build objects")
+                return
+            
+            known_count = len(catalog)
+            catalog.update_from_builds(builds_data)
+            for conflict in catalog.conflicts:
+                print(f"⚠️  Item {conflict['id']} differs from catalog: {conflict['build']} vs {conflict['catalog']}")
+            if len(catalog) > known_count:
+                catalog.save(DEFAULT_CATALOG_PATH)
+                print(f"📦 Added {len(catalog) - known_count} new items to {DEFAULT_CATALOG_PATH.name}")
+        
+        if len(catalog) == 0:
+            print("❌ Item catalog is empty. Use --builds to create it")
+            return
+        
+        if db_manager.sync_catalog(catalog):
+            linked = db_manager.backfill_item_ids()
+            print(f"✅ Synced {len(catalog)} catalog items")
+            print(f"🔗 Linked {linked} existing item rows to the catalog")
+            # build_documents resolves item names and costs from the catalog
+            db_manager.refresh_views()
+    
+    elif args.command == 'builds-by-item':
+        if args.index:
+            try:
+                index = load_item_index(args.index)
+            except (FileNotFoundError, json.JSONDecodeError) as e:
+                print(f"❌ Could not read {args.index}: {str(e)}")
+                return
+            if not isinstance(index, dict):
+                print(f"❌ Could not read {args.index}: not an item index")
+                return
+            entries = index.get(args.item_id, [])
+        else:
+            entries = db_manager.builds_by_item(args.item_id)
+        print_item_builds(args.item_id, entries)
+    
+    elif args.command == 'rescore':
+        updated = db_manager.rescore_builds()
+        if updated is not None:
+            print(f"✅ Updated {updated} build scores")
+            db_manager.refresh_views()
+    
+    elif args.command == 'refresh-views':
+        if db_manager.refresh_views():
+            print("✅ Build documents are up to date")
+    
+    elif args.command == 'watch':
+        if not os.path.isdir(args.directory):
+            print(f"❌ Not a directory: {args.directory}")
+            return
+        
+        watcher = DirectoryWatcher(args.directory, debounce=args.debounce,
+                                   poll_interval=args.poll_interval, use_inotify=not args.polling)
+        watch_sync = WatchSync(db_manager, watcher)
+        watch_sync.scan(push=args.initial_sync)
+        watch_sync.run()
+    
+    elif args.command == 'pull':
+        if args.full and os.path.exists(args.output):
+            os.remove(args.output)
+        
+        mirror = open_mirror(args.output)
+        try:
+            since = mirror.watermarks['heroes'] or 'the beginning'
+            print(f"⬇️  Pulling changes since {since}...")
+            changes = pull_changes(db_manager.supabase, mirror, args.overlap)
+            counts = mirror.counts()
+            print(f"✅ {changes['heroes']} heroes and {changes['builds']} builds changed, {changes['deleted']} deleted")
+            print(f"📊 Mirror {args.output}: {counts['heroes']} heroes, {counts['builds']} builds")
+        except Exception as e:
+            print(f"❌ Error pulling changes: {str(e)}")
+        finally:
+            mirror.close()
+    
+    elif args.command == 'prune':
+        if args.moods and args.target == 'heroes':
+            print("❌ --moods only applies to builds")
+            return
+        if not (args.hero_ids or args.moods or args.older_than or args.keep):
+            print("❌ Give at least one filter (--hero-ids, --moods, --older-than or --keep)")
+            return
+        
+        keep = None
+        if args.keep:
+            keep = load_json_file(args.keep)
+            if not isinstance(keep, list):
+                print("❌ Keep file must contain an array of hero or build objects")
+                return
+        
+        removed = prune_records(db_manager, args.target, args.hero_ids, args.moods,
+                                args.older_than, keep, args.dry_run, controller)
+        if removed is not None and not args.dry_run:
+            print(f"✅ Removed {removed} {args.target} and their child rows")
+            if removed:
+                db_manager.refresh_views()
+
+    elif args.command == 'remap-moods':
+        mapping = load_mood_mapping(args.mapping)
+        if mapping is None:
+            return
+        result = db_manager.remap_moods(mapping, args.dry_run)
+        if result is None:
+            return
+        
+        print_mood_remap(result)
+        if not result.get('moves'):
+            print("✅ No rows use the mapped moods")
+        elif result.get('applied'):
+            print(f"✅ Remapped {result['builds']} builds and {result['hero_moods']} hero moods")
+            # Role and mood together set the base score
+            updated = db_manager.rescore_builds()
+            if updated is not None:
+                print(f"🧮 Updated {updated} build scores")
+            db_manager.refresh_views()
+        elif args.dry_run:
+            print("🔍 Dry run: nothing was changed")
+        else:
+            print("❌ Nothing was changed; fix the mapping or the conflicting builds first")
+    
+    elif args.command == 'reprice':
+        prices = load_prices(args.prices, args.assignments)
+        if prices is None:
+            return
+        catalog = db_manager.catalog
+        unknown = sorted(item_id for item_id in prices if item_id not in catalog)
+        if unknown:
+            print(f"❌ Not in {DEFAULT_CATALOG_PATH.name}: {', '.join(unknown)}")
+            return
+        builds_data = load_json_file(args.builds) if args.builds else []
+        if not isinstance(builds_data, list):
+            print("❌ Builds file must contain an array of build objects")
+            return
+        
+        # The database goes first so a failed update leaves the local files untouched
+        result = db_manager.reprice_items(prices, args.dry_run)
+        if result is None:
+            return
+        if result.get('unknown') or result.get('invalid'):
+            for item_id in result.get('unknown', []):
+                print(f"❌ Not in the item_catalog table: {item_id}")
+            for item_id in result.get('invalid', []):
+                print(f"❌ Rejected cost for {item_id}")
+            print("❌ Nothing was changed; run sync-catalog first")
+            return
+        
+        changes = catalog.reprice(prices)
+        for change in result.get('changes', []):
+            print(f"💰 {change['name']} ({change['id']}): {change['from']} → {change['to']}, "
+                  f"used by {change['builds']} builds")
+        print_cost_mismatches(result.get('mismatches', []), 'the database')
+        repriced, mismatches = catalog.reprice_builds(builds_data, changes)
+        if args.builds:
+            print(f"📝 {repriced} build items in {args.builds} follow the new prices")
+            print_cost_mismatches(mismatches, args.builds)
+        
+        if args.dry_run:
+            print("🔍 Dry run: nothing was changed")
+            return
+        if changes:
+            catalog.save(DEFAULT_CATALOG_PATH)
+            print(f"📦 Saved {len(changes)} new prices to {DEFAULT_CATALOG_PATH.name}")
+        if repriced:
+            save_json_file(builds_data, args.builds)
+        if result.get('applied') and result.get('changes'):
+            print(f"✅ Repriced {result['catalog']} catalog items and {result['items']} inline item costs")
+            db_manager.refresh_views()
+        else:
+            print("✅ Database prices already match")
+
+async def run_async_bulk_import(args: argparse.Namespace, db_manager: DatabaseManager,
+                                heroes_data: Optional[List[Dict[str, Any]]],
+                                builds_data: Optional[List[Dict[str, Any]]]) -> Tuple[int, int]:
+    """Run bulk-import through AsyncDatabaseManager"""
+    if builds_data:
+        # The catalog upsert is a single request, so the sync client handles it
+        validator = DataValidator()
+        prepare_catalog(db_manager, [
+            build_data for build_data in builds_data
+            if not validator.validate_build(build_data)
+        ])
+    
+    client = await create_async_supabase_client(TransportConfig.from_args(args))
+    try:
+        async_manager = AsyncDatabaseManager(client, db_manager.catalog)
+        return await async_bulk_import(async_manager, heroes_data, builds_data, args.max_concurrency)
+    finally:
+        await client.postgrest.session.aclose()
 
 def create_template_files():
     """Create JSON template files"""
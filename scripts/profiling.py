@@ -0,0 +1,165 @@
+"""
+CPU and Allocation Profiling for Script Commands
+
+Runs a command under cProfile and tracemalloc and writes three files to the
+output directory:
+
+    <label>-cpu.txt     Time breakdown plus hotspots sorted by cumulative and own time
+    <label>-alloc.txt   Top allocation sites by size
+    <label>.prof        Raw cProfile data (for snakeviz, pstats, etc.)
+
+Network wait is taken from a RequestTracer wrapped around the client, so the
+breakdown separates time spent waiting on Supabase from local Python work
+(validation, dataclass conversion, JSON handling). Overlapping requests count
+once, and JSON work done by the HTTP client while parsing a response is left
+to network wait rather than counted again as local work. cProfile only
+observes the thread that enabled it, so the commands refuse --profile when
+--max-concurrency would move the work onto a thread pool.
+"""
+
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from request_tracing import RequestTracer
+
+DEFAULT_PROFILE_DIR = 'profiles'
+HOTSPOT_LIMIT = 40
+ALLOCATION_LIMIT = 30
+
+# Entry points whose cumulative time is attributed to a category
+JSON_FUNCTIONS = {'loads', 'dump', 'dumps'}
+VALIDATION_FUNCTIONS = {'validate_hero', 'validate_build'}
+
+# JSON calls made from these packages happen inside a traced request
+REQUEST_PACKAGES = ('httpx', 'postgrest', 'supabase')
+
+def _in_request_package(filename: str) -> bool:
+    parts = Path(filename).parts
+    return any(package in parts for package in REQUEST_PACKAGES)
+
+def merged_seconds(intervals: List[Tuple[float, float]]) -> float:
+    """Total length of the union of (start, end) intervals"""
+    total = 0.0
+    current_start = current_end = None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+class CommandProfiler:
+    """Context manager that profiles CPU time and allocations of a command"""
+
+    def __init__(self, label: str, output_dir: str = DEFAULT_PROFILE_DIR,
+                 tracer: Optional[RequestTracer] = None):
+        timestamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        self.label = f"{label}-{timestamp}"
+        self.output_dir = Path(output_dir)
+        self.tracer = tracer
+        self.profile = cProfile.Profile()
+
+    def __enter__(self) -> 'CommandProfiler':
+        tracemalloc.start(10)
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        self.profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profile.disable()
+        wall_seconds = time.perf_counter() - self.wall_start
+        cpu_seconds = time.process_time() - self.cpu_start
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.profile.dump_stats(str(self.output_dir / f"{self.label}.prof"))
+        breakdown = self._breakdown(wall_seconds, cpu_seconds)
+        self._write_cpu_report(breakdown)
+        self._write_allocation_report(snapshot, peak)
+        self._print_breakdown(breakdown)
+        return False
+
+    def _category_seconds(self) -> Dict[str, float]:
+        """Attribute profiled time to local work categories"""
+        categories = {'validation': 0.0, 'dataclass conversion': 0.0, 'json': 0.0}
+        stats = pstats.Stats(self.profile).stats
+        for (filename, _, function), (_, _, own_time, cumulative_time, callers) in stats.items():
+            if function in VALIDATION_FUNCTIONS and filename.endswith('manage_dota_data.py'):
+                categories['validation'] += cumulative_time
+            elif function in JSON_FUNCTIONS and filename.endswith(('json/__init__.py', 'json\\__init__.py')):
+                # Parsing done by the HTTP client is already part of network wait
+                categories['json'] += cumulative_time - sum(
+                    caller_cumulative for (caller_file, _, _), (_, _, _, caller_cumulative) in callers.items()
+                    if _in_request_package(caller_file)
+                )
+            elif function == '__init__' and filename == '<string>':
+                # Dataclass generated __init__ methods
+                categories['dataclass conversion'] += own_time
+            elif function == 'build_from_dict':
+                categories['dataclass conversion'] += own_time
+        return categories
+
+    def _breakdown(self, wall_seconds: float, cpu_seconds: float) -> Dict[str, float]:
+        network_seconds = 0.0
+        if self.tracer is not None:
+            network_seconds = merged_seconds([
+                (record.started_at, record.started_at + record.latency_ms / 1000)
+                for record in self.tracer.records
+            ])
+        breakdown = {
+            'wall': wall_seconds,
+            'network wait': network_seconds,
+            'local (wall - network)': max(0.0, wall_seconds - network_seconds),
+            'process cpu': cpu_seconds,
+        }
+        breakdown.update(self._category_seconds())
+        return breakdown
+
+    def _write_cpu_report(self, breakdown: Dict[str, float]):
+        output = io.StringIO()
+        output.write(f"Profile: {self.label}\n\n")
+        output.write("Time breakdown (seconds)\n")
+        for name, seconds in breakdown.items():
+            output.write(f"  {name:<24} {seconds:10.4f}\n")
+
+        for sort_key, title in (('cumulative', 'cumulative time'), ('tottime', 'own time')):
+            output.write(f"\nHotspots by {title}\n")
+            stats = pstats.Stats(self.profile, stream=output)
+            stats.strip_dirs().sort_stats(sort_key).print_stats(HOTSPOT_LIMIT)
+
+        with open(self.output_dir / f"{self.label}-cpu.txt", 'w', encoding='utf-8') as f:
+            f.write(output.getvalue())
+
+    def _write_allocation_report(self, snapshot: tracemalloc.Snapshot, peak: int):
+        snapshot = snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+        ))
+        lines = [f"Allocations: {self.label}", f"Peak traced memory: {peak / 1024:.1f} KB", ""]
+        lines.append(f"Top {ALLOCATION_LIMIT} allocation sites by size")
+        for stat in snapshot.statistics('lineno')[:ALLOCATION_LIMIT]:
+            frame = stat.traceback[0]
+            lines.append(f"  {stat.size / 1024:10.1f} KB  {stat.count:8} blocks  {frame.filename}:{frame.lineno}")
+
+        with open(self.output_dir / f"{self.label}-alloc.txt", 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+
+    def _print_breakdown(self, breakdown: Dict[str, float]):
+        print(f"\n⏱️  PROFILE: {self.label}")
+        for name, seconds in breakdown.items():
+            print(f"  {name:<24} {seconds:10.4f}s")
+        print(f"📄 Reports written to {self.output_dir}/{self.label}-cpu.txt and -alloc.txt")
@@ -0,0 +1,281 @@
+"""
+Incremental Pull from Supabase into a Local Mirror
+
+Fetches only the heroes and builds whose updated_at is at or after the
+mirror's high-water mark and merges them into a local JSON file or SQLite
+database. Child-table writes bump their parent's updated_at and deletions
+leave tombstones in deleted_records (see the change_tracking migration), so
+one pull fetches every hero and build that changed, with its children, and
+drops the ones that were deleted.
+
+Heroes and builds are stored in the same shape as the import JSON, so a JSON
+mirror can be fed back to bulk-import or watch.
+"""
+
+import json
+import sqlite3
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+PAGE_SIZE = 1000
+DEFAULT_OVERLAP_SECONDS = 60
+WATERMARK_KEYS = ('heroes', 'builds', 'deleted_records')
+
+HERO_COLUMNS = (
+    'id, name, role, difficulty, description, updated_at, '
+    'hero_moods(mood), hero_strengths(strength, order_index), hero_weaknesses(weakness, order_index)'
+)
+BUILD_COLUMNS = (
+    'id, hero_id, mood, score, early_game, mid_game, late_game, updated_at, '
+    'items(item_id, name, cost, phase, priority, description, order_index, item_catalog(name, cost, description)), '
+    'playstyle_dos(do_item, order_index), playstyle_donts(dont_item, order_index), '
+    'playstyle_tips(tip, order_index)'
+)
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse a PostgREST timestamp, whatever its number of fractional digits"""
+    value = value.replace('Z', '+00:00')
+    if '.' in value:
+        head, fraction = value.split('.', 1)
+        digits = ''.join(ch for ch in fraction if ch.isdigit())
+        value = f"{head}.{digits[:6].ljust(6, '0')}{fraction[len(digits):]}"
+    return datetime.fromisoformat(value)
+
+def _ordered(rows: Optional[List[Dict[str, Any]]], column: str) -> List[Any]:
+    return [row[column] for row in sorted(rows or [], key=lambda row: row.get('order_index') or 0)]
+
+def hero_from_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a heroes row with embedded children to hero JSON"""
+    return {
+        'id': row['id'],
+        'name': row['name'],
+        'role': row['role'],
+        'difficulty': row['difficulty'],
+        'moods': [mood['mood'] for mood in row.get('hero_moods') or []],
+        'description': row['description'],
+        'strengths': _ordered(row.get('hero_strengths'), 'strength'),
+        'weaknesses': _ordered(row.get('hero_weaknesses'), 'weakness'),
+        'updatedAt': row['updated_at']
+    }
+
+def build_from_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a builds row with embedded children to build JSON"""
+    items = []
+    for item in sorted(row.get('items') or [], key=lambda item: item.get('order_index') or 0):
+        catalog = item.get('item_catalog') or {}
+        items.append({
+            'id': item.get('item_id') or item.get('name'),
+            'name': catalog.get('name') or item.get('name'),
+            'cost': catalog.get('cost') if catalog.get('cost') is not None else item.get('cost'),
+            'phase': item['phase'],
+            'priority': item['priority'],
+            'description': item['description'] if item.get('description') is not None else catalog.get('description', '')
+        })
+    return {
+        'id': row['id'],
+        'heroId': row['hero_id'],
+        'mood': row['mood'],
+        'score': row.get('score'),
+        'items': items,
+        'playstyle': {
+            'dos': _ordered(row.get('playstyle_dos'), 'do_item'),
+            'donts': _ordered(row.get('playstyle_donts'), 'dont_item'),
+            'tips': _ordered(row.get('playstyle_tips'), 'tip')
+        },
+        'gameplan': {
+            'early': row['early_game'],
+            'mid': row['mid_game'],
+            'late': row['late_game']
+        },
+        'updatedAt': row['updated_at']
+    }
+
+class LocalMirror(ABC):
+    """Local copy of heroes and builds with per-table watermarks"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.watermarks: Dict[str, Optional[str]] = {key: None for key in WATERMARK_KEYS}
+
+    @abstractmethod
+    def merge(self, heroes: List[Dict[str, Any]], builds: List[Dict[str, Any]],
+              deleted: List[Dict[str, Any]]):
+        """Apply fetched heroes and builds and drop deleted ones"""
+
+    @abstractmethod
+    def counts(self) -> Dict[str, int]:
+        """Return the number of heroes and builds in the mirror"""
+
+    @abstractmethod
+    def save(self):
+        """Persist the records and watermarks"""
+
+    def close(self):
+        pass
+
+class JsonMirror(LocalMirror):
+    """Mirror stored as {"watermarks": ..., "heroes": [...], "builds": [...]}"""
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self.heroes: Dict[str, Dict[str, Any]] = {}
+        self.builds: Dict[int, Dict[str, Any]] = {}
+        if path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.watermarks.update(data.get('watermarks') or {})
+            self.heroes = {hero['id']: hero for hero in data.get('heroes') or []}
+            self.builds = {build['id']: build for build in data.get('builds') or []}
+
+    def merge(self, heroes: List[Dict[str, Any]], builds: List[Dict[str, Any]],
+              deleted: List[Dict[str, Any]]):
+        for record in deleted:
+            if record['table_name'] == 'heroes':
+                self.heroes.pop(record['record_id'], None)
+            elif record['table_name'] == 'builds':
+                self.builds.pop(int(record['record_id']), None)
+        self.heroes.update((hero['id'], hero) for hero in heroes)
+        self.builds.update((build['id'], build) for build in builds)
+
+    def counts(self) -> Dict[str, int]:
+        return {'heroes': len(self.heroes), 'builds': len(self.builds)}
+
+    def save(self):
+        data = {
+            'watermarks': self.watermarks,
+            'heroes': sorted(self.heroes.values(), key=lambda hero: hero['id']),
+            'builds': sorted(self.builds.values(), key=lambda build: (build['heroId'], build['mood']))
+        }
+        temp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        temp_path.replace(self.path)
+
+class SqliteMirror(LocalMirror):
+    """Mirror stored in SQLite, one JSON document per hero and build"""
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self.connection = sqlite3.connect(str(path))
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS heroes (id TEXT PRIMARY KEY, updated_at TEXT, data TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS builds (
+                id INTEGER PRIMARY KEY, hero_id TEXT NOT NULL, mood TEXT NOT NULL,
+                updated_at TEXT, data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_builds_hero_id ON builds(hero_id);
+            CREATE TABLE IF NOT EXISTS watermarks (table_name TEXT PRIMARY KEY, value TEXT);
+        """)
+        for table_name, value in self.connection.execute('SELECT table_name, value FROM watermarks'):
+            self.watermarks[table_name] = value
+
+    def merge(self, heroes: List[Dict[str, Any]], builds: List[Dict[str, Any]],
+              deleted: List[Dict[str, Any]]):
+        with self.connection:
+            self.connection.executemany('DELETE FROM heroes WHERE id = ?', [
+                (record['record_id'],) for record in deleted if record['table_name'] == 'heroes'
+            ])
+            self.connection.executemany('DELETE FROM builds WHERE id = ?', [
+                (int(record['record_id']),) for record in deleted if record['table_name'] == 'builds'
+            ])
+            self.connection.executemany('INSERT OR REPLACE INTO heroes VALUES (?, ?, ?)', [
+                (hero['id'], hero['updatedAt'], json.dumps(hero, ensure_ascii=False)) for hero in heroes
+            ])
+            self.connection.executemany('INSERT OR REPLACE INTO builds VALUES (?, ?, ?, ?, ?)', [
+                (build['id'], build['heroId'], build['mood'], build['updatedAt'], json.dumps(build, ensure_ascii=False))
+                for build in builds
+            ])
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            table: self.connection.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+            for table in ('heroes', 'builds')
+        }
+
+    def save(self):
+        with self.connection:
+            self.connection.executemany('INSERT OR REPLACE INTO watermarks VALUES (?, ?)', [
+                (table_name, value) for table_name, value in self.watermarks.items()
+            ])
+
+    def close(self):
+        self.connection.close()
+
+def open_mirror(path: str) -> LocalMirror:
+    """Open a JSON or SQLite mirror depending on the file extension"""
+    mirror_path = Path(path)
+    if mirror_path.suffix.lower() in ('.db', '.sqlite', '.sqlite3'):
+        return SqliteMirror(mirror_path)
+    return JsonMirror(mirror_path)
+
+def fetch_since(supabase_client: Any, table: str, columns: str, timestamp_column: str,
+                since: Optional[str]) -> List[Dict[str, Any]]:
+    """Fetch rows with timestamp_column >= since, paging through PostgREST's row limit"""
+    rows = []
+    start = 0
+    while True:
+        query = supabase_client.table(table).select(columns)
+        if since:
+            query = query.gte(timestamp_column, since)
+        page = query.order(timestamp_column).order('id').range(start, start + PAGE_SIZE - 1).execute().data or []
+        rows.extend(page)
+        if len(page) < PAGE_SIZE:
+            return rows
+        start += PAGE_SIZE
+
+def pull_changes(supabase_client: Any, mirror: LocalMirror,
+                 overlap_seconds: int = DEFAULT_OVERLAP_SECONDS) -> Dict[str, int]:
+    """Merge everything changed since the mirror's watermarks and advance them"""
+    # Re-read a short window before each watermark: a transaction that committed
+    # after the last pull can carry an updated_at older than rows we already saw.
+    # Merging is idempotent, so the overlap only costs a few repeated rows.
+    since = {}
+    for table, watermark in mirror.watermarks.items():
+        since[table] = None
+        if watermark:
+            since[table] = (parse_timestamp(watermark) - timedelta(seconds=overlap_seconds)).isoformat()
+
+    hero_rows = fetch_since(supabase_client, 'heroes', HERO_COLUMNS, 'updated_at', since['heroes'])
+    build_rows = fetch_since(supabase_client, 'builds', BUILD_COLUMNS, 'updated_at', since['builds'])
+    deleted = []
+    if any(mirror.watermarks.values()):
+        # A fresh mirror has nothing to delete
+        deleted = fetch_since(supabase_client, 'deleted_records', 'id, table_name, record_id, deleted_at',
+                              'deleted_at', since['deleted_records'])
+
+    # The overlap window can return both a row and its later tombstone, and a
+    # hero id can be deleted and created again; the newer event wins
+    tombstones = {}
+    for record in deleted:
+        key = (record['table_name'], str(record['record_id']))
+        if key not in tombstones or parse_timestamp(record['deleted_at']) > tombstones[key]:
+            tombstones[key] = parse_timestamp(record['deleted_at'])
+
+    def is_current(table: str, row: Dict[str, Any]) -> bool:
+        deleted_at = tombstones.get((table, str(row['id'])))
+        return deleted_at is None or parse_timestamp(row['updated_at']) > deleted_at
+
+    live_heroes = [row for row in hero_rows if is_current('heroes', row)]
+    live_builds = [row for row in build_rows if is_current('builds', row)]
+    recreated = {('heroes', str(row['id'])) for row in live_heroes} | {('builds', str(row['id'])) for row in live_builds}
+    mirror.merge(
+        [hero_from_row(row) for row in live_heroes],
+        [build_from_row(row) for row in live_builds],
+        [record for record in deleted if (record['table_name'], str(record['record_id'])) not in recreated]
+    )
+
+    for table, rows, column in (('heroes', hero_rows, 'updated_at'), ('builds', build_rows, 'updated_at'),
+                                ('deleted_records', deleted, 'deleted_at')):
+        timestamps = [row[column] for row in rows if row.get(column)]
+        if timestamps:
+            mirror.watermarks[table] = max(timestamps, key=parse_timestamp)
+    if not mirror.watermarks['deleted_records']:
+        # Start tombstone tracking at the newest change seen so far
+        timestamps = [value for value in (mirror.watermarks['heroes'], mirror.watermarks['builds']) if value]
+        if timestamps:
+            mirror.watermarks['deleted_records'] = max(timestamps, key=parse_timestamp)
+
+    mirror.save()
+    return {'heroes': len(hero_rows), 'builds': len(build_rows), 'deleted': len(deleted)}
@@ -0,0 +1,194 @@
+"""
+Request Tracing for Supabase Calls
+
+Wraps a Supabase client so that every execute() is recorded with its table,
+operation, row count, payload sizes and latency. The tracer prints a
+per-table summary with the slowest calls and can write a Chrome trace-event
+file (open it in chrome://tracing or https://ui.perfetto.dev) for a timeline
+of where a slow sync spent its time.
+"""
+
+import json
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+WRITE_OPERATIONS = ('insert', 'upsert', 'update', 'delete')
+
+@dataclass
+class TraceRecord:
+    """One executed request"""
+    table: str
+    operation: str
+    rows: int
+    sent_bytes: int
+    received_bytes: int
+    latency_ms: float
+    started_at: float
+    thread_id: int
+    error: Optional[str] = None
+
+def _json_size(data: Any) -> int:
+    """Approximate the wire size of a JSON payload"""
+    if data is None:
+        return 0
+    try:
+        return len(json.dumps(data, default=str).encode('utf-8'))
+    except (TypeError, ValueError):
+        return 0
+
+class RequestTracer:
+    """Collects trace records for wrapped clients"""
+
+    def __init__(self, measure_payloads: bool = True):
+        # Payload sizing serializes every request and response; profiling
+        # turns it off so it doesn't show up as JSON work in the report
+        self.measure_payloads = measure_payloads
+        self.records: List[TraceRecord] = []
+        self.origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def wrap(self, client: Any) -> 'TracedClient':
+        """Return a traced view of a Supabase client"""
+        return TracedClient(client, self)
+
+    def record(self, record: TraceRecord):
+        with self._lock:
+            self.records.append(record)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Aggregate records per table"""
+        tables = defaultdict(lambda: {
+            'calls': 0, 'rows': 0, 'sent_bytes': 0, 'received_bytes': 0,
+            'total_ms': 0.0, 'max_ms': 0.0, 'errors': 0, 'operations': defaultdict(int)
+        })
+        for record in self.records:
+            stats = tables[record.table]
+            stats['calls'] += 1
+            stats['rows'] += record.rows
+            stats['sent_bytes'] += record.sent_bytes
+            stats['received_bytes'] += record.received_bytes
+            stats['total_ms'] += record.latency_ms
+            stats['max_ms'] = max(stats['max_ms'], record.latency_ms)
+            stats['errors'] += 1 if record.error else 0
+            stats['operations'][record.operation] += 1
+        return dict(tables)
+
+    def print_summary(self, slowest: int = 10):
+        """Print the per-table summary and the slowest calls"""
+        if not self.records:
+            print("\n📡 No Supabase requests were made")
+            return
+
+        total_ms = sum(record.latency_ms for record in self.records)
+        print(f"\n📡 TRACE: {len(self.records)} requests, {total_ms:.0f}ms total")
+        print(f"{'Table':<26} {'Calls':>6} {'Rows':>7} {'Sent':>9} {'Recv':>9} {'Total ms':>9} {'Max ms':>8}  Operations")
+        print("-" * 106)
+        summary = self.summary()
+        for table, stats in sorted(summary.items(), key=lambda entry: -entry[1]['total_ms']):
+            operations = ', '.join(f"{op}={count}" for op, count in sorted(stats['operations'].items()))
+            errors = f" ❌ {stats['errors']} errors" if stats['errors'] else ''
+            print(f"{table:<26} {stats['calls']:>6} {stats['rows']:>7} {stats['sent_bytes']:>9} "
+                  f"{stats['received_bytes']:>9} {stats['total_ms']:>9.1f} {stats['max_ms']:>8.1f}  {operations}{errors}")
+
+        print(f"\n🐢 Slowest {min(slowest, len(self.records))} calls:")
+        for record in sorted(self.records, key=lambda r: -r.latency_ms)[:slowest]:
+            status = f" ❌ {record.error}" if record.error else ''
+            print(f"  {record.latency_ms:8.1f}ms  {record.operation:<7} {record.table} ({record.rows} rows){status}")
+
+    def write_chrome_trace(self, file_path: str):
+        """Write records as Chrome trace-event JSON"""
+        events = [
+            {
+                'name': f"{record.operation} {record.table}",
+                'cat': record.table,
+                'ph': 'X',
+                'ts': round((record.started_at - self.origin) * 1_000_000),
+                'dur': round(record.latency_ms * 1000),
+                'pid': 1,
+                'tid': record.thread_id,
+                'args': {
+                    'rows': record.rows,
+                    'sent_bytes': record.sent_bytes,
+                    'received_bytes': record.received_bytes,
+                    'error': record.error
+                }
+            }
+            for record in self.records
+        ]
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        print(f"✅ Trace written to {file_path}")
+
+class TracedQuery:
+    """Proxy for a query builder that records its execute() call"""
+
+    def __init__(self, tracer: RequestTracer, table: str, builder: Any,
+                 operation: str = 'select', payload: Any = None):
+        self._tracer = tracer
+        self._table = table
+        self._builder = builder
+        self._operation = operation
+        self._payload = payload
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._builder, name)
+        if not callable(attr):
+            return attr
+
+        def chained(*args, **kwargs):
+            operation = self._operation
+            payload = self._payload
+            if name in WRITE_OPERATIONS:
+                operation = name
+                payload = args[0] if args else kwargs.get('json')
+            return TracedQuery(self._tracer, self._table, attr(*args, **kwargs), operation, payload)
+
+        return chained
+
+    def execute(self) -> Any:
+        started_at = time.perf_counter()
+        error = None
+        response = None
+        try:
+            response = self._builder.execute()
+            return response
+        except Exception as e:
+            error = str(e)[:200]
+            raise
+        finally:
+            latency_ms = (time.perf_counter() - started_at) * 1000
+            data = getattr(response, 'data', None)
+            self._tracer.record(TraceRecord(
+                table=self._table,
+                operation=self._operation,
+                rows=len(data) if isinstance(data, list) else (1 if data else 0),
+                sent_bytes=_json_size(self._payload) if self._tracer.measure_payloads else 0,
+                received_bytes=_json_size(data) if self._tracer.measure_payloads else 0,
+                latency_ms=latency_ms,
+                started_at=started_at,
+                thread_id=threading.get_ident(),
+                error=error
+            ))
+
+class TracedClient:
+    """Proxy for a Supabase client whose table() and rpc() calls are traced"""
+
+    def __init__(self, client: Any, tracer: RequestTracer):
+        self._client = client
+        self._tracer = tracer
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+    def table(self, table_name: str) -> TracedQuery:
+        return TracedQuery(self._tracer, table_name, self._client.table(table_name))
+
+    def from_(self, table_name: str) -> TracedQuery:
+        return self.table(table_name)
+
+    def rpc(self, name: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> TracedQuery:
+        return TracedQuery(self._tracer, f"rpc:{name}", self._client.rpc(name, params or {}, **kwargs),
+                           'rpc', params)
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Offline Full-Text Search Index for Heroes
+
+Builds an inverted index over hero names, descriptions, strengths and
+weaknesses plus the item names and playstyle tips of each hero's builds. Every
+hero is one document. Term weights are precomputed with BM25, so a client
+only has to add up the weights of the query terms; nothing is scanned per
+keystroke.
+
+Index layout (JSON):
+    docs      hero ids; postings refer to positions in this list
+    terms     sorted vocabulary
+    postings  one list per term: [doc gap, weight, doc gap, weight, ...] where
+              doc ids are delta-encoded and weights are BM25 scores x 100
+    prefixes  prefix -> delta-encoded ids of the most common terms starting
+              with it, for matching the word still being typed
+
+Usage:
+    python search_index.py --heroes heroes.json --builds build_data_final.json
+    python search_index.py --builds build_data_final.json --query "black king"
+"""
+
+import argparse
+import json
+import math
+import re
+import sys
+import unicodedata
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_INDEX_PATH = Path(__file__).with_name('search_index.json')
+
+# Standard BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# A match in the name counts for more than one buried in a build tip
+FIELD_WEIGHTS = {
+    'name': 3.0,
+    'description': 1.5,
+    'strengths': 1.5,
+    'weaknesses': 1.5,
+    'items': 1.0,
+    'tips': 0.5
+}
+
+MIN_PREFIX_LENGTH = 2
+MAX_PREFIX_TERMS = 8
+
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'in',
+    'is', 'it', 'its', 'of', 'on', 'or', 'the', 'to', 'with', 'your', 'you'
+}
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+def normalize(text: str) -> str:
+    """Lowercase and strip accents; apostrophes join words ("Nature's" -> "natures")"""
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return text.lower().replace("'", '').replace('’', '')
+
+def tokenize(text: str) -> List[str]:
+    """Split normalized text into index terms, folding simple plurals"""
+    terms = []
+    for token in TOKEN_PATTERN.findall(normalize(text)):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        terms.append(token)
+    return terms
+
+def hero_fields(hero: Optional[Dict[str, Any]], builds: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+    """Collect the searchable text of a hero and its builds per field"""
+    hero = hero or {}
+    fields = {
+        'name': [hero.get('name', '')],
+        'description': [hero.get('description', '')],
+        'strengths': list(hero.get('strengths', [])),
+        'weaknesses': list(hero.get('weaknesses', [])),
+        'items': [],
+        'tips': []
+    }
+    for build in builds:
+        fields['items'].extend(item.get('name', '') for item in build.get('items', []))
+        fields['tips'].extend(build.get('playstyle', {}).get('tips', []))
+    return fields
+
+def build_search_index(heroes: Iterable[Dict[str, Any]], builds: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Build the BM25-weighted, delta-encoded index"""
+    heroes_by_id = {hero['id']: hero for hero in heroes}
+    builds_by_hero: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for build in builds:
+        builds_by_hero[build['heroId']].append(build)
+    docs = sorted(set(heroes_by_id) | set(builds_by_hero))
+
+    # Field-weighted term frequencies per document
+    frequencies: List[Counter] = []
+    lengths: List[float] = []
+    for hero_id in docs:
+        hero = heroes_by_id.get(hero_id, {'name': hero_id.replace('_', ' ')})
+        counts: Counter = Counter()
+        for field, texts in hero_fields(hero, builds_by_hero.get(hero_id, [])).items():
+            for text in texts:
+                for term in tokenize(text):
+                    counts[term] += FIELD_WEIGHTS[field]
+        frequencies.append(counts)
+        lengths.append(sum(counts.values()))
+
+    average_length = sum(lengths) / len(lengths) if lengths else 0.0
+    postings_by_term: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+    for doc_id, counts in enumerate(frequencies):
+        for term, frequency in counts.items():
+            postings_by_term[term].append((doc_id, frequency))
+
+    terms = sorted(postings_by_term)
+    postings = []
+    for term in terms:
+        entries = postings_by_term[term]
+        idf = math.log(1 + (len(docs) - len(entries) + 0.5) / (len(entries) + 0.5))
+        encoded = []
+        previous = 0
+        for doc_id, frequency in entries:
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[doc_id] / average_length)
+            weight = idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+            encoded.extend([doc_id - previous, max(1, round(weight * 100))])
+            previous = doc_id
+        postings.append(encoded)
+
+    # Each prefix keeps its most widespread terms; full terms are looked up directly
+    candidates: Dict[str, List[int]] = defaultdict(list)
+    for term_id, term in enumerate(terms):
+        for length in range(MIN_PREFIX_LENGTH, len(term)):
+            candidates[term[:length]].append(term_id)
+    prefixes = {}
+    for prefix in sorted(candidates):
+        best = sorted(candidates[prefix], key=lambda term_id: -len(postings_by_term[terms[term_id]]))
+        term_ids = sorted(best[:MAX_PREFIX_TERMS])
+        prefixes[prefix] = [term_id - previous for term_id, previous in zip(term_ids, [0] + term_ids)]
+
+    return {
+        'version': 1,
+        'docs': docs,
+        'terms': terms,
+        'postings': postings,
+        'prefixes': prefixes
+    }
+
+def _decode_pairs(encoded: List[int]) -> Iterable[Tuple[int, int]]:
+    doc_id = 0
+    for i in range(0, len(encoded), 2):
+        doc_id += encoded[i]
+        yield doc_id, encoded[i + 1]
+
+def index_terms(index: Dict[str, Any]) -> Dict[str, int]:
+    """Map each term to its id; kept in memory, not saved"""
+    return {term: term_id for term_id, term in enumerate(index['terms'])}
+
+def search(index: Dict[str, Any], query: str, limit: int = 10) -> List[Tuple[str, float]]:
+    """Rank heroes for a query; the last word also matches as a prefix"""
+    if 'term_ids' not in index:
+        index['term_ids'] = index_terms(index)
+    term_ids = index['term_ids']
+    tokens = tokenize(query)
+    typing = not query[-1:].isspace()
+    if typing:
+        # A stopword may be the start of a longer word ("in" -> "invoker")
+        raw = TOKEN_PATTERN.findall(normalize(query))
+        if raw and raw[-1] in STOPWORDS:
+            tokens.append(raw[-1])
+    scores: Dict[int, float] = defaultdict(float)
+    for position, token in enumerate(tokens):
+        matched = [term_ids[token]] if token in term_ids else []
+        if position == len(tokens) - 1 and typing:
+            term_id = 0
+            for gap in index['prefixes'].get(token, []):
+                term_id += gap
+                matched.append(term_id)
+        # A prefix can match several terms of one hero; count the best one
+        best: Dict[int, int] = {}
+        for term_id in set(matched):
+            for doc_id, weight in _decode_pairs(index['postings'][term_id]):
+                best[doc_id] = max(best.get(doc_id, 0), weight)
+        for doc_id, weight in best.items():
+            scores[doc_id] += weight / 100
+    ranked = sorted(scores.items(), key=lambda entry: (-entry[1], entry[0]))
+    return [(index['docs'][doc_id], round(score, 2)) for doc_id, score in ranked[:limit]]
+
+def load_search_index(file_path: Path = DEFAULT_INDEX_PATH) -> Dict[str, Any]:
+    """Load a search index, ready for search() calls"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    index['term_ids'] = index_terms(index)
+    return index
+
+def save_search_index(index: Dict[str, Any], file_path: Path = DEFAULT_INDEX_PATH):
+    """Save a search index without its in-memory term map"""
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump({key: value for key, value in index.items() if key != 'term_ids'}, f,
+                  separators=(',', ':'), ensure_ascii=False)
+
+def load_records(file_path: str) -> List[Dict[str, Any]]:
+    """Load an array of records, or the values of an object keyed by hero id"""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"❌ Could not read {file_path}: {str(e)}")
+        sys.exit(1)
+    return list(data.values()) if isinstance(data, dict) else data
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Build or query the offline hero search index')
+    parser.add_argument('--heroes', help='JSON file containing heroes array')
+    parser.add_argument('--builds', help='JSON file containing builds array')
+    parser.add_argument('--output', default=str(DEFAULT_INDEX_PATH), help='Index file to write')
+    parser.add_argument('--query', help='Search the freshly built index instead of writing it')
+    args = parser.parse_args()
+
+    if not args.heroes and not args.builds:
+        parser.error('give --heroes, --builds or both')
+
+    heroes = load_records(args.heroes) if args.heroes else []
+    builds = load_records(args.builds) if args.builds else []
+    index = build_search_index(heroes, builds)
+
+    if args.query:
+        results = search(index, args.query)
+        if not results:
+            print(f"No heroes match '{args.query}'")
+        for hero_id, score in results:
+            print(f"🔎 {hero_id} ({score})")
+        return
+
+    save_search_index(index, args.output)
+    size = Path(args.output).stat().st_size
+    print(f"✅ Indexed {len(index['terms'])} terms across {len(index['docs'])} heroes into {args.output} ({size / 1024:.1f} KiB)")
+
+if __name__ == '__main__':
+    main()
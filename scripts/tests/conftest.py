@@ -0,0 +1,7 @@
+"""Make the scripts importable by module name, as they import each other"""
+
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
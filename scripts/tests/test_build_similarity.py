@@ -0,0 +1,83 @@
+"""Tests for build_similarity.top_neighbours against a brute-force Jaccard run"""
+
+import random
+from fractions import Fraction
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from build_similarity import build_similarity_index, encode_builds, similar_builds, top_neighbours
+from item_catalog import ItemCatalog
+
+def random_item_sets(count, items, seed):
+    rng = random.Random(seed)
+    # A few empty sets and many overlapping ones, so ties and zero scores occur
+    return [set(rng.sample(range(items), rng.randint(0, 8))) for _ in range(count)]
+
+def encode(item_sets, items):
+    positions = {str(item): item for item in range(items)}
+    builds = [{'items': [{'id': str(item)} for item in sorted(item_set)]} for item_set in item_sets]
+    return encode_builds(builds, positions)
+
+def brute_force(item_sets, k, groups=None):
+    """Exact Jaccard top-k, best first and ties by position; shared items required"""
+    expected = []
+    for row, items in enumerate(item_sets):
+        scored = []
+        for other, other_items in enumerate(item_sets):
+            if other == row or (groups is not None and groups[other] == groups[row]):
+                continue
+            shared = len(items & other_items)
+            if shared:
+                scored.append((-Fraction(shared, len(items | other_items)), other))
+        expected.append([(other, float(-score)) for score, other in sorted(scored)[:k]])
+    return expected
+
+def as_lists(indices, scores):
+    return [
+        [(index, score) for index, score in zip(row_indices, row_scores) if index >= 0]
+        for row_indices, row_scores in zip(indices.tolist(), scores.tolist())
+    ]
+
+def assert_matches(actual, expected):
+    assert len(actual) == len(expected)
+    for row, (actual_row, expected_row) in enumerate(zip(actual, expected)):
+        assert [index for index, _ in actual_row] == [index for index, _ in expected_row], row
+        assert [score for _, score in actual_row] == pytest.approx([score for _, score in expected_row], rel=1e-6)
+
+@pytest.mark.parametrize('block_size', [600, 256, 7])
+def test_top_neighbours_matches_brute_force(block_size):
+    item_sets = random_item_sets(600, 60, seed=11)
+    indices, scores = top_neighbours(encode(item_sets, 60), 10, block_size=block_size)
+    assert indices.shape == (600, 10)
+    assert_matches(as_lists(indices, scores), brute_force(item_sets, 10))
+
+def test_top_neighbours_with_groups_matches_brute_force():
+    item_sets = random_item_sets(600, 60, seed=5)
+    groups = np.array([row // 4 for row in range(600)], dtype=np.int32)
+    indices, scores = top_neighbours(encode(item_sets, 60), 5, groups)
+    assert_matches(as_lists(indices, scores), brute_force(item_sets, 5, groups))
+
+def test_k_is_capped_and_missing_slots_are_padded():
+    item_sets = [{1, 2}, {2, 3}, {7}]
+    indices, scores = top_neighbours(encode(item_sets, 8), 10)
+    assert indices.shape == (3, 2)
+    assert indices.tolist() == [[1, -1], [0, -1], [-1, -1]]
+    assert scores[2].tolist() == [0.0, 0.0]
+
+def test_single_row_has_no_neighbours():
+    indices, scores = top_neighbours(encode([{1}], 4), 3)
+    assert indices.shape == (1, 0) and scores.shape == (1, 0)
+
+def test_index_round_trip():
+    builds = [
+        {'heroId': 'axe', 'mood': 'aggressive', 'items': [{'id': 'blink'}, {'id': 'blade_mail'}]},
+        {'heroId': 'axe', 'mood': 'defensive', 'items': [{'id': 'blink'}, {'id': 'crimson_guard'}]},
+        {'heroId': 'lina', 'mood': 'aggressive', 'items': [{'id': 'blink'}, {'id': 'blade_mail'}]}
+    ]
+    index = build_similarity_index(builds, ItemCatalog(), k=2)
+    assert similar_builds(index, 'axe/aggressive') == [('lina/aggressive', 1.0), ('axe/defensive', 0.333)]
+    cross_hero = build_similarity_index(builds, ItemCatalog(), k=2, cross_hero=True)
+    assert similar_builds(cross_hero, 'axe/aggressive') == [('lina/aggressive', 1.0)]
+    assert similar_builds(index, 'pudge/aggressive') == []
@@ -0,0 +1,76 @@
+"""Tests for dataset_diff.diff_values and record keys"""
+
+import copy
+
+from dataset_diff import diff_values, iter_records, record_key
+
+def apply_patch(document, operations):
+    """Minimal RFC 6902 add/remove/replace for checking generated patches"""
+    for operation in operations:
+        parts = [part.replace('~1', '/').replace('~0', '~') for part in operation['path'].split('/')[1:]]
+        parent = document
+        for part in parts[:-1]:
+            parent = parent[int(part)] if isinstance(parent, list) else parent[part]
+        last = parts[-1]
+        if isinstance(parent, list):
+            last = int(last)
+            if operation['op'] == 'add':
+                parent.insert(last, operation['value'])
+            elif operation['op'] == 'remove':
+                del parent[last]
+            else:
+                parent[last] = operation['value']
+        elif operation['op'] == 'remove':
+            del parent[last]
+        else:
+            parent[last] = operation['value']
+    return document
+
+def test_identical_values_yield_nothing():
+    build = {'heroId': 'axe', 'mood': 'aggressive', 'items': [{'name': 'Blink Dagger', 'cost': 2250}]}
+    assert list(diff_values(build, build, [])) == []
+
+def test_replace_carries_old_value():
+    assert list(diff_values({'cost': 2250}, {'cost': 2150}, [])) == [
+        {'op': 'replace', 'path': '/cost', 'value': 2150, 'old': 2250}
+    ]
+
+def test_type_change_is_a_replace():
+    # 1 == True in Python, but the JSON differs
+    assert list(diff_values({'a': 1}, {'a': True}, [])) == [
+        {'op': 'replace', 'path': '/a', 'value': True, 'old': 1}
+    ]
+
+def test_added_and_removed_keys():
+    operations = list(diff_values({'a': 1, 'b': 2}, {'b': 2, 'c': 3}, []))
+    assert operations == [
+        {'op': 'remove', 'path': '/a'},
+        {'op': 'add', 'path': '/c', 'value': 3}
+    ]
+
+def test_list_removals_run_from_the_end():
+    operations = list(diff_values([1, 2, 3, 4], [1], ['tips']))
+    assert [operation['path'] for operation in operations] == ['/tips/3', '/tips/2', '/tips/1']
+
+def test_pointer_escapes_slash_and_tilde():
+    operations = list(diff_values({}, {'a/b~c': 1}, []))
+    assert operations[0]['path'] == '/a~1b~0c'
+
+def test_patch_turns_old_into_new():
+    old = {
+        'heroId': 'axe', 'mood': 'aggressive',
+        'items': [{'name': 'Blink Dagger', 'cost': 2250}, {'name': 'Blade Mail', 'cost': 2100}],
+        'playstyle': {'tips': ['Blink in', 'Call', 'Spin']}
+    }
+    new = {
+        'heroId': 'axe', 'mood': 'aggressive',
+        'items': [{'name': 'Blink Dagger', 'cost': 2150}],
+        'playstyle': {'tips': ['Blink in', 'Call', 'Spin', 'Cull'], 'early': 'Lane hard'},
+        'notes': None
+    }
+    assert apply_patch(copy.deepcopy(old), diff_values(old, new, [])) == new
+
+def test_record_keys_and_keyed_files():
+    data = {'axe': {'heroId': 'axe', 'mood': 'aggressive'}, 'lina': {'id': 'lina'}}
+    assert [record_key(record) for record in iter_records(data)] == ['axe/aggressive', 'lina']
+    assert record_key({'heroId': 'axe', 'mood': 'aggressive'}, by_hero=True) == 'axe'
@@ -0,0 +1,56 @@
+"""Tests for manage_dota_data.diff_ordered_rows"""
+
+import pytest
+
+# manage_dota_data builds its clients at import time from these packages
+pytest.importorskip('supabase')
+pytest.importorskip('dotenv')
+pytest.importorskip('httpx')
+
+from manage_dota_data import diff_ordered_rows
+
+COLUMNS = ['build_id', 'tip', 'order_index']
+
+def tip_rows(build_id, tips):
+    return [{'build_id': build_id, 'tip': tip, 'order_index': index} for index, tip in enumerate(tips)]
+
+def existing_rows(build_id, tips, first_id=1):
+    return [{'id': first_id + index, **row} for index, row in enumerate(tip_rows(build_id, tips))]
+
+def test_unchanged_rows_need_no_writes():
+    existing = existing_rows('b1', ['Farm', 'Push'])
+    assert diff_ordered_rows(existing, tip_rows('b1', ['Farm', 'Push']), COLUMNS) == ([], [], [])
+
+def test_changed_row_is_updated_in_place():
+    existing = existing_rows('b1', ['Farm', 'Push'])
+    inserts, updates, deletes = diff_ordered_rows(existing, tip_rows('b1', ['Farm', 'Fight']), COLUMNS)
+    assert inserts == [] and deletes == []
+    assert updates == [{'id': 2, 'build_id': 'b1', 'tip': 'Fight', 'order_index': 1}]
+
+def test_longer_and_shorter_lists():
+    existing = existing_rows('b1', ['Farm', 'Push', 'Fight'])
+    inserts, updates, deletes = diff_ordered_rows(existing, tip_rows('b1', ['Farm']), COLUMNS)
+    assert (inserts, updates, sorted(deletes)) == ([], [], [2, 3])
+
+    inserts, updates, deletes = diff_ordered_rows(existing[:1], tip_rows('b1', ['Farm', 'Push']), COLUMNS)
+    assert (inserts, updates, deletes) == ([{'build_id': 'b1', 'tip': 'Push', 'order_index': 1}], [], [])
+
+def test_duplicate_positions_keep_the_lowest_id():
+    existing = existing_rows('b1', ['Farm', 'Push']) + [{'id': 9, 'build_id': 'b1', 'tip': 'Old', 'order_index': 0}]
+    inserts, updates, deletes = diff_ordered_rows(existing, tip_rows('b1', ['Farm', 'Push']), COLUMNS)
+    assert (inserts, updates, deletes) == ([], [], [9])
+
+def test_desired_rows_are_reduced_to_columns():
+    desired = [{'build_id': 'b1', 'tip': 'Farm', 'order_index': 0, 'extra': True}]
+    inserts, _, _ = diff_ordered_rows([], desired, COLUMNS)
+    assert inserts == [{'build_id': 'b1', 'tip': 'Farm', 'order_index': 0}]
+
+def test_applying_the_diff_reaches_the_desired_rows():
+    existing = existing_rows('b1', ['a', 'b', 'c', 'd'])
+    desired = tip_rows('b1', ['a', 'x', 'c'])
+    inserts, updates, deletes = diff_ordered_rows(existing, desired, COLUMNS)
+    rows = {row['id']: dict(row) for row in existing if row['id'] not in deletes}
+    for update in updates:
+        rows[update['id']].update(update)
+    result = [{column: row[column] for column in COLUMNS} for row in rows.values()] + inserts
+    assert sorted(result, key=lambda row: row['order_index']) == desired
@@ -0,0 +1,72 @@
+"""Tests for hero_ids.BKTree and HeroIdResolver"""
+
+import random
+
+from hero_ids import BKTree, HeroIdResolver, edit_distance, normalize_key
+
+HEROES = [
+    {'id': 'anti-mage', 'name': 'Anti-Mage'},
+    {'id': 'axe', 'name': 'Axe'},
+    {'id': 'death-prophet', 'name': 'Death Prophet'},
+    {'id': 'juggernaut', 'name': 'Juggernaut'},
+    {'id': 'natures-prophet', 'name': "Nature's Prophet"},
+    {'id': 'zeus', 'name': 'Zeus'},
+    {'id': 'lina', 'name': 'Lina'},
+    {'id': 'lion', 'name': 'Lion'}
+]
+
+def test_edit_distance():
+    assert edit_distance('juggernaut', 'juggernuat') == 2
+    assert edit_distance('', 'axe') == 3
+    assert edit_distance('lina', 'lina') == 0
+
+def test_normalize_key_strips_prefix_accents_and_punctuation():
+    assert normalize_key('npc_dota_hero_zuus') == 'zuus'
+    assert normalize_key("Nature's Prophet") == 'naturesprophet'
+    assert normalize_key('Anti-Mage') == normalize_key('antimage')
+
+def test_bk_tree_matches_linear_scan():
+    rng = random.Random(7)
+    words = {''.join(rng.choice('abcde') for _ in range(rng.randint(1, 7))) for _ in range(300)}
+    tree = BKTree(words)
+    for query in ['abc', 'eeee', 'a', 'badcab', '']:
+        for max_distance in range(4):
+            expected = sorted((edit_distance(query, word), word) for word in words
+                              if edit_distance(query, word) <= max_distance)
+            assert tree.search(query, max_distance) == expected
+
+def test_bk_tree_ignores_duplicates_and_handles_empty():
+    assert BKTree().search('axe', 2) == []
+    tree = BKTree(['axe', 'axe'])
+    assert tree.search('axe', 0) == [(0, 'axe')]
+
+def test_resolve_exact_alias_and_internal_names():
+    resolver = HeroIdResolver(HEROES)
+    assert (resolver.resolve('axe').hero_id, resolver.resolve('axe').method) == ('axe', 'exact')
+    for value, hero_id in [('death_prophet', 'death-prophet'), ('Death Prophet', 'death-prophet'),
+                           ('antimage', 'anti-mage'), ('npc_dota_hero_zuus', 'zeus'),
+                           ('furion', 'natures-prophet')]:
+        resolution = resolver.resolve(value)
+        assert (resolution.hero_id, resolution.method) == (hero_id, 'alias'), value
+
+def test_resolve_fuzzy():
+    resolution = HeroIdResolver(HEROES).resolve('juggernuat')
+    assert (resolution.hero_id, resolution.method) == ('juggernaut', 'fuzzy')
+
+def test_equally_close_heroes_are_ambiguous():
+    # "lin" is one edit from both lina and lion
+    resolution = HeroIdResolver(HEROES).resolve('lin')
+    assert not resolution.resolved
+    assert resolution.method == 'ambiguous'
+    assert resolution.candidates == ['lina', 'lion']
+
+def test_short_ids_allow_a_single_edit():
+    resolver = HeroIdResolver(HEROES)
+    assert resolver.resolve('axee').hero_id == 'axe'
+    # Two edits away from "axe"; only longer ids tolerate that
+    assert not resolver.resolve('axxx').resolved
+    assert not resolver.resolve('pudge').resolved
+
+def test_resolutions_are_cached():
+    resolver = HeroIdResolver(HEROES)
+    assert resolver.resolve('antimage') is resolver.resolve('antimage')
@@ -0,0 +1,239 @@
+"""
+Tuned HTTP Transport for the Supabase Client
+
+supabase-py creates its PostgREST session with default settings. This module
+swaps in an httpx client with a keep-alive connection pool (HTTP/2 when the
+h2 package is installed), explicit connect/read timeouts and a retrying
+transport, so transient 5xx/429 responses during large imports are retried
+with exponential backoff and jitter instead of failing the record. Retry
+listeners (the adaptive concurrency controller) are told about every retried
+attempt, since the caller only sees the final response.
+
+Retries are idempotency aware:
+    - connection failures and 429 responses are retried for every request,
+      because the server never processed them
+    - 502/503/504 responses and read timeouts are retried for GET, HEAD,
+      OPTIONS, PUT, PATCH and DELETE, and for upserts (POST with a
+      "resolution=" Prefer header), which are safe to replay
+    - plain inserts and RPC calls are not replayed after the server may have
+      seen them
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, List, Optional
+
+import httpx
+
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'PATCH', 'DELETE'}
+RETRY_STATUSES = {502, 503, 504}
+THROTTLE_STATUS = 429
+
+# httpx imports h2 itself when http2 is enabled; only check that it is installed
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+@dataclass
+class TransportConfig:
+    """Connection pool, timeout and retry settings"""
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
+    write_timeout: float = 30.0
+    pool_timeout: float = 10.0
+    pool_size: int = 20
+    keepalive_expiry: float = 30.0
+    max_retries: int = 4
+    backoff_base: float = 0.25
+    backoff_cap: float = 8.0
+    http2: bool = True
+
+    @classmethod
+    def from_args(cls, args: argparse.Namespace) -> 'TransportConfig':
+        return cls(
+            connect_timeout=args.connect_timeout,
+            read_timeout=args.read_timeout,
+            pool_size=args.pool_size,
+            max_retries=args.max_retries,
+            http2=not args.no_http2
+        )
+
+def add_transport_arguments(parser: argparse.ArgumentParser):
+    """Add the transport options to a command-line parser"""
+    defaults = TransportConfig()
+    parser.add_argument('--connect-timeout', type=float, default=defaults.connect_timeout,
+                        help='Seconds to wait for a connection')
+    parser.add_argument('--read-timeout', type=float, default=defaults.read_timeout,
+                        help='Seconds to wait for a response')
+    parser.add_argument('--max-retries', type=int, default=defaults.max_retries,
+                        help='Retries for transient failures (0 disables)')
+    parser.add_argument('--pool-size', type=int, default=defaults.pool_size,
+                        help='Maximum pooled keep-alive connections')
+    parser.add_argument('--no-http2', action='store_true', help='Use HTTP/1.1 only')
+
+def is_retry_safe(request: httpx.Request) -> bool:
+    """Whether a request can be replayed after the server may have processed it"""
+    if request.method in IDEMPOTENT_METHODS:
+        return True
+    return request.method == 'POST' and 'resolution=' in request.headers.get('prefer', '')
+
+class RetryPolicy:
+    """Retry decisions shared by the sync and async transports"""
+
+    def __init__(self, config: TransportConfig):
+        self.config = config
+        self.retries = 0
+        # Called with the start time of each attempt that is retried
+        self.listeners: List[Callable[[float], None]] = []
+
+    def _notify_retry(self, started_at: float):
+        self.retries += 1
+        for listener in self.listeners:
+            listener(started_at)
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.config.pool_size,
+            max_keepalive_connections=self.config.pool_size,
+            keepalive_expiry=self.config.keepalive_expiry
+        )
+
+    def _retry_delay(self, request: httpx.Request, attempt: int,
+                     response: Optional[httpx.Response] = None,
+                     error: Optional[Exception] = None) -> Optional[float]:
+        """Seconds to wait before retrying, or None if the outcome is final"""
+        if attempt >= self.config.max_retries:
+            return None
+        if error is not None:
+            if isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)):
+                return self._backoff(attempt)
+            if isinstance(error, (httpx.ReadTimeout, httpx.RemoteProtocolError)) and is_retry_safe(request):
+                return self._backoff(attempt)
+            return None
+        if not self._should_retry(request, response):
+            return None
+        delay = self._retry_after(response)
+        return self._backoff(attempt) if delay is None else delay
+
+    def _should_retry(self, request: httpx.Request, response: httpx.Response) -> bool:
+        if response.status_code == THROTTLE_STATUS:
+            return True
+        return response.status_code in RETRY_STATUSES and is_retry_safe(request)
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter"""
+        return random.uniform(0, min(self.config.backoff_cap, self.config.backoff_base * 2 ** attempt))
+
+    def _retry_after(self, response: httpx.Response) -> Optional[float]:
+        """Delay requested by a Retry-After header, capped at backoff_cap"""
+        value = response.headers.get('retry-after')
+        if not value:
+            return None
+        try:
+            delay = float(value)
+        except ValueError:
+            try:
+                delay = parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return None
+        return min(max(delay, 0.0), self.config.backoff_cap)
+
+class RetryTransport(RetryPolicy, httpx.BaseTransport):
+    """httpx transport that retries transient failures with backoff"""
+
+    def __init__(self, config: TransportConfig):
+        super().__init__(config)
+        self.transport = httpx.HTTPTransport(http2=config.http2 and HTTP2_AVAILABLE, limits=self._limits())
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            started_at = time.perf_counter()
+            try:
+                response = self.transport.handle_request(request)
+            except httpx.TransportError as e:
+                delay = self._retry_delay(request, attempt, error=e)
+                if delay is None:
+                    raise
+            else:
+                delay = self._retry_delay(request, attempt, response=response)
+                if delay is None:
+                    return response
+                response.close()
+
+            attempt += 1
+            self._notify_retry(started_at)
+            time.sleep(delay)
+
+    def close(self):
+        self.transport.close()
+
+class AsyncRetryTransport(RetryPolicy, httpx.AsyncBaseTransport):
+    """Async variant of RetryTransport for the async Supabase client"""
+
+    def __init__(self, config: TransportConfig):
+        super().__init__(config)
+        self.transport = httpx.AsyncHTTPTransport(http2=config.http2 and HTTP2_AVAILABLE, limits=self._limits())
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            started_at = time.perf_counter()
+            try:
+                response = await self.transport.handle_async_request(request)
+            except httpx.TransportError as e:
+                delay = self._retry_delay(request, attempt, error=e)
+                if delay is None:
+                    raise
+            else:
+                delay = self._retry_delay(request, attempt, response=response)
+                if delay is None:
+                    return response
+                await response.aclose()
+
+            attempt += 1
+            self._notify_retry(started_at)
+            await asyncio.sleep(delay)
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+def _timeout(config: TransportConfig) -> httpx.Timeout:
+    return httpx.Timeout(
+        connect=config.connect_timeout,
+        read=config.read_timeout,
+        write=config.write_timeout,
+        pool=config.pool_timeout
+    )
+
+def configure_transport(client: Any, config: TransportConfig) -> Any:
+    """Replace the PostgREST session of a Supabase client with a tuned one"""
+    postgrest = client.postgrest
+    session = postgrest.session
+    client.retry_transport = RetryTransport(config)
+    postgrest.session = httpx.Client(
+        base_url=session.base_url,
+        headers=session.headers,
+        timeout=_timeout(config),
+        transport=client.retry_transport,
+        follow_redirects=True
+    )
+    session.close()
+    return client
+
+async def configure_async_transport(client: Any, config: TransportConfig) -> Any:
+    """Replace the PostgREST session of an async Supabase client with a tuned one"""
+    postgrest = client.postgrest
+    session = postgrest.session
+    postgrest.session = httpx.AsyncClient(
+        base_url=session.base_url,
+        headers=session.headers,
+        timeout=_timeout(config),
+        transport=AsyncRetryTransport(config),
+        follow_redirects=True
+    )
+    await session.aclose()
+    return client
@@ -0,0 +1,62 @@
+/*
+  # Normalized item catalog
+
+  1. New Tables
+    - `item_catalog` - One row per item id with name, cost and default description
+
+  2. Changes
+    - `items.item_id` references the catalog entry for the build item
+    - `items.name` and `items.cost` become optional; catalog values are used
+      when they are NULL
+    - `items.description` is a per-build override of the catalog description
+
+  3. Functions
+    - `backfill_item_catalog_ids()` links legacy item rows to the catalog by name
+*/
+
+CREATE TABLE IF NOT EXISTS item_catalog (
+    id VARCHAR(50) PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    cost INTEGER NOT NULL CHECK (cost >= 0),
+    description TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+ALTER TABLE items ADD COLUMN IF NOT EXISTS item_id VARCHAR(50)
+    REFERENCES item_catalog(id) ON UPDATE CASCADE;
+ALTER TABLE items ALTER COLUMN name DROP NOT NULL;
+ALTER TABLE items ALTER COLUMN cost DROP NOT NULL;
+
+ALTER TABLE item_catalog ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Allow anonymous read access" ON item_catalog;
+DROP POLICY IF EXISTS "Allow authenticated read access" ON item_catalog;
+
+CREATE POLICY "Allow anonymous read access" ON item_catalog
+    FOR SELECT TO anon
+    USING (true);
+
+CREATE POLICY "Allow authenticated read access" ON item_catalog
+    FOR SELECT TO authenticated
+    USING (true);
+
+DROP TRIGGER IF EXISTS update_item_catalog_updated_at ON item_catalog;
+CREATE TRIGGER update_item_catalog_updated_at BEFORE UPDATE ON item_catalog
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- Link item rows written before the catalog existed
+CREATE OR REPLACE FUNCTION backfill_item_catalog_ids()
+RETURNS INTEGER AS $$
+DECLARE
+    linked INTEGER;
+BEGIN
+    UPDATE items i
+    SET item_id = c.id
+    FROM item_catalog c
+    WHERE i.item_id IS NULL AND i.name = c.name;
+
+    GET DIAGNOSTICS linked = ROW_COUNT;
+    RETURN linked;
+END;
+$$ language 'plpgsql';
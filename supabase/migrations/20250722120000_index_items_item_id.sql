@@ -0,0 +1,2 @@
+-- Index build items by catalog item so "builds using item X" avoids a full scan
+CREATE INDEX IF NOT EXISTS idx_items_item_id ON items(item_id);
@@ -0,0 +1,23 @@
+/*
+  # Bulk build score updates
+
+  1. Functions
+    - `update_build_scores(scores)` - Applies a JSON array of {id, score}
+      objects to `builds.score` in one set-based UPDATE and returns the
+      number of rows whose score changed
+*/
+
+CREATE OR REPLACE FUNCTION update_build_scores(scores JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+    updated INTEGER;
+BEGIN
+    UPDATE builds b
+    SET score = s.score
+    FROM jsonb_to_recordset(scores) AS s(id INTEGER, score REAL)
+    WHERE b.id = s.id AND b.score IS DISTINCT FROM s.score;
+
+    GET DIAGNOSTICS updated = ROW_COUNT;
+    RETURN updated;
+END;
+$$ language 'plpgsql';
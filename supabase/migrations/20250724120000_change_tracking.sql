@@ -0,0 +1,145 @@
+/*
+  # Change tracking for incremental pulls
+
+  1. Triggers
+    - Writes to hero child tables (`hero_moods`, `hero_strengths`,
+      `hero_weaknesses`) bump `heroes.updated_at`
+    - Writes to build child tables (`items`, `playstyle_dos`,
+      `playstyle_donts`, `playstyle_tips`) bump `builds.updated_at`
+    - Both are statement-level triggers with transition tables, so each
+      parent is updated once per statement however many child rows it wrote
+    - `update_heroes_updated_at` and `update_builds_updated_at` are recreated
+      in case an earlier migration dropped them
+
+  2. New Tables
+    - `deleted_records` - Tombstones for deleted heroes and builds so mirrors
+      can remove them. Only the service role can read them
+
+  3. Performance
+    - Indexes on `heroes.updated_at`, `builds.updated_at` and
+      `deleted_records.deleted_at` for "changed since" queries
+*/
+
+DROP TRIGGER IF EXISTS update_heroes_updated_at ON heroes;
+CREATE TRIGGER update_heroes_updated_at BEFORE UPDATE ON heroes
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+DROP TRIGGER IF EXISTS update_builds_updated_at ON builds;
+CREATE TRIGGER update_builds_updated_at BEFORE UPDATE ON builds
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- Child rows belong to their parent's version. The triggers are per
+-- statement and read the transition tables, so a statement writing 20 items
+-- updates their build once rather than 20 times
+CREATE OR REPLACE FUNCTION touch_hero_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE heroes SET updated_at = CURRENT_TIMESTAMP
+        WHERE id IN (SELECT hero_id FROM new_rows);
+    ELSIF TG_OP = 'UPDATE' THEN
+        UPDATE heroes SET updated_at = CURRENT_TIMESTAMP
+        WHERE id IN (SELECT hero_id FROM new_rows UNION SELECT hero_id FROM old_rows);
+    ELSE
+        UPDATE heroes SET updated_at = CURRENT_TIMESTAMP
+        WHERE id IN (SELECT hero_id FROM old_rows);
+    END IF;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE OR REPLACE FUNCTION touch_build_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE builds SET updated_at = CURRENT_TIMESTAMP
+        WHERE id IN (SELECT build_id FROM new_rows);
+    ELSIF TG_OP = 'UPDATE' THEN
+        UPDATE builds SET updated_at = CURRENT_TIMESTAMP
+        WHERE id IN (SELECT build_id FROM new_rows UNION SELECT build_id FROM old_rows);
+    ELSE
+        UPDATE builds SET updated_at = CURRENT_TIMESTAMP
+        WHERE id IN (SELECT build_id FROM old_rows);
+    END IF;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+-- A trigger with transition tables can only fire on one event, so each child
+-- table gets an insert, an update and a delete trigger
+DO $$
+DECLARE
+    child RECORD;
+BEGIN
+    FOR child IN
+        SELECT * FROM (VALUES
+            ('hero_moods', 'touch_hero_from_hero_moods', 'touch_hero_updated_at'),
+            ('hero_strengths', 'touch_hero_from_hero_strengths', 'touch_hero_updated_at'),
+            ('hero_weaknesses', 'touch_hero_from_hero_weaknesses', 'touch_hero_updated_at'),
+            ('items', 'touch_build_from_items', 'touch_build_updated_at'),
+            ('playstyle_dos', 'touch_build_from_playstyle_dos', 'touch_build_updated_at'),
+            ('playstyle_donts', 'touch_build_from_playstyle_donts', 'touch_build_updated_at'),
+            ('playstyle_tips', 'touch_build_from_playstyle_tips', 'touch_build_updated_at')
+        ) AS t(table_name, trigger_name, function_name)
+    LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', child.trigger_name, child.table_name);
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', child.trigger_name || '_insert', child.table_name);
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', child.trigger_name || '_update', child.table_name);
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', child.trigger_name || '_delete', child.table_name);
+        EXECUTE format(
+            'CREATE TRIGGER %I AFTER INSERT ON %I REFERENCING NEW TABLE AS new_rows '
+            'FOR EACH STATEMENT EXECUTE FUNCTION %I()',
+            child.trigger_name || '_insert', child.table_name, child.function_name
+        );
+        EXECUTE format(
+            'CREATE TRIGGER %I AFTER UPDATE ON %I REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows '
+            'FOR EACH STATEMENT EXECUTE FUNCTION %I()',
+            child.trigger_name || '_update', child.table_name, child.function_name
+        );
+        EXECUTE format(
+            'CREATE TRIGGER %I AFTER DELETE ON %I REFERENCING OLD TABLE AS old_rows '
+            'FOR EACH STATEMENT EXECUTE FUNCTION %I()',
+            child.trigger_name || '_delete', child.table_name, child.function_name
+        );
+    END LOOP;
+END $$;
+
+-- Tombstones for deleted parents
+CREATE TABLE IF NOT EXISTS deleted_records (
+    id BIGSERIAL PRIMARY KEY,
+    table_name VARCHAR(50) NOT NULL,
+    record_id VARCHAR(50) NOT NULL,
+    deleted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Deletion history is only read by `pull`, which uses the service role; with
+-- RLS on and no policies, nobody else can read it
+ALTER TABLE deleted_records ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Allow anonymous read access" ON deleted_records;
+DROP POLICY IF EXISTS "Allow authenticated read access" ON deleted_records;
+
+REVOKE ALL ON deleted_records FROM anon, authenticated;
+
+CREATE OR REPLACE FUNCTION record_deletion()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO deleted_records (table_name, record_id)
+    SELECT TG_TABLE_NAME, id::text FROM old_rows;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS record_heroes_deletion ON heroes;
+CREATE TRIGGER record_heroes_deletion AFTER DELETE ON heroes
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION record_deletion();
+
+DROP TRIGGER IF EXISTS record_builds_deletion ON builds;
+CREATE TRIGGER record_builds_deletion AFTER DELETE ON builds
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION record_deletion();
+
+CREATE INDEX IF NOT EXISTS idx_heroes_updated_at ON heroes(updated_at);
+CREATE INDEX IF NOT EXISTS idx_builds_updated_at ON builds(updated_at);
+CREATE INDEX IF NOT EXISTS idx_deleted_records_deleted_at ON deleted_records(deleted_at);
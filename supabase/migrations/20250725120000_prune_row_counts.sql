@@ -0,0 +1,46 @@
+/*
+  # Row counts for pruning
+
+  1. Functions
+    - `prune_row_counts(hero_ids, build_ids, include_hero_moods)` - Counts,
+      in one query, the rows that deleting the given heroes and builds would
+      remove from every table through `ON DELETE CASCADE`. With
+      `include_hero_moods` the `hero_moods` rows matching the hero and mood
+      of a pruned build are counted as well
+*/
+
+CREATE OR REPLACE FUNCTION prune_row_counts(
+    hero_ids TEXT[],
+    build_ids INTEGER[],
+    include_hero_moods BOOLEAN DEFAULT false
+)
+RETURNS JSONB AS $$
+DECLARE
+    counts JSONB;
+BEGIN
+    WITH pruned_builds AS (
+        SELECT id, hero_id, mood FROM builds
+        WHERE hero_id = ANY(hero_ids) OR id = ANY(build_ids)
+    )
+    SELECT jsonb_build_object(
+        'heroes', (SELECT count(*) FROM heroes WHERE id = ANY(hero_ids)),
+        'hero_moods', (
+            SELECT count(*) FROM hero_moods hm
+            WHERE hm.hero_id = ANY(hero_ids)
+               OR (include_hero_moods AND EXISTS (
+                   SELECT 1 FROM pruned_builds pb
+                   WHERE pb.hero_id = hm.hero_id AND pb.mood = hm.mood
+               ))
+        ),
+        'hero_strengths', (SELECT count(*) FROM hero_strengths WHERE hero_id = ANY(hero_ids)),
+        'hero_weaknesses', (SELECT count(*) FROM hero_weaknesses WHERE hero_id = ANY(hero_ids)),
+        'builds', (SELECT count(*) FROM pruned_builds),
+        'items', (SELECT count(*) FROM items WHERE build_id IN (SELECT id FROM pruned_builds)),
+        'playstyle_dos', (SELECT count(*) FROM playstyle_dos WHERE build_id IN (SELECT id FROM pruned_builds)),
+        'playstyle_donts', (SELECT count(*) FROM playstyle_donts WHERE build_id IN (SELECT id FROM pruned_builds)),
+        'playstyle_tips', (SELECT count(*) FROM playstyle_tips WHERE build_id IN (SELECT id FROM pruned_builds))
+    ) INTO counts;
+
+    RETURN counts;
+END;
+$$ language 'plpgsql';
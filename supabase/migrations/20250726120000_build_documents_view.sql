@@ -0,0 +1,80 @@
+/*
+  # Pre-aggregated build documents
+
+  1. Materialized Views
+    - `build_documents` - One row per build (`hero_id`, `mood`) holding the
+      complete build as the JSON document the API returns: items (with
+      catalog name, cost and description resolved) and playstyle lists in
+      `order_index` order, plus the gameplan. Reading a build becomes a
+      single-row index lookup instead of a five-table join
+
+  2. Indexes
+    - Unique index on (`hero_id`, `mood`), required for concurrent refreshes
+
+  3. Functions
+    - `refresh_build_documents()` - Refreshes the view concurrently, so
+      readers keep seeing the previous contents while it runs. Only the
+      service role may call it
+
+  4. Security
+    - Read access for anonymous and authenticated users, matching the
+      tables the documents are built from
+*/
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS build_documents AS
+SELECT
+    b.id AS build_id,
+    b.hero_id,
+    b.mood,
+    jsonb_build_object(
+        'heroId', b.hero_id,
+        'mood', b.mood,
+        'score', b.score,
+        'items', COALESCE((
+            SELECT jsonb_agg(jsonb_build_object(
+                'id', COALESCE(to_jsonb(i.item_id), to_jsonb(i.id)),
+                'name', COALESCE(c.name, i.name),
+                'cost', COALESCE(c.cost, i.cost),
+                'phase', i.phase,
+                'priority', i.priority,
+                'description', COALESCE(i.description, c.description, '')
+            ) ORDER BY i.order_index)
+            FROM items i
+            LEFT JOIN item_catalog c ON c.id = i.item_id
+            WHERE i.build_id = b.id
+        ), '[]'::jsonb),
+        'playstyle', jsonb_build_object(
+            'dos', COALESCE((
+                SELECT jsonb_agg(d.do_item ORDER BY d.order_index)
+                FROM playstyle_dos d WHERE d.build_id = b.id
+            ), '[]'::jsonb),
+            'donts', COALESCE((
+                SELECT jsonb_agg(d.dont_item ORDER BY d.order_index)
+                FROM playstyle_donts d WHERE d.build_id = b.id
+            ), '[]'::jsonb),
+            'tips', COALESCE((
+                SELECT jsonb_agg(t.tip ORDER BY t.order_index)
+                FROM playstyle_tips t WHERE t.build_id = b.id
+            ), '[]'::jsonb)
+        ),
+        'gameplan', jsonb_build_object(
+            'early', COALESCE(b.early_game, ''),
+            'mid', COALESCE(b.mid_game, ''),
+            'late', COALESCE(b.late_game, '')
+        )
+    ) AS document
+FROM builds b;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_build_documents_hero_mood ON build_documents(hero_id, mood);
+
+GRANT SELECT ON build_documents TO anon, authenticated;
+
+CREATE OR REPLACE FUNCTION refresh_build_documents()
+RETURNS void AS $$
+BEGIN
+    REFRESH MATERIALIZED VIEW CONCURRENTLY build_documents;
+END;
+$$ language 'plpgsql' SECURITY DEFINER SET search_path = public;
+
+REVOKE EXECUTE ON FUNCTION refresh_build_documents() FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION refresh_build_documents() TO service_role;
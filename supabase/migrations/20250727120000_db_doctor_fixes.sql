@@ -0,0 +1,51 @@
+/*
+  # Index fixes from db_doctor.py
+
+  1. Constraints
+    - Unique (parent, order_index) on `hero_strengths`, `hero_weaknesses`,
+      `items`, `playstyle_donts`, `playstyle_dos`, `playstyle_tips`. Rows
+      sharing a position are removed first, keeping the lowest id, like
+      update-build does. The constraint index also serves the parent foreign
+      key
+
+  2. Dropped Indexes
+    - Duplicates of another index on `builds`
+    - Prefixes of a longer index on `builds`, `hero_moods`
+*/
+
+-- Constraints
+DELETE FROM items a
+    USING items b
+    WHERE a.build_id = b.build_id AND a.order_index = b.order_index AND a.id > b.id;
+ALTER TABLE items DROP CONSTRAINT IF EXISTS items_build_id_order_index_key;
+ALTER TABLE items ADD CONSTRAINT items_build_id_order_index_key UNIQUE (build_id, order_index);
+DELETE FROM playstyle_dos a
+    USING playstyle_dos b
+    WHERE a.build_id = b.build_id AND a.order_index = b.order_index AND a.id > b.id;
+ALTER TABLE playstyle_dos DROP CONSTRAINT IF EXISTS playstyle_dos_build_id_order_index_key;
+ALTER TABLE playstyle_dos ADD CONSTRAINT playstyle_dos_build_id_order_index_key UNIQUE (build_id, order_index);
+DELETE FROM playstyle_donts a
+    USING playstyle_donts b
+    WHERE a.build_id = b.build_id AND a.order_index = b.order_index AND a.id > b.id;
+ALTER TABLE playstyle_donts DROP CONSTRAINT IF EXISTS playstyle_donts_build_id_order_index_key;
+ALTER TABLE playstyle_donts ADD CONSTRAINT playstyle_donts_build_id_order_index_key UNIQUE (build_id, order_index);
+DELETE FROM playstyle_tips a
+    USING playstyle_tips b
+    WHERE a.build_id = b.build_id AND a.order_index = b.order_index AND a.id > b.id;
+ALTER TABLE playstyle_tips DROP CONSTRAINT IF EXISTS playstyle_tips_build_id_order_index_key;
+ALTER TABLE playstyle_tips ADD CONSTRAINT playstyle_tips_build_id_order_index_key UNIQUE (build_id, order_index);
+DELETE FROM hero_strengths a
+    USING hero_strengths b
+    WHERE a.hero_id = b.hero_id AND a.order_index = b.order_index AND a.id > b.id;
+ALTER TABLE hero_strengths DROP CONSTRAINT IF EXISTS hero_strengths_hero_id_order_index_key;
+ALTER TABLE hero_strengths ADD CONSTRAINT hero_strengths_hero_id_order_index_key UNIQUE (hero_id, order_index);
+DELETE FROM hero_weaknesses a
+    USING hero_weaknesses b
+    WHERE a.hero_id = b.hero_id AND a.order_index = b.order_index AND a.id > b.id;
+ALTER TABLE hero_weaknesses DROP CONSTRAINT IF EXISTS hero_weaknesses_hero_id_order_index_key;
+ALTER TABLE hero_weaknesses ADD CONSTRAINT hero_weaknesses_hero_id_order_index_key UNIQUE (hero_id, order_index);
+
+-- Dropped Indexes
+DROP INDEX IF EXISTS idx_builds_hero_mood;
+DROP INDEX IF EXISTS idx_hero_moods_hero_id;
+DROP INDEX IF EXISTS idx_builds_hero_id;
@@ -0,0 +1,292 @@
+/*
+  # Staging tables for full reloads
+
+  1. New Tables
+    - `staging_heroes`, `staging_builds` - Raw hero and build documents as
+      JSONB, one row per record, grouped by `batch_id`. `bulk-import
+      --staging` fills them in large chunks. Row level security without
+      policies leaves them to the service role
+
+  2. Functions
+    - `merge_staging(batch, replace_all, scores)` - Validates one batch and
+      merges it into the normalized tables with set-based `INSERT ... ON
+      CONFLICT` statements. The merge is a single transaction, so readers see
+      either the old or the new data. Staged builds carry their score, and
+      `scores` ({id, score} objects) rescores stored builds outside the batch
+      whose hero's role changed, so no build is visible unscored. Rows whose content did not change are not
+      rewritten, which keeps `updated_at` and incremental pulls quiet. With
+      `replace_all`, heroes and builds missing from the batch are deleted.
+      A merged batch is removed from staging. Returns written rows per table.
+      Child rows are upserted on the unique (parent, order_index)
+      constraints added by the db_doctor fixes
+
+  3. Security
+    - Only the service role may call `merge_staging`
+*/
+
+CREATE TABLE IF NOT EXISTS staging_heroes (
+    id BIGSERIAL PRIMARY KEY,
+    batch_id UUID NOT NULL,
+    data JSONB NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS staging_builds (
+    id BIGSERIAL PRIMARY KEY,
+    batch_id UUID NOT NULL,
+    data JSONB NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_staging_heroes_batch_id ON staging_heroes(batch_id);
+CREATE INDEX IF NOT EXISTS idx_staging_builds_batch_id ON staging_builds(batch_id);
+
+ALTER TABLE staging_heroes ENABLE ROW LEVEL SECURITY;
+ALTER TABLE staging_builds ENABLE ROW LEVEL SECURITY;
+
+DROP FUNCTION IF EXISTS merge_staging(UUID, BOOLEAN);
+
+CREATE OR REPLACE FUNCTION merge_staging(batch UUID, replace_all BOOLEAN DEFAULT false,
+                                         scores JSONB DEFAULT '[]'::jsonb)
+RETURNS JSONB AS $$
+DECLARE
+    counts JSONB := '{}'::jsonb;
+    affected INTEGER;
+    written INTEGER;
+    problems TEXT;
+    prune_heroes BOOLEAN;
+    prune_builds BOOLEAN;
+BEGIN
+    DROP TABLE IF EXISTS pg_temp.merge_heroes, pg_temp.merge_builds, pg_temp.merge_items;
+
+    CREATE TEMP TABLE merge_heroes ON COMMIT DROP AS
+    SELECT s.id AS staging_id, h.*
+    FROM staging_heroes s
+    CROSS JOIN LATERAL jsonb_to_record(s.data) AS h(
+        id TEXT, name TEXT, role TEXT, difficulty TEXT, description TEXT,
+        moods JSONB, strengths JSONB, weaknesses JSONB
+    )
+    WHERE s.batch_id = batch;
+
+    CREATE TEMP TABLE merge_builds ON COMMIT DROP AS
+    SELECT s.id AS staging_id, b."heroId" AS hero_id, b.mood, b.items, b.playstyle, b.gameplan,
+           b.score, NULL::INTEGER AS build_id
+    FROM staging_builds s
+    CROSS JOIN LATERAL jsonb_to_record(s.data) AS b(
+        "heroId" TEXT, mood TEXT, items JSONB, playstyle JSONB, gameplan JSONB, score REAL
+    )
+    WHERE s.batch_id = batch;
+
+    prune_heroes := replace_all AND EXISTS (SELECT 1 FROM merge_heroes);
+    prune_builds := replace_all AND EXISTS (SELECT 1 FROM merge_builds);
+
+    -- Validation: report every offending record, not just the first
+    SELECT string_agg(COALESCE(id, '#' || staging_id), ', ') INTO problems
+    FROM merge_heroes WHERE id IS NULL OR name IS NULL OR role IS NULL OR difficulty IS NULL;
+    IF problems IS NOT NULL THEN
+        RAISE EXCEPTION 'Staged heroes missing id, name, role or difficulty: %', problems;
+    END IF;
+
+    SELECT string_agg(id, ', ') INTO problems
+    FROM (SELECT id FROM merge_heroes GROUP BY id HAVING count(*) > 1) d;
+    IF problems IS NOT NULL THEN
+        RAISE EXCEPTION 'Heroes staged more than once: %', problems;
+    END IF;
+
+    SELECT string_agg(COALESCE(hero_id, '#' || staging_id), ', ') INTO problems
+    FROM merge_builds WHERE hero_id IS NULL OR mood IS NULL OR score IS NULL;
+    IF problems IS NOT NULL THEN
+        RAISE EXCEPTION 'Staged builds missing heroId, mood or score: %', problems;
+    END IF;
+
+    SELECT string_agg(hero_id || '/' || mood, ', ') INTO problems
+    FROM (SELECT hero_id, mood FROM merge_builds GROUP BY hero_id, mood HAVING count(*) > 1) d;
+    IF problems IS NOT NULL THEN
+        RAISE EXCEPTION 'Builds staged more than once: %', problems;
+    END IF;
+
+    -- With replace_all, heroes outside the batch are about to be deleted
+    SELECT string_agg(DISTINCT m.hero_id, ', ') INTO problems
+    FROM merge_builds m
+    WHERE NOT EXISTS (SELECT 1 FROM merge_heroes h WHERE h.id = m.hero_id)
+      AND (prune_heroes OR NOT EXISTS (SELECT 1 FROM heroes h WHERE h.id = m.hero_id));
+    IF problems IS NOT NULL THEN
+        RAISE EXCEPTION 'Staged builds reference unknown heroes: %', problems;
+    END IF;
+
+    -- Heroes
+    IF prune_heroes THEN
+        DELETE FROM heroes WHERE id NOT IN (SELECT id FROM merge_heroes);
+        GET DIAGNOSTICS affected = ROW_COUNT;
+        counts := counts || jsonb_build_object('deleted_heroes', affected);
+    END IF;
+
+    INSERT INTO heroes (id, name, role, difficulty, description)
+    SELECT id, name, role, difficulty, description FROM merge_heroes
+    ON CONFLICT (id) DO UPDATE SET
+        name = EXCLUDED.name,
+        role = EXCLUDED.role,
+        difficulty = EXCLUDED.difficulty,
+        description = EXCLUDED.description
+    WHERE (heroes.name, heroes.role, heroes.difficulty, heroes.description)
+        IS DISTINCT FROM (EXCLUDED.name, EXCLUDED.role, EXCLUDED.difficulty, EXCLUDED.description);
+    GET DIAGNOSTICS affected = ROW_COUNT;
+    counts := counts || jsonb_build_object('heroes', affected);
+
+    DELETE FROM hero_moods hm
+    USING merge_heroes h
+    WHERE hm.hero_id = h.id AND NOT (COALESCE(h.moods, '[]'::jsonb) ? hm.mood);
+    GET DIAGNOSTICS written = ROW_COUNT;
+    INSERT INTO hero_moods (hero_id, mood)
+    SELECT h.id, m.mood
+    FROM merge_heroes h
+    CROSS JOIN LATERAL jsonb_array_elements_text(COALESCE(h.moods, '[]'::jsonb)) AS m(mood)
+    ON CONFLICT (hero_id, mood) DO NOTHING;
+    GET DIAGNOSTICS affected = ROW_COUNT;
+    counts := counts || jsonb_build_object('hero_moods', written + affected);
+
+    -- Ordered children: positions past the new length go, the rest are upserted in place
+    DELETE FROM hero_strengths s
+    USING merge_heroes h
+    WHERE s.hero_id = h.id AND s.order_index >= jsonb_array_length(COALESCE(h.strengths, '[]'::jsonb));
+    GET DIAGNOSTICS written = ROW_COUNT;
+    INSERT INTO hero_strengths (hero_id, strength, order_index)
+    SELECT h.id, e.value, e.ord - 1
+    FROM merge_heroes h
+    CROSS JOIN LATERAL jsonb_array_elements_text(COALESCE(h.strengths, '[]'::jsonb)) WITH ORDINALITY AS e(value, ord)
+    ON CONFLICT (hero_id, order_index) DO UPDATE SET strength = EXCLUDED.strength
+    WHERE hero_strengths.strength IS DISTINCT FROM EXCLUDED.strength;
+    GET DIAGNOSTICS affected = ROW_COUNT;
+    counts := counts || jsonb_build_object('hero_strengths', written + affected);
+
+    DELETE FROM hero_weaknesses w
+    USING merge_heroes h
+    WHERE w.hero_id = h.id AND w.order_index >= jsonb_array_length(COALESCE(h.weaknesses, '[]'::jsonb));
+    GET DIAGNOSTICS written = ROW_COUNT;
+    INSERT INTO hero_weaknesses (hero_id, weakness, order_index)
+    SELECT h.id, e.value, e.ord - 1
+    FROM merge_heroes h
+    CROSS JOIN LATERAL jsonb_array_elements_text(COALESCE(h.weaknesses, '[]'::jsonb)) WITH ORDINALITY AS e(value, ord)
+    ON CONFLICT (hero_id, order_index) DO UPDATE SET weakness = EXCLUDED.weakness
+    WHERE hero_weaknesses.weakness IS DISTINCT FROM EXCLUDED.weakness;
+    GET DIAGNOSTICS affected = ROW_COUNT;
+    counts := counts || jsonb_build_object('hero_weaknesses', written + affected);
+
+    -- Builds
+    INSERT INTO builds (hero_id, mood, early_game, mid_game, late_game, score)
+    SELECT hero_id, mood, gameplan->>'early', gameplan->>'mid', gameplan->>'late', score FROM merge_builds
+    ON CONFLICT (hero_id, mood) DO UPDATE SET
+        early_game = EXCLUDED.early_game,
+        mid_game = EXCLUDED.mid_game,
+        late_game = EXCLUDED.late_game,
+        score = EXCLUDED.score
+    WHERE (builds.early_game, builds.mid_game, builds.late_game, builds.score)
+        IS DISTINCT FROM (EXCLUDED.early_game, EXCLUDED.mid_game, EXCLUDED.late_game, EXCLUDED.score);
+    GET DIAGNOSTICS affected = ROW_COUNT;
+    counts := counts || jsonb_build_object('builds', affected);
+
+    UPDATE merge_builds m SET build_id = b.id
+    FROM builds b
+    WHERE b.hero_id = m.hero_id AND b.mood = m.mood;
+
+    IF prune_builds THEN
+        DELETE FROM builds b WHERE NOT EXISTS (SELECT 1 FROM merge_builds m WHERE m.build_id = b.id);
+        GET DIAGNOSTICS affected = ROW_COUNT;
+        counts := counts || jsonb_build_object('deleted_builds', affected);
+    END IF;
+
+    -- Stored builds outside the batch whose hero's role changed
+    UPDATE builds b
+    SET score = s.score
+    FROM jsonb_to_recordset(COALESCE(scores, '[]'::jsonb)) AS s(id INTEGER, score REAL)
+    WHERE b.id = s.id
+      AND b.score IS DISTINCT FROM s.score
+      AND NOT EXISTS (SELECT 1 FROM merge_builds m WHERE m.build_id = b.id);
+    GET DIAGNOSTICS affected = ROW_COUNT;
+    counts := counts || jsonb_build_object('scores', affected);
+
+    -- Catalog items keep only a reference and a differing description, like item_row()
+    CREATE TEMP TABLE merge_items ON COMMIT DROP AS
+    SELECT m.build_id,
+           c.id AS item_id,
+           CASE WHEN c.id IS NULL THEN e.item->>'name' END AS name,
+           CASE WHEN c.id IS NULL THEN (e.item->>'cost')::INTEGER END AS cost,
+           e.item->>'phase' AS phase,
+           e.item->>'priority' AS priority,
+           CASE WHEN c.id IS NULL OR e.item->>'description' IS DISTINCT FROM c.description
+                THEN e.item->>'description' END AS description,
+           (e.ord - 1)::INTEGER AS order_index
+    FROM merge_builds m
+    CROSS JOIN LATERAL jsonb_array_elements(COALESCE(m.items, '[]'::jsonb)) WITH ORDINALITY AS e(item, ord)
+    LEFT JOIN item_catalog c ON c.id = e.item->>'id';
+
+    DELETE FROM items i
+    USING merge_builds m
+    WHERE i.build_id = m.build_id AND i.order_index >= jsonb_array_length(COALESCE(m.items, '[]'::jsonb));
+    GET DIAGNOSTICS written = ROW_COUNT;
+    INSERT INTO items (build_id, item_id, name, cost, phase, priority, description, order_index)
+    SELECT build_id, item_id, name, cost, phase, priority, description, order_index FROM merge_items
+    ON CONFLICT (build_id, order_index) DO UPDATE SET
+        item_id = EXCLUDED.item_id,
+        name = EXCLUDED.name,
+        cost = EXCLUDED.cost,
+        phase = EXCLUDED.phase,
+        priority = EXCLUDED.priority,
+        description = EXCLUDED.description
+    WHERE (items.item_id, items.name, items.cost, items.phase, items.priority, items.description)
+        IS DISTINCT FROM (EXCLUDED.item_id, EXCLUDED.name, EXCLUDED.cost, EXCLUDED.phase,
+                          EXCLUDED.priority, EXCLUDED.description);
+    GET DIAGNOSTICS affected = ROW_COUNT;
+    counts := counts || jsonb_build_object('items', written + affected);
+
+    DELETE FROM playstyle_dos d
+    USING merge_builds m
+    WHERE d.build_id = m.build_id
+      AND d.order_index >= jsonb_array_length(COALESCE(m.playstyle->'dos', '[]'::jsonb));
+    GET DIAGNOSTICS written = ROW_COUNT;
+    INSERT INTO playstyle_dos (build_id, do_item, order_index)
+    SELECT m.build_id, e.value, e.ord - 1
+    FROM merge_builds m
+    CROSS JOIN LATERAL jsonb_array_elements_text(COALESCE(m.playstyle->'dos', '[]'::jsonb)) WITH ORDINALITY AS e(value, ord)
+    ON CONFLICT (build_id, order_index) DO UPDATE SET do_item = EXCLUDED.do_item
+    WHERE playstyle_dos.do_item IS DISTINCT FROM EXCLUDED.do_item;
+    GET DIAGNOSTICS affected = ROW_COUNT;
+    counts := counts || jsonb_build_object('playstyle_dos', written + affected);
+
+    DELETE FROM playstyle_donts d
+    USING merge_builds m
+    WHERE d.build_id = m.build_id
+      AND d.order_index >= jsonb_array_length(COALESCE(m.playstyle->'donts', '[]'::jsonb));
+    GET DIAGNOSTICS written = ROW_COUNT;
+    INSERT INTO playstyle_donts (build_id, dont_item, order_index)
+    SELECT m.build_id, e.value, e.ord - 1
+    FROM merge_builds m
+    CROSS JOIN LATERAL jsonb_array_elements_text(COALESCE(m.playstyle->'donts', '[]'::jsonb)) WITH ORDINALITY AS e(value, ord)
+    ON CONFLICT (build_id, order_index) DO UPDATE SET dont_item = EXCLUDED.dont_item
+    WHERE playstyle_donts.dont_item IS DISTINCT FROM EXCLUDED.dont_item;
+    GET DIAGNOSTICS affected = ROW_COUNT;
+    counts := counts || jsonb_build_object('playstyle_donts', written + affected);
+
+    DELETE FROM playstyle_tips t
+    USING merge_builds m
+    WHERE t.build_id = m.build_id
+      AND t.order_index >= jsonb_array_length(COALESCE(m.playstyle->'tips', '[]'::jsonb));
+    GET DIAGNOSTICS written = ROW_COUNT;
+    INSERT INTO playstyle_tips (build_id, tip, order_index)
+    SELECT m.build_id, e.value, e.ord - 1
+    FROM merge_builds m
+    CROSS JOIN LATERAL jsonb_array_elements_text(COALESCE(m.playstyle->'tips', '[]'::jsonb)) WITH ORDINALITY AS e(value, ord)
+    ON CONFLICT (build_id, order_index) DO UPDATE SET tip = EXCLUDED.tip
+    WHERE playstyle_tips.tip IS DISTINCT FROM EXCLUDED.tip;
+    GET DIAGNOSTICS affected = ROW_COUNT;
+    counts := counts || jsonb_build_object('playstyle_tips', written + affected);
+
+    DELETE FROM staging_heroes WHERE batch_id = batch;
+    DELETE FROM staging_builds WHERE batch_id = batch;
+
+    RETURN counts;
+END;
+$$ language 'plpgsql';
+
+REVOKE EXECUTE ON FUNCTION merge_staging(UUID, BOOLEAN, JSONB) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION merge_staging(UUID, BOOLEAN, JSONB) TO service_role;
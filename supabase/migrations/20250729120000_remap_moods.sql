@@ -0,0 +1,114 @@
+/*
+  # Set-based mood remapping
+
+  1. Functions
+    - `remap_moods(mapping, valid_moods, dry_run)` - Renames moods in
+      `builds.mood` and `hero_moods.mood` according to a JSON object of
+      {old: new}, in one transaction. It first checks the remapped state for
+      builds that would share a (`hero_id`, `mood`) and for rows whose new
+      mood is not in `valid_moods` (the values `check_valid_mood` allows). If
+      either is found, or with `dry_run`, nothing is changed. A hero whose
+      moods merge keeps one `hero_moods` row. Returns the rows per table and
+      mapping, the conflicts, the invalid targets and whether the mapping was
+      applied
+
+  2. Security
+    - Only the service role may call `remap_moods`
+*/
+
+CREATE OR REPLACE FUNCTION remap_moods(mapping JSONB, valid_moods TEXT[], dry_run BOOLEAN DEFAULT true)
+RETURNS JSONB AS $$
+DECLARE
+    moves JSONB;
+    conflicts JSONB;
+    invalid JSONB;
+    builds_count INTEGER;
+    hero_moods_count INTEGER;
+BEGIN
+    DROP TABLE IF EXISTS pg_temp.mood_map, pg_temp.moved_builds, pg_temp.moved_hero_moods;
+
+    CREATE TEMP TABLE mood_map ON COMMIT DROP AS
+    SELECT key AS old_mood, value AS new_mood
+    FROM jsonb_each_text(mapping)
+    WHERE key IS DISTINCT FROM value;
+
+    SELECT COALESCE(jsonb_agg(jsonb_build_object(
+               'from', old_mood, 'to', new_mood, 'builds', builds, 'hero_moods', hero_moods
+           ) ORDER BY old_mood), '[]'::jsonb)
+    INTO moves
+    FROM (
+        SELECT m.old_mood, m.new_mood,
+               (SELECT count(*) FROM builds b WHERE b.mood = m.old_mood) AS builds,
+               (SELECT count(*) FROM hero_moods hm WHERE hm.mood = m.old_mood) AS hero_moods
+        FROM mood_map m
+    ) counted
+    WHERE builds > 0 OR hero_moods > 0;
+
+    -- Builds that would end up on the same (hero_id, mood) after the remap
+    SELECT COALESCE(jsonb_agg(jsonb_build_object(
+               'heroId', hero_id, 'mood', final_mood, 'from', moods
+           ) ORDER BY hero_id, final_mood), '[]'::jsonb)
+    INTO conflicts
+    FROM (
+        SELECT b.hero_id, COALESCE(m.new_mood, b.mood) AS final_mood,
+               jsonb_agg(b.mood ORDER BY b.mood) AS moods
+        FROM builds b
+        LEFT JOIN mood_map m ON m.old_mood = b.mood
+        GROUP BY b.hero_id, COALESCE(m.new_mood, b.mood)
+        HAVING count(*) > 1
+    ) collisions;
+
+    -- Targets check_valid_mood would reject, with the rows that would hit them
+    SELECT COALESCE(jsonb_agg(jsonb_build_object(
+               'from', old_mood, 'to', new_mood, 'builds', builds, 'hero_moods', hero_moods
+           ) ORDER BY old_mood), '[]'::jsonb)
+    INTO invalid
+    FROM (
+        SELECT m.old_mood, m.new_mood,
+               (SELECT count(*) FROM builds b WHERE b.mood = m.old_mood) AS builds,
+               (SELECT count(*) FROM hero_moods hm WHERE hm.mood = m.old_mood) AS hero_moods
+        FROM mood_map m
+        WHERE m.new_mood IS NULL OR NOT (m.new_mood = ANY(valid_moods))
+    ) rejected
+    WHERE builds > 0 OR hero_moods > 0;
+
+    IF dry_run OR jsonb_array_length(conflicts) > 0 OR jsonb_array_length(invalid) > 0 THEN
+        RETURN jsonb_build_object('moves', moves, 'conflicts', conflicts, 'invalid', invalid, 'applied', false);
+    END IF;
+
+    -- UNIQUE(hero_id, mood) ignores NULLs, so parking the moods first lets
+    -- swaps and chains (a -> b, b -> c) apply without transient violations
+    CREATE TEMP TABLE moved_builds ON COMMIT DROP AS
+    SELECT b.id, m.new_mood
+    FROM builds b
+    JOIN mood_map m ON m.old_mood = b.mood;
+
+    UPDATE builds b SET mood = NULL FROM moved_builds mb WHERE b.id = mb.id;
+    UPDATE builds b SET mood = mb.new_mood FROM moved_builds mb WHERE b.id = mb.id;
+    GET DIAGNOSTICS builds_count = ROW_COUNT;
+
+    -- hero_moods is a set; moods that merge collapse into one row
+    CREATE TEMP TABLE moved_hero_moods ON COMMIT DROP AS
+    SELECT hm.hero_id, m.new_mood
+    FROM hero_moods hm
+    JOIN mood_map m ON m.old_mood = hm.mood;
+
+    DELETE FROM hero_moods hm USING mood_map m WHERE hm.mood = m.old_mood;
+    GET DIAGNOSTICS hero_moods_count = ROW_COUNT;
+    INSERT INTO hero_moods (hero_id, mood)
+    SELECT DISTINCT hero_id, new_mood FROM moved_hero_moods
+    ON CONFLICT (hero_id, mood) DO NOTHING;
+
+    RETURN jsonb_build_object(
+        'moves', moves,
+        'conflicts', conflicts,
+        'invalid', invalid,
+        'applied', true,
+        'builds', builds_count,
+        'hero_moods', hero_moods_count
+    );
+END;
+$$ language 'plpgsql';
+
+REVOKE EXECUTE ON FUNCTION remap_moods(JSONB, TEXT[], BOOLEAN) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION remap_moods(JSONB, TEXT[], BOOLEAN) TO service_role;
@@ -0,0 +1,121 @@
+/*
+  # Set-based item repricing
+
+  1. Functions
+    - `reprice_items(prices, dry_run)` - Applies a JSON object of
+      {item id: new cost} to `item_catalog`, the price table every catalog
+      linked build reads its cost from. Inline `items.cost` copies that still
+      hold the old price (legacy rows, linked by `item_id` or by name) move
+      with it, in one update per table rather than one per build. Every
+      inline cost that disagrees with the catalog after the change is
+      reported, not overwritten. Unknown item ids or a cost that is not a
+      non-negative integer leave everything unchanged, as does `dry_run`. Returns the price changes
+      with the builds using each item, the disagreeing builds, the unknown
+      ids and whether the prices were applied. Builds linked to a repriced
+      item get a new `updated_at`, so incremental pulls fetch them again
+
+  2. Security
+    - Only the service role may call `reprice_items`
+*/
+
+CREATE OR REPLACE FUNCTION reprice_items(prices JSONB, dry_run BOOLEAN DEFAULT true)
+RETURNS JSONB AS $$
+DECLARE
+    changes JSONB;
+    unknown JSONB;
+    invalid JSONB;
+    mismatches JSONB;
+    catalog_count INTEGER;
+    items_count INTEGER;
+BEGIN
+    DROP TABLE IF EXISTS pg_temp.price_changes;
+
+    SELECT COALESCE(jsonb_agg(key ORDER BY key), '[]'::jsonb)
+    INTO unknown
+    FROM jsonb_object_keys(prices) AS key
+    WHERE NOT EXISTS (SELECT 1 FROM item_catalog c WHERE c.id = key);
+
+    SELECT COALESCE(jsonb_agg(key ORDER BY key), '[]'::jsonb)
+    INTO invalid
+    FROM jsonb_each(prices)
+    WHERE CASE WHEN jsonb_typeof(value) = 'number'
+               THEN value::numeric < 0 OR value::numeric <> trunc(value::numeric)
+               ELSE true
+          END;
+
+    IF jsonb_array_length(unknown) > 0 OR jsonb_array_length(invalid) > 0 THEN
+        RETURN jsonb_build_object(
+            'changes', '[]'::jsonb, 'mismatches', '[]'::jsonb,
+            'unknown', unknown, 'invalid', invalid, 'applied', false
+        );
+    END IF;
+
+    CREATE TEMP TABLE price_changes ON COMMIT DROP AS
+    SELECT c.id, c.name, c.cost AS old_cost, p.value::INTEGER AS new_cost
+    FROM jsonb_each_text(prices) p
+    JOIN item_catalog c ON c.id = p.key
+    WHERE c.cost IS DISTINCT FROM p.value::INTEGER;
+
+    SELECT COALESCE(jsonb_agg(jsonb_build_object(
+               'id', p.id, 'name', p.name, 'from', p.old_cost, 'to', p.new_cost,
+               'builds', (SELECT count(DISTINCT i.build_id) FROM items i
+                          WHERE i.item_id = p.id OR (i.item_id IS NULL AND i.name = p.name))
+           ) ORDER BY p.id), '[]'::jsonb)
+    INTO changes
+    FROM price_changes p;
+
+    -- Inline costs that differ from the catalog price they will have, except
+    -- copies of the old price, which the update below moves along
+    SELECT COALESCE(jsonb_agg(jsonb_build_object(
+               'heroId', b.hero_id, 'mood', b.mood, 'item', c.id,
+               'cost', i.cost, 'catalog', COALESCE(p.new_cost, c.cost)
+           ) ORDER BY b.hero_id, b.mood, i.order_index), '[]'::jsonb)
+    INTO mismatches
+    FROM items i
+    JOIN builds b ON b.id = i.build_id
+    JOIN item_catalog c ON c.id = i.item_id OR (i.item_id IS NULL AND i.name = c.name)
+    LEFT JOIN price_changes p ON p.id = c.id
+    WHERE i.cost IS NOT NULL
+      AND i.cost <> COALESCE(p.new_cost, c.cost)
+      AND i.cost IS DISTINCT FROM p.old_cost;
+
+    IF dry_run THEN
+        RETURN jsonb_build_object(
+            'changes', changes, 'mismatches', mismatches,
+            'unknown', unknown, 'invalid', invalid, 'applied', false
+        );
+    END IF;
+
+    UPDATE item_catalog c
+    SET cost = p.new_cost
+    FROM price_changes p
+    WHERE c.id = p.id;
+    GET DIAGNOSTICS catalog_count = ROW_COUNT;
+
+    UPDATE items i
+    SET cost = p.new_cost
+    FROM price_changes p
+    WHERE (i.item_id = p.id OR (i.item_id IS NULL AND i.name = p.name))
+      AND i.cost = p.old_cost;
+    GET DIAGNOSTICS items_count = ROW_COUNT;
+
+    -- Catalog-linked builds read the new price through item_catalog, which
+    -- the change-tracking triggers don't watch; touch them so pulls see it
+    UPDATE builds
+    SET updated_at = CURRENT_TIMESTAMP
+    WHERE id IN (SELECT build_id FROM items WHERE item_id IN (SELECT id FROM price_changes));
+
+    RETURN jsonb_build_object(
+        'changes', changes,
+        'mismatches', mismatches,
+        'unknown', unknown,
+        'invalid', invalid,
+        'applied', true,
+        'catalog', catalog_count,
+        'items', items_count
+    );
+END;
+$$ language 'plpgsql';
+
+REVOKE EXECUTE ON FUNCTION reprice_items(JSONB, BOOLEAN) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION reprice_items(JSONB, BOOLEAN) TO service_role;